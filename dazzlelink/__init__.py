@@ -194,7 +194,8 @@ def check(directory, recursive=True, fix=False):
     """
     return check_links(directory, recursive, not fix, fix)
 
-def rebase(directory, recursive=True, make_relative=None, target_base=None, only_broken=False):
+def rebase(directory, recursive=True, make_relative=None, target_base=None, only_broken=False,
+           backup=True):
     """
     Rebase links in a directory
     
@@ -204,11 +205,12 @@ def rebase(directory, recursive=True, make_relative=None, target_base=None, only
         make_relative: Convert to relative paths if True, absolute if False
         target_base: Replace base part of absolute paths
         only_broken: Only rebase broken links
+        backup: Keep the old target in a '<link>.backup' symlink
     
     Returns:
         Dictionary with status of links
     """
-    return rebase_links(directory, recursive, make_relative, target_base, only_broken)
+    return rebase_links(directory, recursive, make_relative, target_base, only_broken, backup)
 
 def configure_logging(level=logging.INFO, log_file=None):
     """
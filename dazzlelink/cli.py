@@ -179,6 +179,8 @@ For more information, see https://github.com/djdarcy/dazzlelink
                             help='Replace base path (format: old_prefix:new_prefix)')
     rebase_parser.add_argument('--only-broken', '-b', action='store_true',
                             help='Only rebase broken links')
+    rebase_parser.add_argument('--no-backup', action='store_true',
+                            help='Do not keep .backup links with the old targets')
     
     return parser
 
@@ -452,7 +454,7 @@ def main(args=None) -> int:
                     if key not in config.config:
                         print(f"WARNING: Unknown configuration key: {key}")
                     elif key == 'default_mode' and value not in DazzleLinkConfig.VALID_MODES:
-                        print(f"ERROR: Invalid mode '{value}'. Valid modes are: {', '.join(DazzleLinkConfig.VALID_MODES)}")
+                        print(f"ERROR: Invalid mode '{value}'. Valid modes are: {', '.join(DazzleLinkConfig.MODES)}")
                     else:
                         config.set(key, value)
                         
@@ -512,7 +514,8 @@ def main(args=None) -> int:
                 recursive=recursive,
                 make_relative=make_relative,
                 target_base=parsed_args.target_base if hasattr(parsed_args, 'target_base') else None,
-                only_broken=parsed_args.only_broken if hasattr(parsed_args, 'only_broken') else False
+                only_broken=parsed_args.only_broken if hasattr(parsed_args, 'only_broken') else False,
+                backup=not parsed_args.no_backup if hasattr(parsed_args, 'no_backup') else True
             )
             
             # Return non-zero if errors found
@@ -3,8 +3,12 @@ Configuration management for Dazzlelink.
 """
 
 import os
+import copy
 import json
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .data import json_dumps, json_loads
 
 class DazzleLinkConfig:
     """
@@ -16,14 +20,24 @@ class DazzleLinkConfig:
         "default_mode": "info",  # Options: info, open, auto
         "make_executable": True,
         "keep_originals": True,
-        "recursive_scan": True
+        "recursive_scan": True,
+        "human_readable": False  # Indented JSON output instead of compact
     }
     
-    # Modes available
-    VALID_MODES = ["info", "open", "auto"]
+    # Modes available (ordered for display; VALID_MODES is for membership tests)
+    MODES = ("info", "open", "auto")
+    VALID_MODES = frozenset(MODES)
+    
+    # Parsed configuration files shared by all instances: path -> (mtime_ns, data)
+    _config_cache: Dict[str, Tuple[int, dict]] = {}
+    
+    # Seconds a directory's config lookup is reused before the file is stat'ed again
+    DIR_CONFIG_TTL = 60.0
     
     def __init__(self):
         self.config = self.DEFAULT_CONFIG.copy()
+        # Directory lookups: abs directory -> (monotonic check time, parsed config or None)
+        self._dir_config_cache: Dict[str, Tuple[float, Optional[dict]]] = {}
         self._load_global_config()
     
     def _load_global_config(self):
@@ -41,9 +55,52 @@ class DazzleLinkConfig:
         """
         if directory is None:
             directory = os.getcwd()
+        directory = os.path.abspath(directory)
+        
+        # Serializing many links from one directory only touches the disk
+        # once per DIR_CONFIG_TTL; edits are picked up after that
+        now = time.monotonic()
+        cached = self._dir_config_cache.get(directory)
+        if cached is not None and now - cached[0] < self.DIR_CONFIG_TTL:
+            if cached[1] is not None:
+                self._merge_config(cached[1], "directory")
+            return
         
         dir_config_path = os.path.join(directory, ".dazzlelink_config.json")
-        self._load_config_file(dir_config_path, "directory")
+        file_config = self._load_config_file(dir_config_path, "directory")
+        self._dir_config_cache[directory] = (now, file_config)
+    
+    def snapshot(self, directory=None):
+        """
+        Copy this configuration, optionally with a directory's configuration merged in
+        
+        Unlike load_directory_config, this object is left unchanged, so the
+        copy can be handed to worker threads while this one keeps being used.
+        
+        Args:
+            directory (str, optional): Directory whose configuration to merge into the copy
+            
+        Returns:
+            DazzleLinkConfig: Independent copy of the configuration
+        """
+        snapshot = copy.copy(self)
+        snapshot.config = self.config.copy()
+        if directory is not None:
+            snapshot.load_directory_config(directory)
+        return snapshot
+    
+    def invalidate_directory_config(self, directory=None):
+        """
+        Forget cached directory configuration so it is re-read on next use
+        
+        Args:
+            directory (str, optional): Directory to invalidate.
+                If None, invalidates all directories.
+        """
+        if directory is None:
+            self._dir_config_cache.clear()
+        else:
+            self._dir_config_cache.pop(os.path.abspath(directory), None)
     
     def _load_config_file(self, config_path, config_type):
         """
@@ -52,25 +109,60 @@ class DazzleLinkConfig:
         Args:
             config_path (str): Path to the configuration file
             config_type (str): Type of configuration (for error messages)
+            
+        Returns:
+            dict: The parsed file contents, or None if missing or unreadable
         """
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    file_config = json.load(f)
-                
-                # Validate and merge configuration
-                for key, value in file_config.items():
-                    if key in self.config:
-                        if key == "default_mode" and value not in self.VALID_MODES:
-                            print(f"WARNING: Invalid mode '{value}' in {config_type} config, using default")
-                        else:
-                            self.config[key] = value
-                    # Silently ignore unknown keys for forward compatibility
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+        except OSError:
+            # No configuration file at this level
+            return None
+        
+        try:
+            # Reuse the parsed file if it hasn't changed since it was last read
+            cached = self._config_cache.get(config_path)
+            if cached is not None and cached[0] == mtime:
+                file_config = cached[1]
+            else:
+                with open(config_path, 'rb') as f:
+                    file_config = json_loads(f.read())
+                DazzleLinkConfig._config_cache[config_path] = (mtime, file_config)
             
-            except json.JSONDecodeError:
-                print(f"WARNING: Invalid JSON in {config_type} configuration file: {config_path}")
-            except Exception as e:
-                print(f"WARNING: Error reading {config_type} configuration: {str(e)}")
+            self._merge_config(file_config, config_type)
+            return file_config
+        
+        except json.JSONDecodeError:
+            print(f"WARNING: Invalid JSON in {config_type} configuration file: {config_path}")
+        except Exception as e:
+            print(f"WARNING: Error reading {config_type} configuration: {str(e)}")
+        return None
+    
+    def _merge_config(self, file_config, config_type):
+        """
+        Validate and merge parsed configuration into the current config
+        
+        Args:
+            file_config (dict): Parsed configuration values
+            config_type (str): Type of configuration (for error messages)
+        """
+        for key, value in file_config.items():
+            if key in self.config:
+                if key == "default_mode" and value not in DazzleLinkConfig.VALID_MODES:
+                    print(f"WARNING: Invalid mode '{value}' in {config_type} config, using default")
+                else:
+                    self.config[key] = value
+            # Silently ignore unknown keys for forward compatibility
+    
+    def reload(self):
+        """
+        Discard cached configuration files and start over from the defaults
+        and the global configuration.
+        """
+        DazzleLinkConfig._config_cache.clear()
+        self._dir_config_cache.clear()
+        self.config = self.DEFAULT_CONFIG.copy()
+        self._load_global_config()
     
     def load_link_config(self, link_data):
         """
@@ -84,6 +176,13 @@ class DazzleLinkConfig:
                 if key in self.config:
                     self.config[key] = value
     
+    # Map argument names to config keys (inverted flags are handled separately)
+    _ARG_MAP = (
+        ("mode", "default_mode"),
+        ("executable", "make_executable"),
+        ("keep_originals", "keep_originals"),
+    )
+    
     def apply_args(self, args):
         """
         Apply command-line arguments, overriding other settings
@@ -91,24 +190,18 @@ class DazzleLinkConfig:
         Args:
             args (Namespace): Parsed command-line arguments
         """
-        # Map argument names to config keys
-        arg_map = {
-            "mode": "default_mode",
-            "executable": "make_executable",
-            "keep_originals": "keep_originals",
-            "no_recursive": "recursive_scan"
-        }
+        argd = vars(args)
         
         # Override with command-line arguments if provided
-        for arg_name, config_key in arg_map.items():
-            if hasattr(args, arg_name) and getattr(args, arg_name) is not None:
-                value = getattr(args, arg_name)
-                
-                # Handle inverted boolean flags
-                if arg_name == "no_recursive":
-                    self.config["recursive_scan"] = not value
-                else:
-                    self.config[config_key] = value
+        for arg_name, config_key in DazzleLinkConfig._ARG_MAP:
+            value = argd.get(arg_name)
+            if value is not None:
+                self.config[config_key] = value
+        
+        # Handle inverted boolean flags
+        value = argd.get("no_recursive")
+        if value is not None:
+            self.config["recursive_scan"] = not value
     
     def get(self, key, default=None):
         """Get a configuration value"""
@@ -135,8 +228,10 @@ class DazzleLinkConfig:
     def _save_config_file(self, config_path):
         """Save configuration to a file"""
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+            with open(config_path, 'wb') as f:
+                f.write(json_dumps(self.config, indent=True))
+            # Don't let a coarse mtime mask the write
+            DazzleLinkConfig._config_cache.pop(config_path, None)
             return True
         except Exception as e:
             print(f"ERROR: Failed to save configuration: {str(e)}")
@@ -4,10 +4,108 @@ Data handling for Dazzlelink files.
 
 import os
 import json
+import stat
+import atexit
 import datetime
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
 
+# Optional fast JSON backend (C extension); falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Marker separating the script header from the JSON payload in executable dazzlelinks
+_DAZZLE_MARK = b'# DAZZLELINK_DATA_BEGIN'
+
+def json_dumps(obj, indent=False):
+    """
+    Serialize an object to UTF-8 encoded JSON, using orjson when available.
+    
+    Args:
+        obj: The object to serialize.
+        indent (bool): Indent with two spaces instead of writing compact JSON.
+        
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def json_loads(data):
+    """
+    Parse JSON from str or UTF-8 bytes, using orjson when available.
+    
+    Args:
+        data (str or bytes): The JSON text.
+        
+    Returns:
+        The parsed object.
+        
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON.
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+def read_bytes(file_path):
+    """
+    Read a whole file as bytes through a raw file descriptor.
+    
+    Dazzlelinks are small, so this sizes one os.read from fstat instead of
+    going through a buffered (or text) file object and its extra syscalls.
+    
+    Args:
+        file_path (str): Path to the file.
+        
+    Returns:
+        bytes: The file contents.
+    """
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0) | getattr(os, 'O_CLOEXEC', 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size + 1)
+        if len(data) <= size:
+            return data
+        # The file grew since fstat; read the rest
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+# Sections whose None-valued fields are dropped from compact output. Timestamp
+# dicts are left intact since readers index them directly.
+_PRUNABLE_SECTIONS = ("target", "security")
+
+def _strip_none(data):
+    """
+    Return a shallow copy of dazzlelink data without None-valued fields in the
+    prunable sections.
+    
+    Args:
+        data (dict): The dazzlelink data.
+        
+    Returns:
+        dict: The pruned copy (the input is not modified).
+    """
+    pruned = dict(data)
+    for section in _PRUNABLE_SECTIONS:
+        value = pruned.get(section)
+        if isinstance(value, dict):
+            pruned[section] = {k: v for k, v in value.items() if v is not None}
+    return pruned
+
 class DazzleLinkData:
     """
     Abstract Data Type (ADT) for working with dazzlelink data.
@@ -16,6 +114,20 @@ class DazzleLinkData:
     handling different format versions and maintaining backward compatibility.
     """
     
+    # JSON payloads read by from_file: abs path -> ((mtime_ns, size), payload bytes).
+    # Only the raw payload is kept, so every load still returns an independent object.
+    _payload_cache: Dict[str, tuple] = {}
+    
+    # Maximum number of cached payloads before the cache is reset
+    PAYLOAD_CACHE_SIZE = 4096
+    
+    # Saves deferred by queue_save: abs path -> DazzleLinkData, written by flush_pending_saves
+    _pending_saves: Dict[str, 'DazzleLinkData'] = {}
+    _pending_lock = threading.Lock()
+    
+    # Number of queued saves that triggers an automatic flush
+    PENDING_SAVE_LIMIT = 256
+    
     def __init__(self, data=None):
         """
         Initialize with existing data or create a new dazzlelink data structure.
@@ -197,6 +309,19 @@ class DazzleLinkData:
         link = self.data.get("link", {})
         return link.get("target_representations", {"original_path": self.get_target_path()})
     
+    def get_file_attributes(self):
+        """Get the stored file attributes (hidden/system/readonly) of the link, or None."""
+        # Handle both old and new formats
+        if "attributes" in self.data:
+            # Old format
+            return self.data["attributes"]
+        link = self.data.get("link", {})
+        return link.get("attributes")
+    
+    def has_file_attributes(self):
+        """Check whether any file attributes were stored for the link."""
+        return bool(self.get_file_attributes())
+    
     # Link timestamps
     def get_link_timestamps(self):
         """Get all timestamps for the original link."""
@@ -334,6 +459,36 @@ class DazzleLinkData:
         """
         return self.data
     
+    def to_bytes(self, human_readable=None):
+        """
+        Serialize the dazzlelink data to UTF-8 encoded JSON.
+        
+        Args:
+            human_readable (bool, optional): Write indented JSON with all fields.
+                If None, uses the 'human_readable' setting in the data's config
+                section (default False, i.e. compact output without None fields).
+            
+        Returns:
+            bytes: The encoded JSON.
+        """
+        if human_readable is None:
+            human_readable = self.data.get("config", {}).get("human_readable", False)
+        if human_readable:
+            return json_dumps(self.data, indent=True)
+        return json_dumps(_strip_none(self.data))
+    
+    def to_json(self, human_readable=None):
+        """
+        Serialize the dazzlelink data to a JSON string (see to_bytes).
+        
+        Args:
+            human_readable (bool, optional): Write indented JSON with all fields.
+            
+        Returns:
+            str: The JSON text.
+        """
+        return self.to_bytes(human_readable).decode('utf-8')
+    
     @classmethod
     def from_file(cls, file_path):
         """
@@ -349,36 +504,93 @@ class DazzleLinkData:
             ValueError: If the file is not a valid dazzlelink file.
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # Files revisited in a batch (e.g. check, then recreate) are not
+            # read again while they are unchanged. Writers in this package
+            # invalidate the entry; the inode and ctime also catch files
+            # replaced by other processes on filesystems with coarse mtimes
+            key = os.path.abspath(file_path)
+            st = os.stat(key)
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino, st.st_ctime_ns)
+            cached = cls._payload_cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cls(json_loads(cached[1]))
+            
+            # Read raw bytes; json decodes UTF-8 itself, and for script-embedded
+            # files only the JSON slice after the marker needs decoding
+            buf = read_bytes(key)
+            
+            data = None
+            if not buf.startswith(b'#!'):
                 try:
-                    data = json.load(f)
-                    return cls(data)
+                    data = json_loads(buf)
+                    payload = buf
                 except json.JSONDecodeError:
-                    # Try to handle script-embedded format
-                    content = f.read()
-                    json_start = content.find('# DAZZLELINK_DATA_BEGIN')
-                    if json_start != -1:
-                        json_text = content[json_start + len('# DAZZLELINK_DATA_BEGIN'):].strip()
-                        data = json.loads(json_text)
-                        return cls(data)
+                    pass
+            
+            if data is None:
+                # Try to handle script-embedded format. The marker text also appears
+                # in the embedded script itself, so the payload follows the last one.
+                json_start = buf.rfind(_DAZZLE_MARK)
+                if json_start == -1:
                     raise ValueError(f"Invalid dazzlelink file: {file_path}")
+                payload = buf[json_start + len(_DAZZLE_MARK):].strip()
+                data = json_loads(payload)
+            
+            cache = cls._payload_cache
+            if len(cache) >= cls.PAYLOAD_CACHE_SIZE:
+                cache.clear()
+            cache[key] = (stamp, payload)
+            return cls(data)
         except Exception as e:
             raise ValueError(f"Error reading dazzlelink file {file_path}: {str(e)}")
     
-    def save_to_file(self, file_path, make_executable=False):
+    @classmethod
+    def invalidate_cache(cls, file_path=None):
+        """
+        Drop cached payloads so the next from_file reads the file again.
+        
+        Args:
+            file_path (str, optional): File to forget. If None, clears the whole cache.
+        """
+        if file_path is None:
+            cls._payload_cache.clear()
+        else:
+            cls._payload_cache.pop(os.path.abspath(file_path), None)
+    
+    def save_to_file(self, file_path, make_executable=False, human_readable=None):
         """
         Save dazzlelink data to a file.
         
         Args:
             file_path (str): Path to save the dazzlelink file.
             make_executable (bool): Whether to make the file executable.
+            human_readable (bool, optional): Write indented JSON (see to_json).
             
         Returns:
             bool: True if successful, False otherwise.
         """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2)
+            DazzleLinkData.invalidate_cache(file_path)
+            
+            # Single write of the encoded payload to a temporary file, renamed
+            # over the original so readers never see a partially written file
+            temp_path = f"{file_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(self.to_bytes(human_readable))
+                # The temp file gets default permissions; keep the mode of the
+                # file being replaced (e.g. an executable dazzlelink's)
+                try:
+                    os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+                except FileNotFoundError:
+                    pass
+                os.replace(temp_path, file_path)
+            except BaseException:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
                 
             if make_executable:
                 # TODO: Implement executable script generation
@@ -387,4 +599,53 @@ class DazzleLinkData:
             return True
         except Exception as e:
             print(f"Error saving dazzlelink file {file_path}: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def queue_save(self, file_path):
+        """
+        Defer saving to file_path until flush_pending_saves is called.
+        
+        Batch operations use this so many dazzlelinks are written back in one
+        pass instead of interleaving a write with every link. Queuing the same
+        path again replaces the earlier entry. The queue is flushed automatically
+        once it holds PENDING_SAVE_LIMIT entries.
+        
+        Args:
+            file_path (str): Path to save the dazzlelink file.
+        """
+        cls = DazzleLinkData
+        with cls._pending_lock:
+            cls._pending_saves[os.path.abspath(file_path)] = self
+            full = len(cls._pending_saves) >= cls.PENDING_SAVE_LIMIT
+        if full:
+            cls.flush_pending_saves()
+    
+    @classmethod
+    def discard_pending_save(cls, file_path):
+        """
+        Drop a queued save, e.g. because the dazzlelink file is being removed.
+        
+        Args:
+            file_path (str): Path whose queued save should be dropped.
+        """
+        with cls._pending_lock:
+            cls._pending_saves.pop(os.path.abspath(file_path), None)
+    
+    @classmethod
+    def flush_pending_saves(cls):
+        """
+        Write all dazzlelinks queued by queue_save.
+        
+        Returns:
+            list: Paths that failed to save (empty if all succeeded).
+        """
+        with cls._pending_lock:
+            pending = cls._pending_saves
+            cls._pending_saves = {}
+        
+        return [file_path for file_path, dl_data in pending.items()
+                if not dl_data.save_to_file(file_path)]
+
+
+# Never lose queued saves if a caller forgets to flush
+atexit.register(DazzleLinkData.flush_pending_saves)
@@ -11,6 +11,7 @@ from .links import (
     restore_file_attributes,
     scan_directory,
     find_dazzlelinks,
+    iter_dazzlelinks,
     make_dazzlelink_executable
 )
 from .timestamps import (
@@ -25,6 +26,7 @@ from .batch import (
     batch_import,
     convert_directory,
     mirror_directory,
+    serialize_many,
     batch_copy,
     check_links,
     rebase_links,
@@ -32,6 +34,7 @@ from .batch import (
 )
 from .recreate import (
     recreate_link,
+    recreate_links,
     execute_dazzlelink
 )
 
@@ -44,6 +47,7 @@ __all__ = [
     'restore_file_attributes',
     'scan_directory',
     'find_dazzlelinks',
+    'iter_dazzlelinks',
     'make_dazzlelink_executable',
     
     # Timestamp operations
@@ -58,6 +62,7 @@ __all__ = [
     'batch_import',
     'convert_directory',
     'mirror_directory',
+    'serialize_many',
     'batch_copy',
     'check_links',
     'rebase_links',
@@ -65,5 +70,6 @@ __all__ = [
     
     # Recreation operations
     'recreate_link',
+    'recreate_links',
     'execute_dazzlelink'
 ]
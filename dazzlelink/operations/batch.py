@@ -8,18 +8,28 @@ or files at once, such as batch import, batch conversion, and batch checking.
 import os
 import sys
 import re
+import json
+import fnmatch
 import logging
 import shutil
+from collections import deque
+from contextlib import ExitStack
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union, Any
 
 from ..exceptions import DazzleLinkException
-from ..data import DazzleLinkData
+from ..data import DazzleLinkData, json_loads, read_bytes
 from ..config import DazzleLinkConfig
 from . import links, timestamps
 
 # Add debugging support
 VERBOSE = os.environ.get('DAZZLELINK_VERBOSE', '0') == '1'
+
+# Platform check, evaluated once at import
+IS_WINDOWS = os.name == 'nt'
+
 logger = logging.getLogger(__name__)
 
 def debug_print(message):
@@ -28,10 +38,604 @@ def debug_print(message):
         print(f"DEBUG: {message}")
         logger.debug(message)
 
+def _worker_count():
+    """
+    Number of worker threads for I/O-bound batch operations.
+    
+    Per-file work is dominated by syscalls (lstat, readlink, JSON writes) that
+    release the GIL, so oversubscribing the CPU count pays off, especially on
+    network shares. Override with the DAZZLELINK_WORKERS environment variable.
+    """
+    try:
+        return max(1, int(os.environ.get('DAZZLELINK_WORKERS', '16')))
+    except ValueError:
+        return 16
+
+# Most tasks a streaming batch keeps queued or running at once
+MAX_PENDING_TASKS = 1024
+
+def _submit_bounded(executor, tasks, limit=MAX_PENDING_TASKS):
+    """
+    Submit tasks to an executor as they are produced, with bounded lookahead.
+    
+    Unlike collecting every future up front, at most limit futures (and
+    their results) are held at a time, so scans of huge trees run in
+    constant memory. The tasks iterable is consumed on the calling thread.
+    
+    Args:
+        executor (Executor): Executor to submit to
+        tasks (iterable): (label, callable) pairs; callable takes no arguments
+        limit (int): Maximum number of outstanding futures
+        
+    Yields:
+        tuple: (label, future) in submission order
+    """
+    pending = deque()
+    for label, task in tasks:
+        pending.append((label, executor.submit(task)))
+        if len(pending) >= limit:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+def _convert_one(dazzle, entry, dest_path=None, make_executable=None, mode=None,
+                 human_readable=None):
+    """
+    Serialize a single symlink found during a directory scan.
+    
+    Runs on a worker thread for convert_directory and mirror_directory.
+    
+    Args:
+        dazzle (DazzleLink): Shared DazzleLink instance
+        entry (os.DirEntry): Directory entry of the symlink
+        dest_path (str, optional): Mirror destination (without extension).
+            If None, the dazzlelink is written next to the symlink.
+        make_executable (bool, optional): Whether to make the dazzlelink executable
+        mode (str, optional): Default execution mode for the dazzlelink
+        human_readable (bool, optional): Whether to write indented JSON
+        
+    Returns:
+        str: Path to the created dazzlelink file
+    """
+    output_path = None
+    if dest_path is not None:
+        # serialize_link creates the parent directories
+        output_path = f"{dest_path}{dazzle.DAZZLELINK_EXT}"
+    
+    # The scan already classified the entry; reuse its lstat result
+    # (free on Windows, one cached syscall on POSIX) for all collectors
+    dazzlelink = dazzle.serialize_link(
+        entry.path,
+        output_path=output_path,
+        make_executable=make_executable,
+        mode=mode,
+        link_stat=entry.stat(follow_symlinks=False),
+        human_readable=human_readable
+    )
+    
+    return dazzlelink
+
+def _human_readable_resolver(config):
+    """
+    Look up the human_readable setting of each directory a scan visits
+    
+    Each directory's configuration is merged into a snapshot of config, so
+    the result only depends on that directory, not on which ones came
+    before, and config itself (shared by the worker threads) is not changed.
+    Meant to be called on the scanning thread.
+    
+    Args:
+        config (DazzleLinkConfig): Configuration of the scan
+        
+    Returns:
+        callable: function(directory) -> bool
+    """
+    resolved = {}
+    
+    def resolve(directory):
+        value = resolved.get(directory)
+        if value is None:
+            value = resolved[directory] = bool(config.snapshot(directory).get("human_readable"))
+        return value
+    
+    return resolve
+
+def _unlink_quietly(path):
+    """
+    Remove a file, returning the error instead of raising it
+    
+    Args:
+        path (str): Path to remove
+        
+    Returns:
+        OSError: The error raised by os.unlink, or None on success
+    """
+    try:
+        os.unlink(path)
+    except OSError as e:
+        return e
+    return None
+
+def _readlink_quietly(path):
+    """
+    Read a symlink, returning the error instead of raising it
+    
+    Args:
+        path (str): Symlink to read
+        
+    Returns:
+        tuple: (target, None) on success, (None, OSError) on failure
+    """
+    try:
+        return os.readlink(path), None
+    except OSError as e:
+        return None, e
+
+# Below this many links, readlink calls are not worth a thread pool
+PARALLEL_READLINK_MIN = 64
+
+def _readlink_many(paths):
+    """
+    Read many symlinks, overlapping the calls on a thread pool for large sets
+    
+    readlink releases the GIL, so on network filesystems, where each call is
+    a round trip, the latencies overlap.
+    
+    Args:
+        paths (list): Symlinks to read
+        
+    Returns:
+        list: (target, error) pairs in the order of paths (see _readlink_quietly)
+    """
+    if len(paths) < PARALLEL_READLINK_MIN:
+        return [_readlink_quietly(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=_worker_count()) as executor:
+        return list(executor.map(_readlink_quietly, paths))
+
+# DazzleLink instance owned by a serialize_many worker process
+_worker_dazzle = None
+
+def _init_serialize_worker(config_snapshot):
+    """
+    Process pool initializer for serialize_many.
+    
+    Rebuilds the configuration from a plain dict and creates one DazzleLink
+    (and with it one UNC adapter) per worker, reused for every link it handles.
+    
+    Args:
+        config_snapshot (dict): Copy of the parent's configuration values
+    """
+    global _worker_dazzle
+    from .core import DazzleLink
+    config = DazzleLinkConfig()
+    config.config.update(config_snapshot)
+    _worker_dazzle = DazzleLink(config)
+
+def _serialize_one(args):
+    """
+    Serialize a single symlink inside a serialize_many worker process.
+    
+    Args:
+        args (tuple): (link_path, output_path, make_executable, mode)
+    
+    Returns:
+        tuple: (link_path, dazzlelink_path, error message or None)
+    """
+    return _serialize_task(_worker_dazzle, args)
+
+def _serialize_task(dazzle, args):
+    """
+    Serialize one serialize_many task with the given DazzleLink instance.
+    
+    Args:
+        dazzle (DazzleLink): DazzleLink instance to use
+        args (tuple): (link_path, output_path, make_executable, mode)
+    
+    Returns:
+        tuple: (link_path, dazzlelink_path, error message or None)
+    """
+    link_path, output_path, make_executable, mode = args
+    try:
+        dazzlelink = dazzle.serialize_link(
+            link_path,
+            output_path=output_path,
+            make_executable=make_executable,
+            mode=mode
+        )
+        return link_path, dazzlelink, None
+    except Exception as e:
+        return link_path, None, str(e)
+
+def serialize_many(link_paths, output_dir=None, make_executable=None, mode=None,
+                   config=None, workers=None):
+    """
+    Serialize many symlinks to dazzlelinks using a pool of worker processes.
+    
+    Each link is independent, so unlike the thread pool used by
+    convert_directory this also spreads the JSON encoding across cores.
+    Small batches are handled in-process, where starting workers would
+    cost more than it saves.
+    
+    Args:
+        link_paths (list): Paths of the symlinks to serialize
+        output_dir (str, optional): Directory for the dazzlelink files.
+            If None, each dazzlelink is written next to its symlink.
+        make_executable (bool, optional): Whether to make the dazzlelinks executable.
+            If None, uses configuration default.
+        mode (str, optional): Default execution mode for dazzlelinks.
+            If None, uses configuration default.
+        config (DazzleLinkConfig, optional): Configuration object to use.
+            If None, creates a new one.
+        workers (int, optional): Number of worker processes (default: CPU count)
+    
+    Returns:
+        list: List of created dazzlelink paths
+    """
+    if config is None:
+        config = DazzleLinkConfig()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    from .core import DazzleLink
+    tasks = []
+    for link_path in link_paths:
+        output_path = None
+        if output_dir is not None:
+            output_path = os.path.join(
+                output_dir, os.path.basename(link_path) + DazzleLink.DAZZLELINK_EXT)
+        tasks.append((link_path, output_path, make_executable, mode))
+    
+    if workers <= 1 or len(tasks) < 2 * workers:
+        dazzle = DazzleLink(config)
+        results = (_serialize_task(dazzle, task) for task in tasks)
+        executor = None
+    else:
+        # Only the plain config dict crosses the process boundary
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_serialize_worker,
+            initargs=(dict(config.config),)
+        )
+        results = executor.map(_serialize_one, tasks,
+                               chunksize=max(1, len(tasks) // (workers * 4)))
+    
+    dazzlelinks = []
+    try:
+        with links.directory_cache():
+            for link_path, dazzlelink, error in results:
+                if error is None:
+                    dazzlelinks.append(dazzlelink)
+                else:
+                    print(f"WARNING: Failed to serialize {link_path}: {error}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    return dazzlelinks
+
+# Number of files between writes of batch_import's buffered progress lines
+PROGRESS_FLUSH_EVERY = 50
+
+# Relative directories computed by _relative_dir: (original_dir, dl_dir) -> rel_dir or None
+_relative_dir_cache = {}
+
+def _relative_dir(original_dir, dl_dir):
+    """
+    Path of original_dir relative to its common base with dl_dir.
+    
+    Links recorded from one directory share original_dir, and their
+    dazzlelinks share dl_dir, so the commonpath/relpath work is cached per
+    pair rather than repeated for every file.
+    
+    Args:
+        original_dir (str): Directory of the original link (absolute)
+        dl_dir (str): Directory holding the dazzlelink file
+        
+    Returns:
+        str: The relative directory ('' for the common base itself), or None
+            if the paths have no common base
+    """
+    key = (original_dir, dl_dir)
+    try:
+        return _relative_dir_cache[key]
+    except KeyError:
+        pass
+    
+    try:
+        common_base = os.path.commonpath([original_dir, dl_dir])
+        rel_dir = os.path.relpath(original_dir, common_base) if common_base else None
+        if rel_dir == os.curdir:
+            rel_dir = ''  # so joining it adds no './' component
+    except ValueError:
+        # Different drives, or mixed absolute and relative paths
+        rel_dir = None
+    _relative_dir_cache[key] = rel_dir
+    return rel_dir
+
+def _link_path_resolver(target_location, flatten):
+    """
+    Choose how batch_import places recreated links, once per run
+    
+    target_location and flatten are fixed for a whole import, so the branch
+    on them is taken here and the returned function only does the per-file work.
+    
+    Args:
+        target_location (str, optional): Override location for recreated symlinks
+        flatten (bool): If True, put every link directly in target_location
+        
+    Returns:
+        callable: function(original_path, dl_path) -> path of the link to create
+    """
+    if not target_location:
+        # Use the original path as specified in the dazzlelink
+        def resolve(original_path, dl_path):
+            return original_path
+    elif flatten:
+        # Use just the filename in the target location
+        def resolve(original_path, dl_path):
+            return os.path.join(target_location, os.path.basename(original_path))
+    else:
+        # Preserve relative path structure
+        def resolve(original_path, dl_path):
+            try:
+                # If already relative, just join with target location
+                if not os.path.isabs(original_path):
+                    return os.path.join(target_location, original_path)
+                
+                # Absolute: keep the part below the common base with the dazzlelink's
+                # directory; files from one directory share it (see _relative_dir)
+                original_dir, link_name = os.path.split(original_path)
+                rel_dir = _relative_dir(original_dir, os.path.dirname(str(dl_path)))
+                if rel_dir is not None:
+                    return os.path.join(target_location, rel_dir, link_name)
+                # No common base, just use basename
+                return os.path.join(target_location, link_name)
+            except Exception:
+                # Fallback to flatten if path processing fails
+                return os.path.join(target_location, os.path.basename(original_path))
+    return resolve
+
+def _finish_import(dl_path, dl_data, entry, messages, remove_dazzlelinks,
+                   timestamp_strategy, update_dazzlelink, use_live_target, batch_optimization,
+                   target_cache=None):
+    """
+    Complete the import of a dazzlelink whose symlink now exists
+    
+    Applies the timestamp strategy and file attributes to the new link,
+    updates the dazzlelink's metadata and removes it if requested.
+    
+    Args:
+        dl_path (Path): Path to the dazzlelink file
+        dl_data (DazzleLinkData): The loaded dazzlelink
+        entry (dict): Result entry for the link; its "removed" flag is updated
+        messages (list): Report lines, appended to
+        target_cache (dict, optional): The batch's live target cache
+            (see timestamps.lookup_target_timestamps)
+        (remaining arguments as for batch_import)
+    """
+    new_link_path = entry["new_link"]
+    target_path = entry["target"]
+    
+    # Apply timestamp strategy with batch optimization
+    live_target_timestamps = timestamps.apply_timestamp_strategy(
+        new_link_path,
+        dl_data,
+        timestamp_strategy,
+        use_live_target,
+        batch_mode=batch_optimization,
+        target_cache=target_cache
+    )
+    
+    # Restore file attributes
+    if IS_WINDOWS and dl_data.has_file_attributes():
+        links.restore_file_attributes(new_link_path, dl_data, new_link=True)
+    
+    # Update dazzlelink metadata if requested
+    if update_dazzlelink:
+        dl_data.update_metadata(reason="symlink_recreation")
+        
+        # If we used live target, update target timestamps too
+        if use_live_target and timestamp_strategy in ['target', 'preserve-all']:
+            # Reuse the timestamps the strategy just read from the live target
+            target_timestamps = live_target_timestamps
+            if target_timestamps is None:
+                target_timestamps = timestamps.lookup_target_timestamps(target_path, target_cache)
+            if target_timestamps is not None:
+                dl_data.set_target_timestamps(
+                    created=target_timestamps.get('created'),
+                    modified=target_timestamps.get('modified'),
+                    accessed=target_timestamps.get('accessed')
+                )
+        
+        # Save the updated dazzlelink; batch runs queue it for a single flush
+        if batch_optimization:
+            dl_data.queue_save(str(dl_path))
+        else:
+            dl_data.save_to_file(str(dl_path))
+    
+    # Track success
+    messages.append(f"SUCCESS: Created symlink at {new_link_path} -> {target_path}")
+    if use_live_target:
+        messages.append(f"CHECKED LIVE TARGET: {target_path}")
+    
+    # Remove dazzlelink if requested
+    if remove_dazzlelinks:
+        DazzleLinkData.discard_pending_save(str(dl_path))
+        try:
+            os.unlink(dl_path)
+            entry["removed"] = True
+            messages.append(f"REMOVED: {dl_path}")
+        except Exception as e:
+            messages.append(f"WARNING: Failed to remove dazzlelink {dl_path}: {str(e)}")
+            entry["removal_error"] = str(e)
+
+def _import_one(dl_path, resolve_link_path, dry_run, remove_dazzlelinks,
+                timestamp_strategy, update_dazzlelink, use_live_target, batch_optimization,
+                target_cache=None):
+    """
+    Import a single dazzlelink for batch_import
+    
+    Safe to run on a worker thread: nothing is printed or shared, the report
+    lines are returned for the caller to print in order.
+    
+    Args:
+        dl_path (Path): Path to the dazzlelink file
+        resolve_link_path (callable): Link path resolver from _link_path_resolver
+        (remaining arguments as for batch_import)
+        
+    Returns:
+        tuple: (result category, result entry, list of report lines). The
+            category is 'success', 'error', or 'deferred' for a link queued on
+            the active ElevatedSymlinkBatch, which _finish_import completes
+            once the link exists.
+    """
+    messages = []
+    
+    try:
+        # Load the dazzlelink data for validation
+        try:
+            dl_data = DazzleLinkData.from_file(str(dl_path))
+        except ValueError as e:
+            messages.append(f"ERROR: {str(e)}")
+            return "error", {"path": str(dl_path), "error": str(e)}, messages
+        
+        # Get target path for informational purposes
+        target_path = dl_data.get_target_path()
+        original_path = dl_data.get_original_path()
+        
+        # Determine where to create the symlink
+        new_link_path = resolve_link_path(original_path, dl_path)
+        
+        # Log what would be done in dry run mode
+        if dry_run:
+            entry = {
+                "dazzlelink": str(dl_path),
+                "new_link": new_link_path,
+                "target": target_path,
+                "removed": remove_dazzlelinks,
+                "timestamp_strategy": timestamp_strategy,
+                "updated_metadata": update_dazzlelink,
+                "use_live_target": use_live_target
+            }
+            messages.append(f"WOULD CREATE: {new_link_path} -> {target_path}")
+            messages.append(f"TIMESTAMP STRATEGY: {timestamp_strategy}")
+            if use_live_target:
+                messages.append(f"WOULD CHECK LIVE TARGET: {target_path}")
+            if remove_dazzlelinks:
+                messages.append(f"WOULD REMOVE: {dl_path}")
+            if update_dazzlelink:
+                messages.append(f"WOULD UPDATE METADATA: {dl_path}")
+            return "success", entry, messages
+        
+        # Create the link - pass batch_optimization flag to indicate we're in batch mode
+        # This affects timestamp verification strategy
+        try:
+            # Ensure parent directory exists
+            links.ensure_directory(os.path.dirname(new_link_path))
+            
+            # Get target information
+            target_path = dl_data.get_target_path()
+            is_dir = dl_data.get_target_type() == "directory"
+            
+            # Create symlink, replacing any existing link/file; whether something
+            # was there comes from the creation itself, not a separate stat
+            if links.replace_with_symlink(target_path, new_link_path, is_dir):
+                messages.append(f"WARNING: Path already exists: {new_link_path}")
+            
+            entry = {
+                "dazzlelink": str(dl_path),
+                "new_link": new_link_path,
+                "target": target_path,
+                "removed": False,
+                "timestamp_strategy": timestamp_strategy,
+                "updated_metadata": update_dazzlelink,
+                "use_live_target": use_live_target
+            }
+            
+            # A link queued for the batch's elevated run does not exist yet;
+            # everything that touches it (or removes the dazzlelink) waits
+            # until the run has confirmed it
+            if links.ElevatedSymlinkBatch.is_deferred(new_link_path):
+                messages.append(f"DEFERRED: {new_link_path} -> {target_path} "
+                                f"(to be created with elevated privileges)")
+                return "deferred", entry, messages
+            
+            _finish_import(dl_path, dl_data, entry, messages, remove_dazzlelinks,
+                           timestamp_strategy, update_dazzlelink, use_live_target,
+                           batch_optimization, target_cache)
+            return "success", entry, messages
+        except Exception as e:
+            messages.append(f"ERROR: Failed to recreate link: {str(e)}")
+            return "error", {"path": str(dl_path), "error": str(e)}, messages
+            
+    except Exception as e:
+        messages.append(f"ERROR: Failed to process {dl_path}: {str(e)}")
+        return "error", {"path": str(dl_path), "error": str(e)}, messages
+
+
+
+def _preview_import(dazzlelinks, target_location, flatten, remove_dazzlelinks, config_level,
+                    timestamp_strategy, update_dazzlelink, use_live_target, batch_optimization,
+                    verbose=True):
+    """
+    Dry-run counterpart of batch_import that reports files as they are found
+    
+    Args:
+        dazzlelinks (iterable): Dazzlelink file paths, e.g. from links.iter_dazzlelinks
+        (remaining arguments as for batch_import)
+        
+    Returns:
+        dict: Report of the files that would be imported, as batch_import returns it
+    """
+    results = {
+        "success": [],
+        "error": [],
+        "skipped": []
+    }
+    
+    print("DRY RUN - no changes will be made")
+    print(f"Using timestamp strategy: {timestamp_strategy}")
+    if use_live_target:
+        print("Will check live target files for timestamps")
+    
+    resolve_link_path = _link_path_resolver(target_location, flatten)
+    directories = set()
+    processed_count = 0
+    
+    try:
+        for dl_path in dazzlelinks:
+            processed_count += 1
+            directories.add(str(dl_path.parent))
+            
+            category, entry, messages = _import_one(
+                dl_path, resolve_link_path, True, remove_dazzlelinks, timestamp_strategy,
+                update_dazzlelink, use_live_target, batch_optimization)
+            results[category].append(entry)
+            
+            if verbose or category == "error":
+                lines = [f"  [{processed_count}] Processing: {dl_path}"]
+                lines.extend(f"    {message}" for message in messages)
+                print('\n'.join(lines))
+    finally:
+        _relative_dir_cache.clear()
+    
+    if not processed_count:
+        print(f"No dazzlelink files found matching the specified criteria")
+        return results
+    
+    print(f"\nFound {processed_count} dazzlelink files in {len(directories)} directories")
+    print("\nImport Summary:")
+    print(f"  {len(results['success'])} links successfully created")
+    print(f"  {len(results['error'])} errors occurred")
+    print(f"  {len(results['skipped'])} items skipped")
+    
+    return results
+
 def batch_import(path_patterns, target_location=None, recursive=False, 
                 flatten=False, pattern=None, dry_run=False, remove_dazzlelinks=False,
                 config_level='file', timestamp_strategy='current', update_dazzlelink=False,
-                use_live_target=False, batch_optimization=True, dazzlelink_ext='.dazzlelink'):
+                use_live_target=False, batch_optimization=True, dazzlelink_ext='.dazzlelink',
+                parallel_workers=None, verbose=True):
     """
     Batch import multiple dazzlelink files, recreating the original symlinks.
     
@@ -49,12 +653,23 @@ def batch_import(path_patterns, target_location=None, recursive=False,
         use_live_target (bool): Whether to check the live target file for timestamps
         batch_optimization (bool): Whether to use optimizations for batch processing
         dazzlelink_ext (str): The file extension for dazzlelink files
+        parallel_workers (int, optional): Number of worker threads
+            (default: min(32, 4 * CPU count); 1 processes files serially)
+        verbose (bool): Whether to report every file (False reports only errors and the summary)
         
     Returns:
         dict: Report of imported files with details on success, errors, etc.
     """
+    # Previews stream straight from the search instead of collecting and grouping first
+    if dry_run:
+        return _preview_import(
+            links.iter_dazzlelinks(path_patterns, recursive, pattern, dazzlelink_ext),
+            target_location, flatten, remove_dazzlelinks, config_level, timestamp_strategy,
+            update_dazzlelink, use_live_target, batch_optimization, verbose)
+    
     # Find all matching dazzlelink files
     dazzlelinks = links.find_dazzlelinks(path_patterns, recursive, pattern, dazzlelink_ext)
+    _relative_dir_cache.clear()
     
     if not dazzlelinks:
         print(f"No dazzlelink files found matching the specified criteria")
@@ -80,188 +695,109 @@ def batch_import(path_patterns, target_location=None, recursive=False,
     processed_count = 0
     
     print(f"Found {total_count} dazzlelink files in {len(dazzlelinks_by_dir)} directories")
-    if dry_run:
-        print("DRY RUN - no changes will be made")
     
     print(f"Using timestamp strategy: {timestamp_strategy}")
     if use_live_target:
         print("Will check live target files for timestamps")
     
-    # Initialize config
-    config = DazzleLinkConfig()
+    tasks = [(dir_path, dl_path)
+             for dir_path, dir_dazzlelinks in dazzlelinks_by_dir.items()
+             for dl_path in dir_dazzlelinks]
     
-    for dir_path, dir_dazzlelinks in dazzlelinks_by_dir.items():
-        print(f"\nProcessing directory: {dir_path}")
-        
-        # Load directory-specific config if using directory level
-        if config_level == 'directory':
-            config.load_directory_config(dir_path)
-        
-        for dl_path in dir_dazzlelinks:
-            processed_count += 1
-            print(f"  [{processed_count}/{total_count}] Processing: {dl_path.name}")
+    resolve_link_path = _link_path_resolver(target_location, flatten)
+    
+    # Live targets shared by many dazzlelinks are looked up once; the cache
+    # belongs to this run and is handed to its workers
+    target_cache = {}
+    
+    def import_task(task):
+        return _import_one(task[1], resolve_link_path, False, remove_dazzlelinks,
+                           timestamp_strategy, update_dazzlelink, use_live_target,
+                           batch_optimization, target_cache)
+    
+    if parallel_workers is None:
+        parallel_workers = min(32, (os.cpu_count() or 1) * 4)
+    
+    # Links that need elevation are created together, behind a single UAC prompt
+    elevated_batch = links.ElevatedSymlinkBatch() if IS_WINDOWS else ExitStack()
+    deferred = []
+    with links.directory_cache():
+        with elevated_batch:
+            # Per-item work is independent syscalls and small file I/O, so a thread pool
+            # overlaps the latency
+            if parallel_workers <= 1 or total_count < 2:
+                outcomes = map(import_task, tasks)
+                executor = None
+            else:
+                executor = ThreadPoolExecutor(max_workers=parallel_workers)
+                outcomes = executor.map(import_task, tasks)
             
+            # Outcomes arrive in submission order, so the report reads the same as a serial run.
+            # Per-file lines are buffered and written every PROGRESS_FLUSH_EVERY files;
+            # errors flush the buffer right away.
+            progress = []
             try:
-                # Load the dazzlelink data for validation
-                try:
-                    dl_data = DazzleLinkData.from_file(str(dl_path))
-                except ValueError as e:
-                    results["error"].append({
-                        "path": str(dl_path),
-                        "error": str(e)
-                    })
-                    print(f"    ERROR: {str(e)}")
-                    continue
-                
-                # Get target path for informational purposes
-                target_path = dl_data.get_target_path()
-                original_path = dl_data.get_original_path()
-                
-                # Determine where to create the symlink
-                if target_location:
-                    if flatten:
-                        # Use just the filename in the target location
-                        link_name = os.path.basename(original_path)
-                        new_link_path = os.path.join(target_location, link_name)
+                current_dir = None
+                for (dir_path, dl_path), (category, entry, messages) in zip(tasks, outcomes):
+                    processed_count += 1
+                    if category == "deferred":
+                        deferred.append((dl_path, entry))
                     else:
-                        # Preserve relative path structure
-                        try:
-                            # If original_path is absolute, convert to relative to common base
-                            if os.path.isabs(original_path):
-                                # Find common base path if possible
-                                dl_dir = os.path.dirname(str(dl_path))
-                                common_base = os.path.commonpath([original_path, dl_dir])
-                                if common_base:
-                                    rel_path = os.path.relpath(original_path, common_base)
-                                    new_link_path = os.path.join(target_location, rel_path)
-                                else:
-                                    # No common base, just use basename
-                                    link_name = os.path.basename(original_path)
-                                    new_link_path = os.path.join(target_location, link_name)
-                            else:
-                                # If already relative, just join with target location
-                                new_link_path = os.path.join(target_location, original_path)
-                        except Exception as e:
-                            # Fallback to flatten if path processing fails
-                            link_name = os.path.basename(original_path)
-                            new_link_path = os.path.join(target_location, link_name)
-                else:
-                    # Use the original path as specified in the dazzlelink
-                    new_link_path = original_path
-                
-                # Check if link already exists
-                if os.path.exists(new_link_path) and not dry_run:
-                    print(f"    WARNING: Path already exists: {new_link_path}")
-                
-                # Log what would be done in dry run mode
-                if dry_run:
-                    results["success"].append({
-                        "dazzlelink": str(dl_path),
-                        "new_link": new_link_path,
-                        "target": target_path,
-                        "removed": remove_dazzlelinks,
-                        "timestamp_strategy": timestamp_strategy,
-                        "updated_metadata": update_dazzlelink,
-                        "use_live_target": use_live_target
-                    })
-                    print(f"    WOULD CREATE: {new_link_path} -> {target_path}")
-                    print(f"    TIMESTAMP STRATEGY: {timestamp_strategy}")
-                    if use_live_target:
-                        print(f"    WOULD CHECK LIVE TARGET: {target_path}")
-                    if remove_dazzlelinks:
-                        print(f"    WOULD REMOVE: {dl_path}")
-                    if update_dazzlelink:
-                        print(f"    WOULD UPDATE METADATA: {dl_path}")
-                    continue
-                
-                # Create the link - pass batch_optimization flag to indicate we're in batch mode
-                # This affects timestamp verification strategy
-                try:
-                    # Ensure parent directory exists
-                    os.makedirs(os.path.dirname(new_link_path), exist_ok=True)
-                    
-                    # Remove existing link/file if it exists
-                    if os.path.exists(new_link_path):
-                        if os.path.isdir(new_link_path) and not os.path.islink(new_link_path):
-                            shutil.rmtree(new_link_path)
-                        else:
-                            os.unlink(new_link_path)
-                    
-                    # Get target information
-                    target_path = dl_data.get_target_path()
-                    is_dir = dl_data.get_target_type() == "directory"
-                    
-                    # Create symlink
-                    if os.name == 'nt':
-                        links.create_windows_symlink(target_path, new_link_path, is_dir)
-                    else:
-                        os.symlink(target_path, new_link_path)
+                        results[category].append(entry)
                     
-                    # Apply timestamp strategy with batch optimization
-                    timestamps.apply_timestamp_strategy(
-                        new_link_path,
-                        dl_data,
-                        timestamp_strategy,
-                        use_live_target,
-                        batch_mode=batch_optimization
-                    )
+                    if verbose:
+                        if dir_path != current_dir:
+                            current_dir = dir_path
+                            progress.append(f"\nProcessing directory: {dir_path}\n")
+                        progress.append(f"  [{processed_count}/{total_count}] Processing: {dl_path.name}\n")
+                        progress.extend(f"    {message}\n" for message in messages)
+                    elif category == "error":
+                        progress.append(f"  [{processed_count}/{total_count}] {dl_path}\n")
+                        progress.extend(f"    {message}\n" for message in messages)
                     
-                    # Restore file attributes
-                    links.restore_file_attributes(new_link_path, dl_data.to_dict())
-                    
-                    # Update dazzlelink metadata if requested
-                    if update_dazzlelink:
-                        dl_data.update_metadata(reason="symlink_recreation")
-                        
-                        # If we used live target, update target timestamps too
-                        if use_live_target and timestamp_strategy in ['target', 'preserve-all']:
-                            if os.path.exists(target_path):
-                                target_timestamps = timestamps.collect_target_timestamp_info(target_path)
-                                dl_data.set_target_timestamps(
-                                    created=target_timestamps.get('created'),
-                                    modified=target_timestamps.get('modified'),
-                                    accessed=target_timestamps.get('accessed')
-                                )
-                                
-                        # Save the updated dazzlelink
-                        dl_data.save_to_file(str(dl_path))
-                    
-                    # Track success
-                    results["success"].append({
-                        "dazzlelink": str(dl_path),
-                        "new_link": new_link_path,
-                        "target": target_path,
-                        "removed": False,
-                        "timestamp_strategy": timestamp_strategy,
-                        "updated_metadata": update_dazzlelink,
-                        "use_live_target": use_live_target
-                    })
-                    print(f"    SUCCESS: Created symlink at {new_link_path} -> {target_path}")
-                    if use_live_target:
-                        print(f"    CHECKED LIVE TARGET: {target_path}")
-                    
-                    # Remove dazzlelink if requested
-                    if remove_dazzlelinks:
-                        try:
-                            os.unlink(dl_path)
-                            results["success"][-1]["removed"] = True
-                            print(f"    REMOVED: {dl_path}")
-                        except Exception as e:
-                            print(f"    WARNING: Failed to remove dazzlelink {dl_path}: {str(e)}")
-                            results["success"][-1]["removal_error"] = str(e)
+                    if progress and (category == "error" or processed_count % PROGRESS_FLUSH_EVERY == 0):
+                        sys.stdout.write(''.join(progress))
+                        sys.stdout.flush()
+                        progress.clear()
+            finally:
+                if progress:
+                    sys.stdout.write(''.join(progress))
+                if executor is not None:
+                    executor.shutdown()
+        
+        # Links deferred to the elevated run are finished only once it has
+        # confirmed them; until then their dazzlelinks are left untouched
+        failed = set(getattr(elevated_batch, 'failed', ()))
+        for dl_path, entry in deferred:
+            messages = []
+            error = None
+            if os.path.abspath(entry["new_link"]) in failed:
+                error = f"Elevated symlink creation failed: {entry['new_link']}"
+            else:
+                try:
+                    dl_data = DazzleLinkData.from_file(str(dl_path))
+                    _finish_import(dl_path, dl_data, entry, messages, remove_dazzlelinks,
+                                   timestamp_strategy, update_dazzlelink, use_live_target,
+                                   batch_optimization, target_cache)
                 except Exception as e:
-                    results["error"].append({
-                        "path": str(dl_path),
-                        "error": str(e)
-                    })
-                    print(f"    ERROR: Failed to recreate link: {str(e)}")
-                    
-            except Exception as e:
-                results["error"].append({
-                    "path": str(dl_path),
-                    "error": str(e)
-                })
-                print(f"    ERROR: Failed to process {dl_path}: {str(e)}")
+                    error = f"Failed to complete elevated link: {str(e)}"
+            
+            if error is None:
+                results["success"].append(entry)
+            else:
+                results["error"].append({"path": entry["dazzlelink"], "error": error})
+                messages.append(f"ERROR: {error}")
+            if verbose or error is not None:
+                lines = [f"  Completing: {dl_path}"]
+                lines.extend(f"    {message}" for message in messages)
+                print('\n'.join(lines))
+    
+    # Write back the dazzlelinks queued during the run
+    for failed_path in DazzleLinkData.flush_pending_saves():
+        results["error"].append({
+            "path": failed_path,
+            "error": "Failed to save updated dazzlelink"
+        })
     
     # Print summary
     print("\nImport Summary:")
@@ -269,7 +805,7 @@ def batch_import(path_patterns, target_location=None, recursive=False,
     print(f"  {len(results['error'])} errors occurred")
     print(f"  {len(results['skipped'])} items skipped")
     
-    if remove_dazzlelinks and not dry_run:
+    if remove_dazzlelinks:
         # Count how many were successfully removed
         removed_count = sum(1 for item in results['success'] if item.get('removed', False))
         print(f"  {removed_count} dazzlelink files removed")
@@ -313,28 +849,45 @@ def convert_directory(directory, recursive=None, keep_originals=None, make_execu
     if mode is None:
         mode = config.get("default_mode")
         
-    # Scan for links
-    found_links = links.scan_directory(directory, recursive)
+    root = Path(directory).resolve()
+    if not root.is_dir():
+        raise DazzleLinkException(f"{root} is not a directory")
+    
     dazzlelinks = []
     
     # Process each link
     from .core import DazzleLink
     dazzle = DazzleLink(config)
     
-    for link in found_links:
-        try:
-            dazzlelink = dazzle.serialize_link(
-                link, 
-                make_executable=make_executable,
-                mode=mode
-            )
-            dazzlelinks.append(dazzlelink)
-            
-            if not keep_originals:
-                os.unlink(link)
-                
-        except Exception as e:
-            print(f"WARNING: Failed to convert {link}: {str(e)}")
+    # Originals are removed in a second pass, once every link has been
+    # serialized: the scan never sees its directories change underneath it,
+    # and an interrupted run leaves the symlinks in place
+    converted = []
+    
+    # Scan on this thread and stream the per-link I/O through the pool; directory
+    # settings are resolved here too, so workers never load configuration
+    human_readable_for = _human_readable_resolver(config)
+    tasks = (
+        (entry.path, partial(
+            _convert_one, dazzle, entry,
+            make_executable=make_executable,
+            mode=mode,
+            human_readable=human_readable_for(os.path.dirname(entry.path))
+        ))
+        for entry in links._scandir_symlinks(str(root), recursive)
+    )
+    with ThreadPoolExecutor(max_workers=_worker_count()) as executor:
+        for link, future in _submit_bounded(executor, tasks):
+            try:
+                dazzlelinks.append(future.result())
+                converted.append(link)
+            except Exception as e:
+                print(f"WARNING: Failed to convert {link}: {str(e)}")
+        
+        if not keep_originals:
+            for link, error in zip(converted, executor.map(_unlink_quietly, converted)):
+                if error is not None:
+                    print(f"WARNING: Failed to remove original {link}: {str(error)}")
             
     return dazzlelinks
 
@@ -372,39 +925,49 @@ def mirror_directory(src_dir, dest_dir, recursive=None, make_executable=None, mo
     if mode is None:
         mode = config.get("default_mode")
         
-    # Find all symlinks in the source directory
-    found_links = links.scan_directory(src_dir, recursive)
     src_dir = Path(src_dir).resolve()
     dest_dir = Path(dest_dir).resolve()
-    dazzlelinks = []
+    if not src_dir.is_dir():
+        raise DazzleLinkException(f"{src_dir} is not a directory")
     
-    # Create destination directory if it doesn't exist
-    os.makedirs(dest_dir, exist_ok=True)
+    dazzlelinks = []
     
     # Process each link
     from .core import DazzleLink
     dazzle = DazzleLink(config)
     
-    for link in found_links:
-        try:
+    # Directory settings are resolved on the scanning thread, so workers never load configuration
+    human_readable_for = _human_readable_resolver(config)
+    
+    def tasks():
+        for entry in links._scandir_symlinks(str(src_dir), recursive):
             # Calculate relative path
-            rel_path = os.path.relpath(link, src_dir)
+            rel_path = os.path.relpath(entry.path, src_dir)
             dest_path = os.path.join(dest_dir, rel_path)
             
-            # Create parent directories
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            # Create each mirrored directory here, once, so workers never race
+            # on makedirs for the same parent (later calls hit ensure_directory's cache)
+            links.ensure_directory(os.path.dirname(dest_path))
             
-            # Create dazzlelink at the destination
-            dazzlelink = dazzle.serialize_link(
-                link, 
-                output_path=f"{dest_path}{dazzle.DAZZLELINK_EXT}", 
+            yield entry.path, partial(
+                _convert_one, dazzle, entry,
+                dest_path=dest_path,
                 make_executable=make_executable,
-                mode=mode
+                mode=mode,
+                human_readable=human_readable_for(os.path.dirname(entry.path))
             )
-            dazzlelinks.append(dazzlelink)
-            
-        except Exception as e:
-            print(f"WARNING: Failed to mirror {link}: {str(e)}")
+    
+    with links.directory_cache():
+        # Create destination directory if it doesn't exist
+        links.ensure_directory(str(dest_dir))
+        
+        # Scan on this thread and stream the per-link I/O through the pool
+        with ThreadPoolExecutor(max_workers=_worker_count()) as executor:
+            for link, future in _submit_bounded(executor, tasks()):
+                try:
+                    dazzlelinks.append(future.result())
+                except Exception as e:
+                    print(f"WARNING: Failed to mirror {link}: {str(e)}")
                 
     return dazzlelinks
 
@@ -441,76 +1004,67 @@ def batch_copy(src_paths, dst_dir, preserve_structure=False, base_dir=None,
     
     # Determine base directory for structure preservation
     if preserve_structure and not base_dir:
-        # Find common parent directory
-        paths = [Path(link).parent for link in src_paths]
-        base_dir = os.path.commonpath([str(p) for p in paths])
+        # Find common parent directory (commonpath normalizes the strings
+        # itself, so no Path objects are needed)
+        base_dir = os.path.commonpath([os.path.dirname(link) or os.curdir for link in src_paths])
     
     created_links = []
+    created_targets = []
     
-    for link in src_paths:
-        try:
-            link_path = Path(link).resolve()
-            target_path = os.readlink(link)
-            is_absolute = os.path.isabs(target_path)
-            
-            # Determine destination link path
-            if preserve_structure:
-                rel_path = os.path.relpath(link, base_dir)
-                dest_link = os.path.join(dst_dir, rel_path)
-                # Ensure parent directories exist
-                os.makedirs(os.path.dirname(dest_link), exist_ok=True)
-            else:
-                dest_link = os.path.join(dst_dir, os.path.basename(link))
-            
-            # Determine target path in destination
-            if relative_links is not None:
-                # Force to relative or absolute based on parameter
-                if relative_links and is_absolute:
-                    # Convert absolute to relative
-                    if os.path.exists(target_path):
-                        # If target exists, make relative to the new link location
-                        dest_link_dir = os.path.dirname(dest_link)
-                        target_path = os.path.relpath(target_path, dest_link_dir)
-                elif not relative_links and not is_absolute:
-                    # Convert relative to absolute
-                    orig_link_dir = os.path.dirname(link)
-                    abs_target = os.path.normpath(os.path.join(orig_link_dir, target_path))
-                    target_path = abs_target
-            
-            # Create the link
-            if os.path.exists(dest_link):
-                if os.path.isdir(dest_link) and not os.path.islink(dest_link):
-                    shutil.rmtree(dest_link)
+    # Destination directories are created once each
+    with links.directory_cache():
+        for link in src_paths:
+            try:
+                target_path = os.readlink(link)
+                is_absolute = os.path.isabs(target_path)
+                link_dir = os.path.dirname(link)
+                
+                # Determine destination link path
+                if preserve_structure:
+                    rel_path = os.path.relpath(link, base_dir)
+                    dest_link = os.path.join(dst_dir, rel_path)
+                    # Ensure parent directories exist
+                    links.ensure_directory(os.path.dirname(dest_link))
                 else:
-                    os.unlink(dest_link)
+                    dest_link = os.path.join(dst_dir, os.path.basename(link))
+                
+                # Determine target path in destination
+                if relative_links is not None:
+                    # Force to relative or absolute based on parameter
+                    if relative_links and is_absolute:
+                        # Convert absolute to relative
+                        if os.path.exists(target_path):
+                            # If target exists, make relative to the new link location
+                            dest_link_dir = os.path.dirname(dest_link)
+                            target_path = os.path.relpath(target_path, dest_link_dir)
+                    elif not relative_links and not is_absolute:
+                        # Convert relative to absolute
+                        abs_target = os.path.normpath(os.path.join(link_dir, target_path))
+                        target_path = abs_target
+                
+                # Create the link, replacing any existing link/file
+                is_dir = IS_WINDOWS and os.path.isdir(os.path.join(link_dir, target_path))
+                links.replace_with_symlink(target_path, dest_link, is_dir)
+                
+                # Copy attributes if possible
+                try:
+                    shutil.copystat(link, dest_link, follow_symlinks=False)
+                except:
+                    pass
                     
-            # Create symlink
-            if os.name == 'nt':
-                is_dir = os.path.isdir(os.path.join(os.path.dirname(link), target_path))
-                links.create_windows_symlink(target_path, dest_link, is_dir)
-            else:
-                os.symlink(target_path, dest_link)
-            
-            # Copy attributes if possible
-            try:
-                shutil.copystat(link, dest_link, follow_symlinks=False)
-            except:
-                pass
+                created_links.append(dest_link)
+                created_targets.append(target_path)
                 
-            created_links.append(dest_link)
-            
-        except Exception as e:
-            print(f"WARNING: Failed to copy {link}: {str(e)}")
-    
-    # Verify all links if requested
+            except Exception as e:
+                print(f"WARNING: Failed to copy {link}: {str(e)}")
+        
+    # Verify all links if requested; the targets written above are reused,
+    # so no readlink is needed
     if verify:
         broken_links = []
-        for new_link in created_links:
-            try:
-                target = os.readlink(new_link)
-                if not os.path.exists(os.path.join(os.path.dirname(new_link), target)):
-                    broken_links.append(new_link)
-            except:
+        for new_link, target in zip(created_links, created_targets):
+            # join() leaves absolute targets unchanged
+            if not os.path.exists(os.path.join(os.path.dirname(new_link), target)):
                 broken_links.append(new_link)
                 
         if broken_links:
@@ -522,6 +1076,92 @@ def batch_copy(src_paths, dst_dir, preserve_structure=False, base_dir=None,
     
     return created_links
 
+def _find_name(root, target_name, searched=None):
+    """
+    Breadth-first search below root for an entry called target_name
+    
+    Uses os.scandir so entry types come from the directory listing, stops at
+    the first match, and (like os.walk) does not descend into symlinked
+    directories. Shallower matches are found first. On POSIX the scan runs
+    on bytes paths, so entry names are never decoded to str.
+    
+    Args:
+        root (str): Directory to search
+        target_name (str): Entry name to look for
+        searched (set, optional): Directories already searched; they are
+            skipped, and every directory searched here is added
+            
+    Returns:
+        str: Path of the first matching entry, or None
+    """
+    if searched is None:
+        searched = set()
+    
+    if not IS_WINDOWS:
+        root = os.fsencode(root)
+        target_name = os.fsencode(target_name)
+    
+    queue = deque([root])
+    while queue:
+        current = queue.popleft()
+        if current in searched:
+            continue
+        searched.add(current)
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name == target_name:
+                        return os.fsdecode(entry.path)
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            queue.append(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            continue
+    return None
+
+def _probe_targets(absolute_targets):
+    """
+    Check the existence of link targets, one directory listing per shared parent
+    
+    Targets whose parent directory is shared with another target are looked
+    up in a single os.scandir listing of that parent. Directories that do not
+    exist settle all their targets at once. Targets that are themselves
+    symlinks, or are missing from the listing (which may just be a case
+    difference), are left to the caller, as are targets with a unique parent.
+    
+    Args:
+        absolute_targets (iterable): Normalized absolute target paths
+        
+    Returns:
+        dict: Target path -> bool for the targets this could settle
+    """
+    by_parent = {}
+    for target in absolute_targets:
+        by_parent.setdefault(os.path.dirname(target), set()).add(target)
+    
+    known = {}
+    for parent, targets in by_parent.items():
+        if len(targets) < 2:
+            continue
+        try:
+            with os.scandir(parent) as it:
+                entries = {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            known.update(dict.fromkeys(targets, False))
+            continue
+        except OSError:
+            continue
+        for target in targets:
+            entry = entries.get(os.path.basename(target))
+            try:
+                if entry is not None and not entry.is_symlink():
+                    known[target] = True
+            except OSError:
+                pass
+    return known
+
 def check_links(directory, recursive=True, report_only=True, fix_relative=False):
     """
     Check symlinks in a directory and report broken ones.
@@ -550,18 +1190,36 @@ def check_links(directory, recursive=True, report_only=True, fix_relative=False)
     
     print(f"Checking {len(found_links)} symlinks...")
     
-    for link in found_links:
+    # Read every link first so targets sharing a directory can be checked
+    # with one listing of that directory
+    link_targets = []
+    for link, (target_path, error) in zip(found_links, _readlink_many(found_links)):
         try:
-            target_path = os.readlink(link)
+            if error is not None:
+                raise error
             absolute_target = target_path
             
             # If target is relative, convert to absolute for checking
             if not os.path.isabs(target_path):
                 base_dir = os.path.dirname(link)
                 absolute_target = os.path.normpath(os.path.join(base_dir, target_path))
+            link_targets.append((link, target_path, absolute_target, None))
+        except Exception as e:
+            link_targets.append((link, None, None, e))
+    
+    known_exists = _probe_targets(absolute_target for _, _, absolute_target, error in link_targets
+                                  if error is None)
+    
+    for link, target_path, absolute_target, error in link_targets:
+        try:
+            if error is not None:
+                raise error
             
-            # Check if the target exists using os.path.exists()
-            target_exists = os.path.exists(absolute_target)
+            # Check if the target exists; once a link has been fixed, earlier
+            # answers may be stale, so fall back to os.path.exists()
+            target_exists = known_exists.get(absolute_target)
+            if target_exists is None or result['fixed']:
+                target_exists = os.path.exists(absolute_target)
             
             if target_exists:
                 result['ok'].append({
@@ -585,30 +1243,25 @@ def check_links(directory, recursive=True, report_only=True, fix_relative=False)
                     base_dir = os.path.dirname(link)
                     target_name = os.path.basename(target_path)
                     
-                    # Search in parent directories for the target
+                    # Search in parent directories for the target; directories
+                    # searched from a lower level are not searched again
                     current_dir = base_dir
                     max_depth = 5  # Limit search depth
                     depth = 0
+                    searched = set()
                     
                     while depth < max_depth and current_dir and current_dir != os.path.dirname(current_dir):
                         # Check if target exists in this directory or subdirectories
-                        for root, dirs, files in os.walk(current_dir):
-                            for name in dirs + files:
-                                if name == target_name:
-                                    candidate = os.path.join(root, name)
-                                    rel_path = os.path.relpath(candidate, os.path.dirname(link))
-                                    
-                                    # Update the symlink
-                                    os.unlink(link)
-                                    os.symlink(rel_path, link)
-                                    
-                                    broken_info['fixed_target'] = rel_path
-                                    result['fixed'].append(broken_info)
-                                    fixed = True
-                                    break
-                            if fixed:
-                                break
-                        if fixed:
+                        candidate = _find_name(current_dir, target_name, searched)
+                        if candidate is not None:
+                            rel_path = os.path.relpath(candidate, os.path.dirname(link))
+                            
+                            # Update the symlink
+                            links.replace_with_symlink(rel_path, link)
+                            
+                            broken_info['fixed_target'] = rel_path
+                            result['fixed'].append(broken_info)
+                            fixed = True
                             break
                             
                         # Move up to parent directory
@@ -647,7 +1300,7 @@ def check_links(directory, recursive=True, report_only=True, fix_relative=False)
     return result
 
 def rebase_links(directory, recursive=True, make_relative=None, 
-                target_base=None, only_broken=False):
+                target_base=None, only_broken=False, backup=True):
     """
     Rebase links in a directory, converting between relative and absolute paths
     or changing the base path of absolute links.
@@ -662,6 +1315,8 @@ def rebase_links(directory, recursive=True, make_relative=None,
             Format: "old_prefix:new_prefix" or just "new_prefix" to replace
             the entire path.
         only_broken (bool): Only rebase broken links
+        backup (bool): Keep the old target in a '<link>.backup' symlink. The
+            update itself is an atomic swap, so this is only an audit trail.
             
     Returns:
         dict: Report of links modified
@@ -680,19 +1335,26 @@ def rebase_links(directory, recursive=True, make_relative=None,
     
     print(f"Rebasing {len(found_links)} symlinks...")
     
+    # Parse the base replacement once rather than per link
+    old_prefix = new_prefix = None
+    if target_base and ':' in target_base:
+        old_prefix, new_prefix = target_base.split(':', 1)
+    
     for link in found_links:
         try:
             original_target = os.readlink(link)
             is_absolute = os.path.isabs(original_target)
             link_dir = os.path.dirname(link)
+            # Absolute form of the target; scan_directory returns absolute link
+            # paths, so this equals os.path.abspath(os.path.join(...))
+            if is_absolute:
+                absolute_target = original_target
+            else:
+                absolute_target = os.path.normpath(os.path.join(link_dir, original_target))
             
             # Check if link is broken (if only_broken is True)
             if only_broken:
-                if is_absolute:
-                    target_exists = os.path.exists(original_target)
-                else:
-                    abs_path = os.path.normpath(os.path.join(link_dir, original_target))
-                    target_exists = os.path.exists(abs_path)
+                target_exists = os.path.exists(absolute_target)
                     
                 if target_exists:
                     result['unchanged'].append({
@@ -714,13 +1376,12 @@ def rebase_links(directory, recursive=True, make_relative=None,
                     change_reason = 'Converted absolute to relative'
                 elif not make_relative and not is_absolute:
                     # Convert relative to absolute
-                    new_target = os.path.abspath(os.path.join(link_dir, original_target))
+                    new_target = absolute_target
                     change_reason = 'Converted relative to absolute'
             
             # Handle target base replacement for absolute paths
             if target_base and is_absolute:
-                if ':' in target_base:
-                    old_prefix, new_prefix = target_base.split(':', 1)
+                if old_prefix is not None:
                     if original_target.startswith(old_prefix):
                         new_target = original_target.replace(old_prefix, new_prefix, 1)
                         change_reason = f'Replaced base {old_prefix} with {new_prefix}'
@@ -733,15 +1394,13 @@ def rebase_links(directory, recursive=True, make_relative=None,
             # Update link if target changed
             if new_target != original_target:
                 # Backup existing link first
-                backup_target = original_target
-                backup_link = f"{link}.backup"
-                if os.path.exists(backup_link):
-                    os.unlink(backup_link)
-                os.symlink(backup_target, backup_link)
+                backup_link = None
+                if backup:
+                    backup_link = f"{link}.backup"
+                    links.replace_with_symlink(original_target, backup_link)
                 
-                # Update the link
-                os.unlink(link)
-                os.symlink(new_target, link)
+                # Update the link (renamed over the old one on POSIX, so it never goes missing)
+                links.replace_with_symlink(new_target, link)
                 
                 result['changed'].append({
                     'link': link,
@@ -772,7 +1431,8 @@ def rebase_links(directory, recursive=True, make_relative=None,
         for info in result['changed']:
             print(f"  {info['link']}: {info['old_target']} -> {info['new_target']}")
             print(f"    Reason: {info['reason']}")
-            print(f"    Backup: {info['backup']}")
+            if info['backup']:
+                print(f"    Backup: {info['backup']}")
     
     # Print errors
     if result['errors']:
@@ -799,8 +1459,6 @@ def update_config_batch(path, mode=None, pattern="*.dazzlelink", recursive=False
     Returns:
         dict: Report of updated files and any errors
     """
-    import fnmatch
-    
     results = {
         'updated': [],
         'errors': [],
@@ -880,36 +1538,34 @@ def update_config_batch(path, mode=None, pattern="*.dazzlelink", recursive=False
                     results['updated'].append(str(dazzlelink_path))
                     continue
                     
-                # Load the dazzlelink
-                with open(dazzlelink_path, 'r', encoding='utf-8') as f:
-                    # Try to detect if it's a script or JSON format
-                    content = f.read()
-                    
-                    # Check if it's a script-embedded dazzlelink
-                    json_start = content.find('# DAZZLELINK_DATA_BEGIN')
-                    if json_start != -1:
-                        # Extract JSON part
-                        json_text = content[json_start + len('# DAZZLELINK_DATA_BEGIN'):].strip()
-                        try:
-                            link_data = json.loads(json_text)
-                            is_script = True
-                        except json.JSONDecodeError:
-                            results['errors'].append({
-                                'path': str(dazzlelink_path),
-                                'error': 'Failed to parse embedded JSON'
-                            })
-                            continue
-                    else:
-                        # Try parsing as plain JSON
-                        try:
-                            link_data = json.loads(content)
-                            is_script = False
-                        except json.JSONDecodeError:
-                            results['errors'].append({
-                                'path': str(dazzlelink_path),
-                                'error': 'Not a valid dazzlelink file'
-                            })
-                            continue
+                # Load the dazzlelink in one read; parsing works on the bytes
+                content = read_bytes(dazzlelink_path)
+                
+                # Check if it's a script-embedded dazzlelink
+                json_start = content.rfind(b'# DAZZLELINK_DATA_BEGIN')
+                if json_start != -1:
+                    # Extract JSON part
+                    json_text = content[json_start + len(b'# DAZZLELINK_DATA_BEGIN'):].strip()
+                    try:
+                        link_data = json_loads(json_text)
+                        is_script = True
+                    except json.JSONDecodeError:
+                        results['errors'].append({
+                            'path': str(dazzlelink_path),
+                            'error': 'Failed to parse embedded JSON'
+                        })
+                        continue
+                else:
+                    # Try parsing as plain JSON
+                    try:
+                        link_data = json_loads(content)
+                        is_script = False
+                    except json.JSONDecodeError:
+                        results['errors'].append({
+                            'path': str(dazzlelink_path),
+                            'error': 'Not a valid dazzlelink file'
+                        })
+                        continue
                 
                 # Check if any changes needed
                 changes_made = False
@@ -933,7 +1589,7 @@ def update_config_batch(path, mode=None, pattern="*.dazzlelink", recursive=False
                         # Create config if it doesn't exist
                         link_data["config"] = {
                             "default_mode": mode,
-                            "platform": 'windows' if os.name == 'nt' else 'linux'
+                            "platform": 'windows' if IS_WINDOWS else 'linux'
                         }
                         changes_made = True
                 
@@ -952,24 +1608,27 @@ def update_config_batch(path, mode=None, pattern="*.dazzlelink", recursive=False
                     results['updated'].append(str(dazzlelink_path))
                     continue
                 
-                # Make the changes
-                if is_script:
+                # Make the changes; making the file executable rewrites it
+                # completely (with a script for the current mode), so the
+                # content is written once either way
+                if make_executable:
+                    links.make_dazzlelink_executable(dazzlelink_path, link_data)
+                elif is_script:
                     # For script-embedded dazzlelinks, preserve the script part
-                    script_part = content[:json_start + len('# DAZZLELINK_DATA_BEGIN')]
+                    # (as read, line endings included)
+                    script_part = content[:json_start + len(b'# DAZZLELINK_DATA_BEGIN')]
+                    newline = b'\r\n' if b'\r\n' in script_part else b'\n'
                     
-                    with open(dazzlelink_path, 'w', encoding='utf-8') as f:
-                        f.write(script_part + '\n')
-                        json.dump(link_data, f, indent=2)
+                    with open(dazzlelink_path, 'wb') as f:
+                        f.write(script_part + newline + DazzleLinkData(link_data).to_bytes())
                 else:
                     # For plain JSON dazzlelinks
-                    with open(dazzlelink_path, 'w', encoding='utf-8') as f:
-                        json.dump(link_data, f, indent=2)
-                
-                # Handle executable flag if specified
-                if make_executable is not None:
-                    if make_executable:
-                        links.make_dazzlelink_executable(dazzlelink_path, link_data)
-                    # Note: There's no direct way to make a file "non-executable" in the current code
+                    with open(dazzlelink_path, 'wb') as f:
+                        f.write(DazzleLinkData(link_data).to_bytes())
+                # A same-size rewrite within the mtime granularity would
+                # otherwise keep serving the old payload
+                DazzleLinkData.invalidate_cache(dazzlelink_path)
+                # Note: There's no direct way to make a file "non-executable" in the current code
                 
                 results['updated'].append(str(dazzlelink_path))
                 
@@ -8,8 +8,9 @@ for working with symbolic links and dazzlelink files.
 import os
 import sys
 import re
-import json
 import stat
+import hashlib
+import mmap
 import shutil
 import datetime
 import subprocess
@@ -22,17 +23,78 @@ from ..exceptions import DazzleLinkException
 from ..data import DazzleLinkData
 from ..config import DazzleLinkConfig
 from ..path import UNCAdapter, get_unc_adapter
+from . import links
 
 # Add debugging support
 VERBOSE = os.environ.get('DAZZLELINK_VERBOSE', '0') == '1'
+
+# Platform checks, evaluated once at import
+IS_WINDOWS = os.name == 'nt'
+PLATFORM = 'windows' if IS_WINDOWS else 'linux'
+
+# Optional platform modules for security info, imported once; None when unavailable
+pwd = grp = win32security = None
+if IS_WINDOWS:
+    try:
+        import win32security
+    except ImportError:
+        win32security = None
+else:
+    try:
+        import pwd
+        import grp
+    except ImportError:
+        pwd = grp = None
+
 logger = logging.getLogger(__name__)
 
+# Hash used for target checksums (recorded alongside the digest)
+CHECKSUM_ALGORITHM = 'blake2b'
+# Only files smaller than this are checksummed
+CHECKSUM_MAX_SIZE = 8 * 1024 * 1024
+# Files below this size are read in one call; mapping them costs more than it saves
+CHECKSUM_MMAP_MIN_SIZE = 64 * 1024
+
+# Result shapes of the collectors; each call starts from a flat copy of these
+_FILE_ATTR_TEMPLATE = {"hidden": False, "system": False, "readonly": False}
+_TARGET_INFO_TEMPLATE = {"exists": False, "type": "unknown", "size": None, "checksum": None, "extension": None}
+_SECURITY_INFO_TEMPLATE = {"permissions": None, "owner": None, "group": None}
+_TIMESTAMPS_TEMPLATE = {
+    "created": None, "modified": None, "accessed": None,
+    "created_iso": None, "modified_iso": None, "accessed_iso": None
+}
+
 def debug_print(message):
-    """Print debug messages if VERBOSE is enabled"""
+    """
+    Print debug messages if VERBOSE is enabled
+    
+    Arguments are formatted before the call, so messages that are costly to
+    build (e.g. datetime conversions) should be guarded with 'if VERBOSE:'.
+    """
     if VERBOSE:
         print(f"DEBUG: {message}")
         logger.debug(message)
 
+def _file_checksum(f, size):
+    """
+    Compute the checksum of an open binary file without a Python-level read loop
+    
+    Args:
+        f (file): File object opened in binary mode
+        size (int): Size of the file in bytes
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    if size < CHECKSUM_MMAP_MIN_SIZE:
+        # Small (or empty, which mmap cannot map) files: a single read is cheapest
+        return hashlib.new(CHECKSUM_ALGORITHM, f.read()).hexdigest()
+    if hasattr(hashlib, 'file_digest'):
+        # Python 3.11+: hashing happens in C over a reused buffer
+        return hashlib.file_digest(f, CHECKSUM_ALGORITHM).hexdigest()
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return hashlib.new(CHECKSUM_ALGORITHM, mm).hexdigest()
+
 class DazzleLink:
     """
     Core DazzleLink functionality for handling symbolic links
@@ -40,17 +102,25 @@ class DazzleLink:
     """
     DAZZLELINK_EXT = '.dazzlelink'
     VERSION = 1
+    
+    # Maximum number of cached path representations before the cache is reset
+    PATH_REPR_CACHE_SIZE = 4096
 
     def __init__(self, config=None):
-        self.platform = 'windows' if os.name == 'nt' else 'linux'
+        self.platform = PLATFORM
         self.config = config or DazzleLinkConfig()
         
-        # Initialize UNC adapter for path conversions
-        self._initialize_unc_adapter()
+        # Initialize UNC adapter for path conversions (Windows only)
+        self._unc_adapter = None
+        # Path representations by input path, valid for one adapter mapping generation
+        self._path_repr_cache = {}
+        self._path_repr_generation = None
+        if IS_WINDOWS:
+            self._initialize_unc_adapter()
     
     def _initialize_unc_adapter(self):
         """Initialize the UNC adapter if on Windows and not already initialized"""
-        if os.name == 'nt' and not hasattr(self, '_unc_adapter'):
+        if IS_WINDOWS and self._unc_adapter is None:
             try:
                 # Use the UNCAdapter from the path module
                 self._unc_adapter = get_unc_adapter()
@@ -76,32 +146,38 @@ class DazzleLink:
             "original_path": str(path_obj),
         }
         
-        # Add normalized versions on Windows
-        if os.name == 'nt':
-            # Initialize UNC adapter if needed
-            if not hasattr(self, '_unc_adapter') or self._unc_adapter is None:
-                try:
-                    self._initialize_unc_adapter()
-                except Exception as e:
-                    debug_print(f"Failed to initialize UNC adapter: {e}")
-                    return representations
-            
-            # If UNC adapter is available, add normalized representations
-            if hasattr(self, '_unc_adapter') and self._unc_adapter is not None:
-                try:
-                    # Add UNC path
-                    unc_path = self._unc_adapter.drive_to_unc(path_obj)
-                    if str(unc_path) != str(path_obj):
-                        representations["unc_path"] = str(unc_path)
-                    
-                    # Add drive path
-                    drive_path = self._unc_adapter.unc_to_drive(path_obj)
-                    if str(drive_path) != str(path_obj):
-                        representations["drive_path"] = str(drive_path)
-                except Exception as e:
-                    debug_print(f"Failed to get path representations: {e}")
+        # Add normalized versions when the UNC adapter is available (Windows only)
+        adapter = self._unc_adapter
+        if adapter is None:
+            return representations
+        
+        # Links in one tree share targets and prefixes; reuse earlier results
+        # unless the drive mappings have been refreshed since
+        cache = self._path_repr_cache
+        if self._path_repr_generation != adapter.generation:
+            cache.clear()
+            self._path_repr_generation = adapter.generation
+        key = str(path)
+        cached = cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        try:
+            # Compute both UNC and drive paths in one pass, keeping only those that differ
+            original = representations["original_path"]
+            unc_path, drive_path = adapter.both_representations(original)
+            if unc_path is not None and unc_path != original:
+                representations["unc_path"] = unc_path
+            if drive_path is not None and drive_path != original:
+                representations["drive_path"] = drive_path
+        except Exception as e:
+            debug_print(f"Failed to get path representations: {e}")
+            return representations
         
-        return representations
+        if len(cache) >= self.PATH_REPR_CACHE_SIZE:
+            cache.clear()
+        cache[key] = representations
+        return dict(representations)
 
     def _normalize_path(self, path, to_unc=False):
         """
@@ -114,34 +190,24 @@ class DazzleLink:
         Returns:
             Path: The normalized path
         """
-        # If not on Windows, return the path unchanged
-        if os.name != 'nt':
-            return Path(path)
-            
-        # Initialize UNC adapter if needed
-        if not hasattr(self, '_unc_adapter') or self._unc_adapter is None:
-            try:
-                self._initialize_unc_adapter()
-            except Exception as e:
-                debug_print(f"Failed to initialize UNC adapter: {e}")
-                return Path(path)
-        
-        # If UNC adapter is not available, return the path unchanged
-        if not hasattr(self, '_unc_adapter') or self._unc_adapter is None:
+        # If UNC adapter is not available (e.g. not on Windows), return the path unchanged
+        adapter = self._unc_adapter
+        if adapter is None:
             return Path(path)
             
         # Convert the path
         try:
             path_obj = Path(path)
             if to_unc:
-                return self._unc_adapter.drive_to_unc(path_obj)
+                return adapter.drive_to_unc(path_obj)
             else:
-                return self._unc_adapter.unc_to_drive(path_obj)
+                return adapter.unc_to_drive(path_obj)
         except Exception as e:
             debug_print(f"Path normalization failed: {e}")
             return Path(path)
     
-    def serialize_link(self, link_path, output_path=None, make_executable=None, mode=None, require_symlink=True):
+    def serialize_link(self, link_path, output_path=None, make_executable=None, mode=None, require_symlink=True,
+                       link_stat=None, human_readable=None):
         """
         Serialize a symbolic link to a .dazzlelink file
         
@@ -155,49 +221,57 @@ class DazzleLink:
                 If None, uses configuration default.
             require_symlink (bool, optional): Whether to require link_path to be a symlink.
                 If False, will create a dazzlelink directly without checking if link_path is a symlink.
+            link_stat (os.stat_result, optional): lstat result for link_path, e.g. from
+                DirEntry.stat(follow_symlinks=False). If None, link_path is lstat'ed once
+                and the result is shared by all collectors.
+            human_readable (bool, optional): Whether to write indented JSON.
+                If None, uses configuration default.
             
         Returns:
             str: Path to the created dazzlelink file
         """
         debug_print(f"serialize_link called with link_path={link_path}, output_path={output_path}, require_symlink={require_symlink}")
-        link_path = Path(link_path)
-        
         # Important: Do NOT use resolve() here as it follows symlinks
-        # Instead, use absolute() to get the absolute path without following symlinks
-        link_path = link_path.absolute()
+        # Instead, use abspath() to get the absolute path without following the link;
+        # the path stays a str since everything below goes through os.* calls
+        link_path = os.path.abspath(os.fspath(link_path))
         debug_print(f"Absolute link_path: {link_path}")
+        link_dir = os.path.dirname(link_path)
         
-        # Load directory-specific config
-        self.config.load_directory_config(os.path.dirname(str(link_path)))
+        # Load directory-specific config, unless every setting it could supply was given
+        # (batch callers resolve them up front and share this instance across threads)
+        if make_executable is None or mode is None or human_readable is None:
+            self.config.load_directory_config(link_dir)
         
         # Use config defaults if parameters not specified
         if make_executable is None:
             make_executable = self.config.get("make_executable")
         if mode is None:
             mode = self.config.get("default_mode")
+        if human_readable is None:
+            human_readable = self.config.get("human_readable")
+        
+        # Stat the link once; the collectors below reuse the result
+        if link_stat is None:
+            try:
+                link_stat = os.lstat(link_path)
+            except OSError:
+                link_stat = None
         
         # Check if it's a symlink when required
-        is_symlink = os.path.islink(link_path)
+        is_symlink = link_stat is not None and stat.S_ISLNK(link_stat.st_mode)
         debug_print(f"Is {link_path} a symlink? {is_symlink}")
         
         if require_symlink and not is_symlink:
             raise DazzleLinkException(f"{link_path} is not a symbolic link")
         
         try:
-            # Initialize UNC methods if needed
-            if not hasattr(self, '_initialize_unc_adapter'):
-                self._initialize_unc_adapter = lambda: None
-                self._get_path_representations = lambda path: {"original_path": str(path)}
-            else:
-                # If methods exist but need initialization, initialize them
-                self._initialize_unc_adapter()
-            
-            # Get path representations for UNC path handling
-            if hasattr(self, '_get_path_representations'):
+            # Get path representations for UNC path handling (only Windows has alternatives)
+            if IS_WINDOWS:
                 path_representations = self._get_path_representations(link_path)
                 debug_print(f"Path representations: {path_representations}")
             else:
-                path_representations = {"original_path": str(link_path)}
+                path_representations = {"original_path": link_path}
             
             # If it's a symlink, get the target
             if is_symlink:
@@ -206,33 +280,32 @@ class DazzleLink:
                 
                 # Convert to absolute path if relative
                 if not os.path.isabs(target_path):
-                    base_dir = os.path.dirname(str(link_path))
-                    target_path = os.path.normpath(os.path.join(base_dir, target_path))
+                    target_path = os.path.normpath(os.path.join(link_dir, target_path))
                     debug_print(f"Converted relative target to absolute: {target_path}")
             else:
                 # If not a symlink, use the link_path itself as the target path
                 # IMPORTANT: Do NOT use resolve() here as it would follow symlinks
-                target_path = str(link_path)
+                target_path = link_path
                 debug_print(f"Not a symlink, using path as target: {target_path}")
             
             # Get target path representations for UNC path handling
-            if hasattr(self, '_get_path_representations'):
+            if IS_WINDOWS:
                 target_representations = self._get_path_representations(target_path)
                 debug_print(f"Target representations: {target_representations}")
             else:
-                target_representations = {"original_path": str(target_path)}
+                target_representations = {"original_path": target_path}
             
             # Create a new DazzleLinkData instance
             link_data = DazzleLinkData()
             
             # Set basic link info
-            link_data.set_original_path(str(link_path))
+            link_data.set_original_path(link_path)
             link_data.set_target_path(target_path)
             link_data.set_platform(self.platform)
             link_data.set_default_mode(mode)
             
             # Get timestamps for link and target
-            link_timestamps = self._collect_timestamp_info(link_path)
+            link_timestamps = self._collect_timestamp_info(link_path, link_stat)
             link_data.set_link_timestamps(
                 created=link_timestamps[0],
                 modified=link_timestamps[1],
@@ -257,7 +330,7 @@ class DazzleLink:
             data_dict["link"]["target_representations"] = target_representations
             data_dict["link"]["type"] = "symlink" if is_symlink else "file"
             data_dict["link"]["relative_path"] = not os.path.isabs(target_path)
-            data_dict["link"]["attributes"] = self._collect_file_attributes(link_path)
+            data_dict["link"]["attributes"] = self._collect_file_attributes(link_path, link_stat)
             
             # Add target info
             if "target" not in data_dict:
@@ -268,7 +341,7 @@ class DazzleLink:
                     data_dict["target"][key] = value
             
             # Add security info
-            data_dict["security"] = self._collect_security_info(link_path)
+            data_dict["security"] = self._collect_security_info(link_path, link_stat)
             
             # Validate mode
             if mode not in DazzleLinkConfig.VALID_MODES:
@@ -279,114 +352,107 @@ class DazzleLink:
             if output_path is None:
                 output_path = f"{link_path}{self.DAZZLELINK_EXT}"
             else:
-                output_path = Path(output_path)
+                output_path = os.fspath(output_path)
                 # Ensure parent directory exists
-                os.makedirs(output_path.parent, exist_ok=True)
-            
-            # Create the dazzlelink file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data_dict, f, indent=2)
+                links.ensure_directory(os.path.dirname(output_path))
             
+            # Create the dazzlelink file; executable ones are written in one
+            # go rather than as plain JSON that is then rewritten
             if make_executable:
-                self._make_dazzlelink_executable(output_path, data_dict)
+                links._write_executable_dazzlelink(output_path, data_dict, human_readable)
+            else:
+                with open(output_path, 'wb') as f:
+                    f.write(DazzleLinkData(data_dict).to_bytes(human_readable))
+                DazzleLinkData.invalidate_cache(output_path)
             
             return output_path
             
         except Exception as e:
             raise DazzleLinkException(f"Failed to serialize link {link_path}: {str(e)}")
     
-    def _collect_file_attributes(self, file_path):
-        """Collect file attributes in a platform-independent way"""
-        attributes = {
-            "hidden": False,
-            "system": False,
-            "readonly": False
-        }
+    def _collect_file_attributes(self, file_path, stats=None):
+        """Collect file attributes in a platform-independent way (stats: optional lstat result)"""
+        attributes = _FILE_ATTR_TEMPLATE.copy()
         
         try:
-            if os.name == 'nt':
+            if IS_WINDOWS:
                 # Windows specific attributes
-                stats = os.lstat(file_path)
+                if stats is None:
+                    stats = os.lstat(file_path)
                 if hasattr(stats, 'st_file_attributes'):
                     attributes["hidden"] = bool(stats.st_file_attributes & 0x2)
                     attributes["system"] = bool(stats.st_file_attributes & 0x4)
                     attributes["readonly"] = bool(stats.st_file_attributes & 0x1)
             else:
                 # Unix-like attributes
-                path = Path(file_path)
                 # Hidden files in Unix start with a dot
-                attributes["hidden"] = path.name.startswith('.')
+                attributes["hidden"] = os.path.basename(os.fspath(file_path)).startswith('.')
                 # Check if file is readonly
                 attributes["readonly"] = not os.access(file_path, os.W_OK)
-        except:
+        except (OSError, ValueError):
             pass
             
         return attributes
     
     def _collect_target_info(self, target_path):
         """Collect information about the target of a symlink"""
-        target_info = {
-            "exists": os.path.exists(target_path),
-            "type": "unknown",
-            "size": None,
-            "checksum": None,
-            "extension": os.path.splitext(target_path)[1].lower() if os.path.splitext(target_path)[1] else None
-        }
+        extension = os.path.splitext(target_path)[1]
+        target_info = _TARGET_INFO_TEMPLATE.copy()
+        if extension:
+            target_info["extension"] = extension.lower()
+        
+        # One stat call answers exists/isdir/isfile/getsize
+        try:
+            st = os.stat(target_path)
+        except (OSError, ValueError):
+            return target_info
+        target_info["exists"] = True
         
         try:
-            if os.path.exists(target_path):
-                if os.path.isdir(target_path):
-                    target_info["type"] = "directory"
-                    # Count items in directory
+            if stat.S_ISDIR(st.st_mode):
+                target_info["type"] = "directory"
+                # Count items in directory
+                try:
+                    with os.scandir(target_path) as it:
+                        target_info["item_count"] = sum(1 for _ in it)
+                except OSError:
+                    target_info["item_count"] = None
+            elif stat.S_ISREG(st.st_mode):
+                target_info["type"] = "file"
+                size = st.st_size
+                target_info["size"] = size
+                
+                # Calculate checksum for small files only (avoid performance issues)
+                if size < CHECKSUM_MAX_SIZE:
                     try:
-                        target_info["item_count"] = len(os.listdir(target_path))
-                    except:
-                        target_info["item_count"] = None
-                elif os.path.isfile(target_path):
-                    target_info["type"] = "file"
-                    target_info["size"] = os.path.getsize(target_path)
-                    
-                    # Calculate checksum for small files only (avoid performance issues)
-                    if os.path.isfile(target_path) and os.path.getsize(target_path) < 1024 * 1024:  # 1MB limit
-                        try:
-                            import hashlib
-                            with open(target_path, 'rb') as f:
-                                file_hash = hashlib.md5()
-                                chunk = f.read(8192)
-                                while chunk:
-                                    file_hash.update(chunk)
-                                    chunk = f.read(8192)
-                                target_info["checksum"] = file_hash.hexdigest()
-                        except:
-                            pass
-        except:
+                        with open(target_path, 'rb') as f:
+                            target_info["checksum"] = _file_checksum(f, size)
+                            target_info["checksum_algorithm"] = CHECKSUM_ALGORITHM
+                    except (OSError, ValueError):
+                        pass
+        except OSError:
             pass
             
         return target_info
     
-    def _collect_security_info(self, file_path):
-        """Collect security and permission information"""
-        security_info = {
-            "permissions": None,
-            "owner": None,
-            "group": None
-        }
+    def _collect_security_info(self, file_path, stats=None):
+        """Collect security and permission information (stats: optional lstat result)"""
+        security_info = _SECURITY_INFO_TEMPLATE.copy()
         
         try:
-            stats = os.lstat(file_path)
+            if stats is None:
+                stats = os.lstat(file_path)
             
-            if os.name != 'nt':
+            if not IS_WINDOWS:
                 # Unix permissions
                 security_info["permissions"] = stats.st_mode & 0o777
                 security_info["permissions_octal"] = f"{security_info['permissions']:o}"
                 
                 # Try to get owner and group names
-                try:
-                    import pwd
-                    import grp
+                if pwd is not None:
                     security_info["owner"] = pwd.getpwuid(stats.st_uid).pw_name
                     security_info["group"] = grp.getgrgid(stats.st_gid).gr_name
-                except ImportError:
+                else:
                     # Fallback to numeric IDs if pwd/grp not available
                     security_info["owner_id"] = stats.st_uid
                     security_info["group_id"] = stats.st_gid
@@ -395,22 +461,22 @@ class DazzleLink:
                 security_info["owner_id"] = stats.st_uid
                 
                 # Try to get Windows ACL info if available
-                try:
-                    import win32security
+                if win32security is not None:
                     security_info["windows_security"] = "Available but not implemented"
-                except ImportError:
+                else:
                     security_info["windows_security"] = "Not available"
-        except:
+        except (OSError, KeyError):
             pass
             
         return security_info
     
-    def _collect_timestamp_info(self, file_path):
+    def _collect_timestamp_info(self, file_path, stats=None):
         """
         Collect timestamp information for a file.
         
         Args:
             file_path: Path to the file
+            stats: Optional lstat result for file_path, to avoid another syscall
             
         Returns:
             Tuple of (creation_time, modified_time, access_time)
@@ -420,20 +486,24 @@ class DazzleLink:
         access_time = None
         
         try:
-            stats = os.lstat(file_path)
+            if stats is None:
+                stats = os.lstat(file_path)
             
             # Get the available timestamps
             if hasattr(stats, 'st_ctime'):
                 creation_time = stats.st_ctime
-                debug_print(f"Collected creation time for {file_path}: {creation_time} ({datetime.datetime.fromtimestamp(creation_time).isoformat()})")
+                if VERBOSE:
+                    debug_print(f"Collected creation time for {file_path}: {creation_time} ({datetime.datetime.fromtimestamp(creation_time).isoformat()})")
             if hasattr(stats, 'st_mtime'):
                 modified_time = stats.st_mtime
-                debug_print(f"Collected modified time for {file_path}: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat()})")
+                if VERBOSE:
+                    debug_print(f"Collected modified time for {file_path}: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat()})")
             if hasattr(stats, 'st_atime'):
                 access_time = stats.st_atime
-                debug_print(f"Collected access time for {file_path}: {access_time} ({datetime.datetime.fromtimestamp(access_time).isoformat()})")
+                if VERBOSE:
+                    debug_print(f"Collected access time for {file_path}: {access_time} ({datetime.datetime.fromtimestamp(access_time).isoformat()})")
                 
-        except Exception as e:
+        except (OSError, ValueError, OverflowError) as e:
             # Default to current time if stats fail
             debug_print(f"Failed to collect timestamps for {file_path}: {str(e)}")
             current_time = datetime.datetime.now().timestamp()
@@ -456,14 +526,7 @@ class DazzleLink:
         Returns:
             dict: Dictionary with timestamp information.
         """
-        timestamps = {
-            "created": None,
-            "modified": None,
-            "accessed": None,
-            "created_iso": None,
-            "modified_iso": None,
-            "accessed_iso": None
-        }
+        timestamps = _TIMESTAMPS_TEMPLATE.copy()
         
         # Check if target exists
         if not os.path.exists(target_path):
@@ -8,14 +8,60 @@ with symbolic links across different operating systems.
 import os
 import sys
 import re
+import glob
+import fnmatch
+import stat
 import logging
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Any, Tuple
 
+from ..data import DazzleLinkData
+
 # Add debugging support
 VERBOSE = os.environ.get('DAZZLELINK_VERBOSE', '0') == '1'
+
+# Platform check, evaluated once at import
+IS_WINDOWS = os.name == 'nt'
+
+# Optional Win32 modules (pywin32), imported once; None when unavailable
+win32file = win32api = win32con = None
+if IS_WINDOWS:
+    try:
+        import win32file
+        import win32api
+        import win32con
+    except ImportError:
+        win32file = win32api = win32con = None
+
+# kernel32 attribute functions bound once with pinned signatures (None off Windows)
+_GetFileAttributesW = _SetFileAttributesW = None
+if IS_WINDOWS:
+    try:
+        import ctypes
+        from ctypes import wintypes
+        # Own WinDLL instance so GetLastError is captured per call (ctypes.get_last_error)
+        _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        _GetFileAttributesW = _kernel32.GetFileAttributesW
+        _GetFileAttributesW.argtypes = [wintypes.LPCWSTR]
+        _GetFileAttributesW.restype = wintypes.DWORD
+        _SetFileAttributesW = _kernel32.SetFileAttributesW
+        _SetFileAttributesW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD]
+        _SetFileAttributesW.restype = wintypes.BOOL
+    except (ImportError, AttributeError, OSError):
+        _GetFileAttributesW = _SetFileAttributesW = None
+
+# FILE_ATTRIBUTE_* constants and the GetFileAttributesW failure value
+FILE_ATTRIBUTE_READONLY = 0x1
+FILE_ATTRIBUTE_HIDDEN = 0x2
+FILE_ATTRIBUTE_SYSTEM = 0x4
+INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
+
 logger = logging.getLogger(__name__)
 
 def debug_print(message):
@@ -36,7 +82,7 @@ def create_windows_symlink(target_path, link_path, is_directory):
     Returns:
         bool: True if successful, False if an error occurs
     """
-    if not os.name == 'nt':
+    if not IS_WINDOWS:
         debug_print("Not running on Windows, using standard os.symlink")
         os.symlink(target_path, link_path)
         return True
@@ -59,7 +105,8 @@ def create_windows_symlink(target_path, link_path, is_directory):
         
     # Try using win32file API if available
     try:
-        import win32file
+        if win32file is None:
+            raise ImportError("pywin32 is not installed")
         
         flags = 0
         if is_directory:
@@ -114,6 +161,11 @@ def create_windows_symlink(target_path, link_path, is_directory):
         # If direct call failed, try with elevation
         debug_print("Attempting to create symlink with elevated privileges")
         
+        # Inside an ElevatedSymlinkBatch the command joins a single elevated run
+        if ElevatedSymlinkBatch.defer(target_path, link_path, is_directory):
+            debug_print("Deferred elevated mklink until the end of the batch")
+            return True
+        
         # Use PowerShell to run elevated command
         ps_cmd = f'Start-Process cmd.exe -Verb RunAs -ArgumentList "/c {cmd}"'
         
@@ -141,28 +193,141 @@ def create_windows_symlink(target_path, link_path, is_directory):
     # If all methods failed, raise an exception
     raise Exception(f"Failed to create symlink: {link_path} -> {target_path}")
 
-def restore_file_attributes(link_path, link_data):
+class ElevatedSymlinkBatch:
+    """
+    Collect symlinks that need elevation and create them in one elevated run.
+    
+    Without a batch, every link that needs elevation starts its own elevated
+    cmd.exe, each with a UAC prompt. While a batch is active,
+    create_windows_symlink queues those mklink commands instead (and reports
+    success); on exit they are written to one script that is run elevated
+    once. Links that still do not exist afterwards are listed in `failed`.
+    
+    Deferred links only appear when the batch ends. Callers check
+    is_deferred() after creating a link and hold back any follow-up work
+    (timestamps, attributes, removing the source) until the batch has run
+    and the link is not in `failed`.
+    """
+    
+    # The batch currently collecting commands, if any
+    _active = None
+    _lock = threading.Lock()
+    
+    def __init__(self):
+        """Initialize an empty batch."""
+        self.pending: List[Tuple[str, str]] = []
+        self.failed: List[str] = []
+        # Absolute paths of the links in pending, for is_deferred()
+        self._deferred = set()
+        self._owner = False
+    
+    def __enter__(self):
+        with ElevatedSymlinkBatch._lock:
+            # Nested batches join the outer one
+            if ElevatedSymlinkBatch._active is None:
+                ElevatedSymlinkBatch._active = self
+                self._owner = True
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._owner:
+            return False
+        with ElevatedSymlinkBatch._lock:
+            ElevatedSymlinkBatch._active = None
+        if self.pending:
+            self._run()
+        return False
+    
+    @classmethod
+    def defer(cls, target_path, link_path, is_directory):
+        """
+        Queue an elevated mklink on the active batch.
+        
+        Args:
+            target_path (str): Target of the symlink
+            link_path (str): Location of the symlink to create
+            is_directory (bool): Whether the target is a directory
+            
+        Returns:
+            bool: True if queued, False if no batch is active
+        """
+        with cls._lock:
+            batch = cls._active
+            if batch is None:
+                return False
+            # The elevated shell starts in another directory, so use absolute link paths
+            link_path = os.path.abspath(link_path)
+            dir_flag = '/D ' if is_directory else ''
+            batch.pending.append((link_path, f'mklink {dir_flag}"{link_path}" "{target_path}"'))
+            batch._deferred.add(link_path)
+            return True
+    
+    @classmethod
+    def is_deferred(cls, link_path):
+        """
+        Check whether a link is waiting for the active batch's elevated run.
+        
+        Args:
+            link_path (str): Location of the symlink
+            
+        Returns:
+            bool: True if the link was deferred and does not exist yet
+        """
+        with cls._lock:
+            batch = cls._active
+            return batch is not None and os.path.abspath(link_path) in batch._deferred
+    
+    def _run(self):
+        """Run all queued mklink commands in a single elevated script."""
+        fd, script_path = tempfile.mkstemp(suffix='.cmd', prefix='dazzlelink_')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write('@echo off\r\n')
+                for _, cmd in self.pending:
+                    f.write(f'{cmd} >nul\r\n')
+            
+            print(f"Creating {len(self.pending)} symlinks with elevated privileges (one UAC prompt)")
+            # Single-quoted PowerShell string: only embedded quotes need doubling
+            quoted = script_path.replace("'", "''")
+            ps_cmd = f"Start-Process -FilePath '{quoted}' -Verb RunAs -Wait -WindowStyle Hidden"
+            try:
+                subprocess.run(['powershell', '-Command', ps_cmd], check=True)
+            except (OSError, subprocess.SubprocessError) as e:
+                debug_print(f"Failed to run elevated mklink batch: {str(e)}")
+        finally:
+            try:
+                os.unlink(script_path)
+            except OSError:
+                pass
+        
+        for link_path, cmd in self.pending:
+            if not os.path.lexists(link_path):
+                debug_print(f"Manual command needed: {cmd}")
+                self.failed.append(link_path)
+        self.pending = []
+        self._deferred.clear()
+
+def restore_file_attributes(link_path, link_data, new_link=False):
     """
     Restore file attributes from the link data to the recreated symlink.
     
     Args:
         link_path (str): Path to the recreated symlink
-        link_data (dict): The dazzlelink data containing attributes
+        link_data (DazzleLinkData or dict): The dazzlelink data containing attributes
+        new_link (bool): Whether link_path was just created. A new link carries
+            none of the hidden/system/read-only bits, so if none is wanted
+            there is nothing to read or change.
     """
     # Only attempt on Windows for now as Unix is more complex with permissions
-    if os.name != 'nt':
+    if not IS_WINDOWS:
         debug_print("File attribute restoration is primarily for Windows")
         return
         
     try:
         # Extract attributes from either schema format
-        attributes = None
-        if "attributes" in link_data:
-            # Old format
-            attributes = link_data["attributes"]
-        elif "link" in link_data and "attributes" in link_data["link"]:
-            # New format
-            attributes = link_data["link"]["attributes"]
+        if not isinstance(link_data, DazzleLinkData):
+            link_data = DazzleLinkData(link_data)
+        attributes = link_data.get_file_attributes()
         
         if not attributes:
             debug_print("No attribute data found in dazzlelink")
@@ -173,31 +338,31 @@ def restore_file_attributes(link_path, link_data):
         system = attributes.get("system", False)
         readonly = attributes.get("readonly", False)
         
+        if new_link and not (hidden or system or readonly):
+            debug_print("No attributes to restore on the new link")
+            return
+        
         debug_print(f"Restoring file attributes for {link_path}")
         debug_print(f"  Hidden: {hidden}")
         debug_print(f"  System: {system}")
         debug_print(f"  Read-only: {readonly}")
         
-        if os.name == 'nt':
+        if IS_WINDOWS:
             # First try using ctypes directly
             try:
-                import ctypes
+                if _GetFileAttributesW is None:
+                    raise ImportError("ctypes kernel32 functions are not available")
                 
                 # Get current attributes
-                current_attrs = ctypes.windll.kernel32.GetFileAttributesW(link_path)
+                current_attrs = _GetFileAttributesW(link_path)
                 
-                if current_attrs == -1:
+                if current_attrs == INVALID_FILE_ATTRIBUTES:
                     debug_print("Failed to get current file attributes")
                     return
                     
                 # Modify attributes as needed
                 new_attrs = current_attrs
                 
-                # FILE_ATTRIBUTE constants
-                FILE_ATTRIBUTE_HIDDEN = 0x2
-                FILE_ATTRIBUTE_SYSTEM = 0x4
-                FILE_ATTRIBUTE_READONLY = 0x1
-                
                 if hidden:
                     new_attrs |= FILE_ATTRIBUTE_HIDDEN
                 else:
@@ -215,11 +380,11 @@ def restore_file_attributes(link_path, link_data):
                     
                 # Apply new attributes if different
                 if new_attrs != current_attrs:
-                    result = ctypes.windll.kernel32.SetFileAttributesW(link_path, new_attrs)
+                    result = _SetFileAttributesW(link_path, new_attrs)
                     if result:
                         debug_print("Successfully restored file attributes")
                     else:
-                        debug_print(f"Failed to set file attributes, error code: {ctypes.GetLastError()}")
+                        debug_print(f"Failed to set file attributes, error code: {ctypes.get_last_error()}")
                 else:
                     debug_print("No attribute changes needed")
                     
@@ -228,8 +393,8 @@ def restore_file_attributes(link_path, link_data):
                 
                 # Fall back to win32api if available
                 try:
-                    import win32api
-                    import win32con
+                    if win32api is None:
+                        raise ImportError("pywin32 is not installed")
                     
                     # Get current attributes
                     current_attrs = win32api.GetFileAttributes(link_path)
@@ -281,9 +446,79 @@ def restore_file_attributes(link_path, link_data):
         # Don't fail the whole operation just because we couldn't restore attributes
         debug_print(f"Error in attribute restoration: {str(e)}")
 
-def find_dazzlelinks(path_patterns, recursive=False, pattern=None, dazzlelink_ext='.dazzlelink'):
+def _scan_dir_files(directory, recursive, listings):
     """
-    Find dazzlelink files based on path patterns, recursion, and filtering.
+    List the non-directory entries of a directory, caching the result
+    
+    Entry types come from os.scandir (d_type on most filesystems), so no
+    per-entry stat is needed except for symlinks. Recursive scans visit
+    directories in the same order as os.walk and, like it, do not descend
+    into symlinked directories.
+    
+    Args:
+        directory (str): Directory to scan
+        recursive (bool): Whether to include subdirectories
+        listings (dict): Listings made during the current search, keyed by
+            (directory, recursive); a repeated scan is served from here
+        
+    Returns:
+        list: (path, name, is_file) tuples
+    """
+    key = (directory, recursive)
+    cached = listings.get(key)
+    if cached is not None:
+        return cached
+    
+    entries = []
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            if recursive and not entry.is_symlink():
+                                subdirs.append(entry.path)
+                            continue
+                        entries.append((entry.path, entry.name, entry.is_file()))
+                    except OSError:
+                        continue
+        except OSError as e:
+            debug_print(f"Cannot scan directory {current}: {e}")
+        # Reversed so the first subdirectory is scanned next (os.walk order)
+        stack.extend(reversed(subdirs))
+    
+    listings[key] = entries
+    return entries
+
+def _expand_pattern(path_pattern):
+    """
+    Yield the paths matching a glob pattern, or the pattern itself if none match.
+    
+    Real paths may contain glob characters (e.g. "disc[1]"), which glob reads
+    as a character class; falling back to the input keeps them working.
+    
+    Args:
+        path_pattern (str): Path or glob pattern
+    
+    Yields:
+        str: Matching paths
+    """
+    matched = False
+    for path in glob.iglob(path_pattern, recursive=False):
+        matched = True
+        yield path
+    if not matched:
+        yield path_pattern
+
+def iter_dazzlelinks(path_patterns, recursive=False, pattern=None, dazzlelink_ext='.dazzlelink'):
+    """
+    Yield dazzlelink files based on path patterns, recursion, and filtering.
+    
+    Files are yielded as they are found, each path once, in the order
+    find_dazzlelinks would list them.
     
     Args:
         path_patterns (list or str): Path pattern(s) to search for dazzlelinks
@@ -291,13 +526,9 @@ def find_dazzlelinks(path_patterns, recursive=False, pattern=None, dazzlelink_ex
         pattern (str, optional): Glob pattern to filter dazzlelink filenames (e.g., "*.dazzlelink")
             If None, defaults to "*.dazzlelink"
     
-    Returns:
-        list: List of dazzlelink file paths (as Path objects)
+    Yields:
+        Path: Dazzlelink file paths
     """
-    import glob
-    import fnmatch
-    from pathlib import Path
-    
     # Normalize input to list
     if isinstance(path_patterns, str):
         path_patterns = [path_patterns]
@@ -305,64 +536,288 @@ def find_dazzlelinks(path_patterns, recursive=False, pattern=None, dazzlelink_ex
     # Default pattern if not specified
     if pattern is None:
         pattern = f"*{dazzlelink_ext}"
+    
+    # Compile the filename pattern once; fnmatch.fnmatch would normcase and look
+    # it up again for every entry. The default pattern is implied by the suffix check.
+    if pattern == f"*{dazzlelink_ext}":
+        name_matches = None
+    else:
+        flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+        name_matches = re.compile(fnmatch.translate(pattern), flags).match
         
-    found_dazzlelinks = []
+    # Paths already yielded, so overlapping patterns report each file once
+    seen = set()
+    # Directory listings for this search only, so overlapping patterns
+    # share them while later searches always see the current tree
+    listings = {}
     
     for path_pattern in path_patterns:
-        # Expand any glob patterns in the input paths
-        expanded_paths = glob.glob(path_pattern, recursive=False)
-        
-        # If glob didn't match anything, use the path as-is
-        if not expanded_paths:
-            expanded_paths = [path_pattern]
+        # Only inputs with wildcards are expanded; plain paths are classified directly
+        if any(c in path_pattern for c in '*?['):
+            expanded_paths = _expand_pattern(path_pattern)
+        else:
+            expanded_paths = (path_pattern,)
             
         for path in expanded_paths:
             path_obj = Path(path)
             
+            # One stat tells a file from a directory
+            try:
+                st_mode = os.stat(path).st_mode
+            except (OSError, ValueError):
+                st_mode = 0
+            
             # Case 1: Direct file path
-            if path_obj.is_file():
-                if path_obj.suffix == dazzlelink_ext and (pattern == f"*{dazzlelink_ext}" or fnmatch.fnmatch(path_obj.name, pattern)):
-                    found_dazzlelinks.append(path_obj)
+            if stat.S_ISREG(st_mode):
+                if path_obj.suffix == dazzlelink_ext and (name_matches is None or name_matches(path_obj.name)):
+                    if path_obj not in seen:
+                        seen.add(path_obj)
+                        yield path_obj
             
             # Case 2: Directory path
-            elif path_obj.is_dir():
-                if recursive:
-                    # Recursive search
-                    for root, _, files in os.walk(path_obj):
-                        root_path = Path(root)
-                        for file in files:
-                            if file.endswith(dazzlelink_ext) and fnmatch.fnmatch(file, pattern):
-                                found_dazzlelinks.append(root_path / file)
-                else:
-                    # Non-recursive, just search the directory
-                    for file in path_obj.glob(pattern):
-                        if file.is_file() and file.suffix == dazzlelink_ext:
-                            found_dazzlelinks.append(file)
-            
-            # Case 3: Non-existent path with wildcards (could be a pattern)
-            elif '*' in str(path_obj) or '?' in str(path_obj):
-                # This might be a pattern that didn't get expanded by glob
+            elif stat.S_ISDIR(st_mode):
+                # Listings are cached, so overlapping patterns scan each directory once
+                for file_path, name, is_file in _scan_dir_files(path, recursive, listings):
+                    if not name.endswith(dazzlelink_ext) or (name_matches is not None and not name_matches(name)):
+                        continue
+                    # Recursive searches keep every non-directory match (as
+                    # os.walk did), direct searches only regular files
+                    if recursive or is_file:
+                        found = Path(file_path)
+                        if found not in seen:
+                            seen.add(found)
+                            yield found
+
+def find_dazzlelinks(path_patterns, recursive=False, pattern=None, dazzlelink_ext='.dazzlelink'):
+    """
+    Find dazzlelink files based on path patterns, recursion, and filtering.
+    
+    Args:
+        path_patterns (list or str): Path pattern(s) to search for dazzlelinks
+        recursive (bool): Whether to search subdirectories recursively
+        pattern (str, optional): Glob pattern to filter dazzlelink filenames (e.g., "*.dazzlelink")
+            If None, defaults to "*.dazzlelink"
+    
+    Returns:
+        list: List of dazzlelink file paths (as Path objects), without duplicates
+    """
+    return list(iter_dazzlelinks(path_patterns, recursive, pattern, dazzlelink_ext))
+
+# Directories already created (or found to exist) by ensure_directory while
+# a directory_cache() context is active; None outside of one
+_known_dirs = None
+
+@contextmanager
+def directory_cache():
+    """
+    Remember directories created by ensure_directory for the duration of a batch.
+    
+    Batch operations write many files into the same few directories, so
+    inside the context each directory is created (or checked) once. Outside
+    of it ensure_directory always asks the filesystem, so single calls notice
+    directories removed in between. Nested uses share the outer cache.
+    """
+    global _known_dirs
+    if _known_dirs is not None:
+        yield
+        return
+    _known_dirs = set()
+    try:
+        yield
+    finally:
+        _known_dirs = None
+
+def ensure_directory(directory):
+    """
+    Create a directory (and parents) unless it is already known to exist
+    
+    Inside directory_cache() this skips the repeated os.makedirs syscalls
+    after the first call per directory, and when the parent is already known
+    the leaf is created with a single os.mkdir instead of os.makedirs' stat
+    walk up the parent chain.
+    
+    Args:
+        directory (str): Directory to create
+    """
+    directory = os.fspath(directory)
+    if not directory:
+        return
+    known = _known_dirs
+    if known is None:
+        os.makedirs(directory, exist_ok=True)
+        return
+    if directory in known:
+        return
+    parent = os.path.dirname(directory)
+    if parent in known:
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            if not os.path.isdir(directory):
+                raise
+        except FileNotFoundError:
+            # The parent was removed since it was recorded
+            reset_directory_cache(parent)
+            ensure_directory(directory)
+            return
+    else:
+        os.makedirs(directory, exist_ok=True)
+        # makedirs created (or found) the whole chain, so remember the
+        # ancestors too and let sibling directories take the mkdir path
+        while parent and parent not in known and parent != os.path.dirname(parent):
+            known.add(parent)
+            parent = os.path.dirname(parent)
+    known.add(directory)
+
+def reset_directory_cache(directory=None):
+    """
+    Forget directories recorded by ensure_directory
+    
+    Needed when directories may have been removed behind its back.
+    
+    Args:
+        directory (str, optional): Forget this directory and everything below it.
+            If None, clears the whole cache.
+    """
+    known = _known_dirs
+    if known is None:
+        return
+    if directory is None:
+        known.clear()
+        return
+    directory = os.fspath(directory)
+    prefix = directory.rstrip(os.sep) + os.sep
+    for entry in list(known):
+        if entry == directory or entry.startswith(prefix):
+            known.discard(entry)
+
+def remove_existing(path):
+    """
+    Remove whatever currently occupies a path, so a link can be created there
+    
+    The entry is unlinked straight away, which covers files and symlinks
+    (including dangling ones and links to directories) and a free path
+    without any stat. Only when unlinking fails is the entry lstat'ed; real
+    directories are then removed recursively.
+    
+    Args:
+        path (str): Path to clear
+        
+    Returns:
+        bool: True if something was removed, False if the path was free
+    """
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError:
+        # IsADirectoryError on Linux, EPERM/EACCES elsewhere for directories
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            return False
+        if not stat.S_ISDIR(st.st_mode):
+            raise
+    shutil.rmtree(path)
+    reset_directory_cache(path)
+    return True
+
+def replace_with_symlink(target_path, link_path, is_directory=False):
+    """
+    Create a symlink at link_path, replacing whatever is there
+    
+    On POSIX no existence check is made up front: the link is created
+    directly, and only if the name is taken is it created under a temporary
+    name and renamed over the existing entry, so the path is never missing
+    in between. Windows (and real directories, which rename cannot replace)
+    go through remove_existing first.
+    
+    Args:
+        target_path (str): Target of the symlink
+        link_path (str): Location of the symlink to create
+        is_directory (bool): Whether the target is a directory (Windows only)
+        
+    Returns:
+        bool: True if an existing entry was replaced, False if the path was free
+    """
+    if IS_WINDOWS:
+        replaced = remove_existing(link_path)
+        create_windows_symlink(target_path, link_path, is_directory)
+        return replaced
+    
+    try:
+        os.symlink(target_path, link_path)
+        return False
+    except FileExistsError:
+        pass
+    
+    tmp_path = f"{link_path}.dltmp.{os.getpid()}.{threading.get_ident()}"
+    os.symlink(target_path, tmp_path)
+    try:
+        os.replace(tmp_path, link_path)
+    except OSError:
+        # rename() cannot put a link in place of a directory
+        os.unlink(tmp_path)
+        remove_existing(link_path)
+        os.symlink(target_path, link_path)
+    return True
+
+def _scandir_symlinks(root, recursive=True, seen=None):
+    """
+    Yield an os.DirEntry for every symbolic link under a directory.
+    
+    Symlink detection comes from the directory entry itself, so no extra
+    lstat is needed per file. Symlinked directories are reported as links
+    but never descended into, and each directory is visited at most once
+    (keyed by device and inode) so bind mounts and junction-like aliases
+    cannot cause duplicate scans or cycles.
+    
+    Args:
+        root (str): Directory to scan
+        recursive (bool): Whether to descend into subdirectories
+        seen (set, optional): (st_dev, st_ino) keys of directories already visited
+        
+    Yields:
+        os.DirEntry: Entries for the symbolic links found
+    """
+    if seen is None:
+        seen = set()
+        try:
+            st = os.stat(root)
+        except OSError as e:
+            debug_print(f"Cannot scan directory {root}: {str(e)}")
+            return
+        seen.add((st.st_dev, st.st_ino))
+    
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
                 try:
-                    # Try using Path.glob on the parent directory
-                    parent = path_obj.parent
-                    if parent.exists():
-                        file_pattern = path_obj.name
-                        for file in parent.glob(file_pattern):
-                            if file.is_file() and file.suffix == dazzlelink_ext and fnmatch.fnmatch(file.name, pattern):
-                                found_dazzlelinks.append(file)
-                except Exception as e:
-                    debug_print(f"Error while processing pattern {path_obj}: {e}")
-    
-    # Remove duplicates while preserving order
-    unique_dazzlelinks = []
-    seen = set()
-    for link in found_dazzlelinks:
-        link_str = str(link)
-        if link_str not in seen:
-            seen.add(link_str)
-            unique_dazzlelinks.append(link)
+                    if entry.is_symlink():
+                        yield entry
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        # One stat per directory. On Windows DirEntry.stat() leaves
+                        # st_ino/st_dev zeroed, and junctions report as directories,
+                        # so stat the resolved path to get the real file index.
+                        if IS_WINDOWS:
+                            st = os.stat(entry.path)
+                        else:
+                            st = entry.stat(follow_symlinks=False)
+                        key = (st.st_dev, st.st_ino)
+                        if key not in seen:
+                            seen.add(key)
+                            subdirs.append(entry.path)
+                except OSError as e:
+                    debug_print(f"Skipping {entry.path}: {str(e)}")
+    except OSError as e:
+        debug_print(f"Cannot scan directory {root}: {str(e)}")
+        return
     
-    return unique_dazzlelinks
+    # Descend after the parent's handle is closed to bound open descriptors
+    for subdir in subdirs:
+        yield from _scandir_symlinks(subdir, recursive, seen)
 
 def scan_directory(directory, recursive=True):
     """
@@ -382,38 +837,203 @@ def scan_directory(directory, recursive=True):
         raise Exception(f"{directory} is not a directory")
     
     try:
-        if recursive:
-            for root, dirs, files in os.walk(directory):
-                for name in dirs + files:
-                    path = os.path.join(root, name)
-                    if os.path.islink(path):
-                        links.append(path)
-        else:
-            for item in os.listdir(directory):
-                path = os.path.join(directory, item)
-                if os.path.islink(path):
-                    links.append(path)
+        # Entry types come from the directory listing (d_type), so no per-file
+        # lstat is needed to find the links
+        for entry in _scandir_symlinks(str(directory), recursive):
+            links.append(entry.path)
                     
         return links
     except Exception as e:
         raise Exception(f"Failed to scan directory {directory}: {str(e)}")
 
-def make_dazzlelink_executable(dazzlelink_path, link_data=None):
+# Script prelude for executable dazzlelinks (works as a shell script, a batch
+# file and a Python script); the JSON payload follows the data marker.
+# Placeholders: {target_path} and {info_jump}, the batch label used when the
+# script is run without arguments. Literal braces are doubled for str.format.
+_DAZZLELINK_SCRIPT_TEMPLATE = r'''#!/bin/sh
+""":"
+:: Windows Batch Script
+@echo off
+if "%~1"=="" goto {info_jump}
+if "%1"=="--open" goto open_target
+if "%1"=="--auto" goto open_target
+if "%1"=="--info" goto show_info
+python "%~dpnx0" %*
+exit /b
+
+:open_target
+start "" "{target_path}"
+exit /b
+
+:show_info
+echo DazzleLink Information:
+echo Target: {target_path}
+echo.
+echo Use --open to open the target directly
+exit /b
+"""
+
+# Python Script
+import os
+import sys
+import json
+import subprocess
+
+def main():
+    """Process dazzlelink commands"""
+    # Extract the link data from this file
+    with open(__file__, "r", encoding="utf-8") as f:
+        # Skip the script header
+        in_header = True
+        json_text = ""
+        for line in f:
+            if line.strip() == "# DAZZLELINK_DATA_BEGIN":
+                in_header = False
+                continue
+            if not in_header:
+                json_text += line
+
+    link_data = json.loads(json_text)
+
+    # Handle both old and new schema formats
+    if "target_path" in link_data:
+        # Old format
+        target_path = link_data["target_path"]
+        default_mode = link_data.get("config", {{}}).get("default_mode", "info")
+        original_path = link_data.get("original_path", "Unknown")
+        creation_date = link_data.get("creation_date", "Unknown")
+    elif "link" in link_data and "target_path" in link_data["link"]:
+        # New format
+        target_path = link_data["link"]["target_path"]
+        default_mode = link_data.get("config", {{}}).get("default_mode", "info")
+        original_path = link_data["link"].get("original_path", "Unknown")
+        creation_date = link_data.get("creation_date", "Unknown")
+    else:
+        print("ERROR: Invalid dazzlelink format")
+        sys.exit(1)
+
+    # Process command arguments
+    if len(sys.argv) > 1:
+        if sys.argv[1] == "--open" or sys.argv[1] == "--auto":
+            # Open the target file/directory
+            open_target(target_path)
+        elif sys.argv[1] == "--info":
+            # Show info explicitly
+            show_info(link_data, target_path, original_path, creation_date)
+        else:
+            # Show help
+            show_help(target_path, default_mode)
+    else:
+        # No arguments - use default mode
+        if default_mode == "open" or default_mode == "auto":
+            open_target(target_path)
+        else:  # Default to info mode
+            show_info(link_data, target_path, original_path, creation_date)
+
+def open_target(target_path):
+    """Open the target file or directory"""
+    try:
+        if os.name == "nt":
+            os.startfile(target_path)
+        else:
+            subprocess.run(["xdg-open", target_path])
+    except Exception as e:
+        print(f"Error opening target: {{str(e)}}")
+        print(f"Target path: {{target_path}}")
+        if not os.path.exists(target_path):
+            print("Target does not exist!")
+
+def show_info(link_data, target_path, original_path, creation_date):
+    """Display information about the link"""
+    print("DazzleLink Information:")
+    print(f"Target: {{target_path}}")
+    print(f"Original Path: {{original_path}}")
+    print(f"Creation Date: {{creation_date}}")
+
+    # Display target information if available (new schema)
+    if "target" in link_data:
+        target_info = link_data["target"]
+        print("\nTarget Details:")
+        print(f"  Type: {{target_info.get('type', 'Unknown')}}")
+        print(f"  Exists: {{'Yes' if target_info.get('exists', False) else 'No'}}")
+        if target_info.get('size') is not None:
+            size = target_info['size']
+            if size < 1024:
+                size_str = f"{{size}} bytes"
+            elif size < 1024 * 1024:
+                size_str = f"{{size/1024:.1f}} KB"
+            else:
+                size_str = f"{{size/(1024*1024):.1f}} MB"
+            print(f"  Size: {{size_str}}")
+
+    # Display config information
+    print("\nConfiguration:")
+    if "config" in link_data:
+        for key, value in link_data["config"].items():
+            print(f"  {{key}}: {{value}}")
+    else:
+        print("  No configuration available")
+
+    print("\nUsage:")
+    print("  (no args)   Use default mode (currently: " + 
+          link_data.get("config", {{}}).get("default_mode", "info") + ")")
+    print("  --open      Open the target file/directory")
+    print("  --info      Show this information")
+    print("  --help      Show help message")
+
+def show_help(target_path, default_mode):
+    """Show detailed help"""
+    print("DazzleLink - Symbolic Link Preservation Tool")
+    print(f"Target: {{target_path}}")
+    print(f"Default Mode: {{default_mode}}")
+    print("\nAvailable Commands:")
+    print("  --open      Open the target file/directory")
+    print("  --auto      Same as --open")
+    print("  --info      Show link information")
+    print("  --help      Show this help message")
+
+if __name__ == "__main__":
+    main()
+
+# DAZZLELINK_DATA_BEGIN
+'''
+
+def _script_bytes(text):
+    """Encode script text, with the CRLF line endings cmd.exe expects on Windows"""
+    data = text.encode('utf-8')
+    # cmd.exe mis-handles labels in LF-only batch files
+    return data.replace(b'\n', b'\r\n') if IS_WINDOWS else data
+
+# The template split into its parts, encoded once at import: the head for
+# each default jump, the short target-dependent batch section (formatted per
+# file), and the static Python tail
+_SCRIPT_MIDDLE_START = _DAZZLELINK_SCRIPT_TEMPLATE.index(':open_target\n')
+_SCRIPT_TAIL_START = _DAZZLELINK_SCRIPT_TEMPLATE.index('"""\n', _SCRIPT_MIDDLE_START)
+_SCRIPT_HEADS = {
+    jump: _script_bytes(_DAZZLELINK_SCRIPT_TEMPLATE[:_SCRIPT_MIDDLE_START].format(info_jump=jump))
+    for jump in ('open_target', 'show_info')
+}
+_SCRIPT_MIDDLE = _DAZZLELINK_SCRIPT_TEMPLATE[_SCRIPT_MIDDLE_START:_SCRIPT_TAIL_START]
+_SCRIPT_TAIL = _script_bytes(_DAZZLELINK_SCRIPT_TEMPLATE[_SCRIPT_TAIL_START:].format())
+
+# Flags and mode for writing executable dazzlelinks through a raw fd. The fd
+# skips the text-mode wrapper, and creating files with the execute bits set
+# (subject to the umask) replaces a separate chmod on Unix
+_EXECUTABLE_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+_EXECUTABLE_MODE = 0o644 if IS_WINDOWS else 0o755
+
+def _executable_payload(dazzlelink_path, link_data, human_readable=None):
     """
-    Make a dazzlelink file executable, adding the necessary script code
+    Build the encoded contents of an executable dazzlelink
     
     Args:
-        dazzlelink_path (str): Path to the dazzlelink file
-        link_data (dict, optional): Link data if already loaded
+        dazzlelink_path (str): Path of the dazzlelink (for error messages)
+        link_data (dict): Link data to embed
+        human_readable (bool, optional): Embed indented JSON (see DazzleLinkData.to_json)
+        
+    Returns:
+        memoryview: Script and JSON payload, encoded as UTF-8
     """
-    if link_data is None:
-        try:
-            with open(dazzlelink_path, 'r', encoding='utf-8') as f:
-                link_data = json.load(f)
-        except json.JSONDecodeError as e:
-            # File is already executable or corrupted
-            print(f"Warning: Could not parse {dazzlelink_path} as JSON: {e}")
-            return
     # Handle both old and new schema formats
     if "target_path" in link_data:
         # Old format
@@ -426,178 +1046,87 @@ def make_dazzlelink_executable(dazzlelink_path, link_data=None):
     else:
         raise Exception(f"Invalid dazzlelink format in {dazzlelink_path}")
     
+    # Batch label to jump to when the script is run without arguments
+    info_jump = 'open_target' if default_mode in ('open', 'auto') else 'show_info'
+    
+    # The JSON is appended as the bytes the (orjson-backed) encoder produced,
+    # without a decode/encode round trip
+    payload = DazzleLinkData(link_data).to_bytes(human_readable)
+    if IS_WINDOWS:
+        payload = payload.replace(b'\n', b'\r\n')
+    
+    # Only the few target-dependent lines are formatted and encoded per file
+    return memoryview(b''.join((
+        _SCRIPT_HEADS[info_jump],
+        _script_bytes(_SCRIPT_MIDDLE.format(target_path=target_path)),
+        _SCRIPT_TAIL,
+        payload,
+    )))
+
+def _write_fd(fd, payload):
+    """Write all of payload to fd, then close it"""
+    try:
+        while payload:
+            payload = payload[os.write(fd, payload):]
+    finally:
+        os.close(fd)
+
+def _write_executable_dazzlelink(dazzlelink_path, link_data, human_readable=None):
+    """
+    Write an executable dazzlelink directly at its final path
+    
+    Used when creating dazzlelinks: there is no previous content worth
+    protecting, so the temp file and rename of make_dazzlelink_executable
+    are skipped. A new file is created executable; an existing one is
+    truncated and given the user execute bit.
+    
+    Args:
+        dazzlelink_path (str): Path to the dazzlelink file
+        link_data (dict): Link data to embed
+        human_readable (bool, optional): Embed indented JSON (see DazzleLinkData.to_json)
+    """
+    payload = _executable_payload(dazzlelink_path, link_data, human_readable)
+    try:
+        fd = os.open(dazzlelink_path, _EXECUTABLE_OPEN_FLAGS | os.O_EXCL, _EXECUTABLE_MODE)
+    except FileExistsError:
+        fd = os.open(dazzlelink_path, _EXECUTABLE_OPEN_FLAGS | os.O_TRUNC, _EXECUTABLE_MODE)
+        if not IS_WINDOWS:
+            try:
+                os.fchmod(fd, os.fstat(fd).st_mode | stat.S_IEXEC)
+            except OSError:
+                os.close(fd)
+                raise
+    _write_fd(fd, payload)
+    DazzleLinkData.invalidate_cache(dazzlelink_path)
+
+def make_dazzlelink_executable(dazzlelink_path, link_data=None, human_readable=None):
+    """
+    Make a dazzlelink file executable, adding the necessary script code
+    
+    The file is rewritten through a temporary file and os.replace, so an
+    existing dazzlelink is never left half-written.
+    
+    Args:
+        dazzlelink_path (str): Path to the dazzlelink file
+        link_data (dict, optional): Link data if already loaded
+        human_readable (bool, optional): Embed indented JSON (see DazzleLinkData.to_json)
+    """
+    if link_data is None:
+        # Callers in this package always pass the data they just built; reading
+        # back is only for external callers. from_file also accepts files that
+        # are already executable
+        try:
+            link_data = DazzleLinkData.from_file(dazzlelink_path).to_dict()
+        except ValueError as e:
+            print(f"Warning: Could not parse {dazzlelink_path}: {e}")
+            return
+    
+    payload = _executable_payload(dazzlelink_path, link_data, human_readable)
+    
     # Create a temporary file with both script and JSON content
     temp_path = f"{dazzlelink_path}.tmp"
-    
-    with open(temp_path, 'w', encoding='utf-8') as f:
-        # Write script header (works as both shell script and batch file)
-        f.write('#!/bin/sh\n')
-        f.write('""":"\n')
-        f.write(':: Windows Batch Script\n')
-        f.write('@echo off\n')
-        
-        # Handle default mode in batch section
-        if default_mode == "open" or default_mode == "auto":
-            f.write('if "%~1"=="" goto open_target\n')
-        else:
-            f.write('if "%~1"=="" goto show_info\n')
-            
-        f.write('if "%1"=="--open" goto open_target\n')
-        f.write('if "%1"=="--auto" goto open_target\n')
-        f.write('if "%1"=="--info" goto show_info\n')
-        f.write('python "%~dpnx0" %*\n')
-        f.write('exit /b\n')
-        f.write('\n')
-        f.write(':open_target\n')
-        f.write(f'start "" "{target_path}"\n')
-        f.write('exit /b\n')
-        f.write('\n')
-        f.write(':show_info\n')
-        f.write('echo DazzleLink Information:\n')
-        f.write(f'echo Target: {target_path}\n')
-        f.write('echo.\n')
-        f.write('echo Use --open to open the target directly\n')
-        f.write('exit /b\n')
-        f.write('"""\n')
-        f.write('\n')
-        f.write('# Python Script\n')
-        f.write('import os\n')
-        f.write('import sys\n')
-        f.write('import json\n')
-        f.write('import subprocess\n')
-        f.write('\n')
-        f.write('def main():\n')
-        f.write('    """Process dazzlelink commands"""\n')
-        f.write('    # Extract the link data from this file\n')
-        f.write('    with open(__file__, "r", encoding="utf-8") as f:\n')
-        f.write('        # Skip the script header\n')
-        f.write('        in_header = True\n')
-        f.write('        json_text = ""\n')
-        f.write('        for line in f:\n')
-        f.write('            if line.strip() == "# DAZZLELINK_DATA_BEGIN":\n')
-        f.write('                in_header = False\n')
-        f.write('                continue\n')
-        f.write('            if not in_header:\n')
-        f.write('                json_text += line\n')
-        f.write('\n')
-        f.write('    link_data = json.loads(json_text)\n')
-        f.write('\n')
-        f.write('    # Handle both old and new schema formats\n')
-        f.write('    if "target_path" in link_data:\n')
-        f.write('        # Old format\n')
-        f.write('        target_path = link_data["target_path"]\n')
-        f.write('        default_mode = link_data.get("config", {}).get("default_mode", "info")\n')
-        f.write('        original_path = link_data.get("original_path", "Unknown")\n')
-        f.write('        creation_date = link_data.get("creation_date", "Unknown")\n')
-        f.write('    elif "link" in link_data and "target_path" in link_data["link"]:\n')
-        f.write('        # New format\n')
-        f.write('        target_path = link_data["link"]["target_path"]\n')
-        f.write('        default_mode = link_data.get("config", {}).get("default_mode", "info")\n')
-        f.write('        original_path = link_data["link"].get("original_path", "Unknown")\n')
-        f.write('        creation_date = link_data.get("creation_date", "Unknown")\n')
-        f.write('    else:\n')
-        f.write('        print("ERROR: Invalid dazzlelink format")\n')
-        f.write('        sys.exit(1)\n')
-        f.write('\n')
-        
-        # Set default mode behavior
-        f.write('    # Process command arguments\n')
-        f.write('    if len(sys.argv) > 1:\n')
-        f.write('        if sys.argv[1] == "--open" or sys.argv[1] == "--auto":\n')
-        f.write('            # Open the target file/directory\n')
-        f.write('            open_target(target_path)\n')
-        f.write('        elif sys.argv[1] == "--info":\n')
-        f.write('            # Show info explicitly\n')
-        f.write('            show_info(link_data, target_path, original_path, creation_date)\n')
-        f.write('        else:\n')
-        f.write('            # Show help\n')
-        f.write('            show_help(target_path, default_mode)\n')
-        f.write('    else:\n')
-        f.write('        # No arguments - use default mode\n')
-        f.write('        if default_mode == "open" or default_mode == "auto":\n')
-        f.write('            open_target(target_path)\n')
-        f.write('        else:  # Default to info mode\n')
-        f.write('            show_info(link_data, target_path, original_path, creation_date)\n')
-        f.write('\n')
-        
-        f.write('def open_target(target_path):\n')
-        f.write('    """Open the target file or directory"""\n')
-        f.write('    try:\n')
-        f.write('        if os.name == "nt":\n')
-        f.write('            os.startfile(target_path)\n')
-        f.write('        else:\n')
-        f.write('            subprocess.run(["xdg-open", target_path])\n')
-        f.write('    except Exception as e:\n')
-        f.write('        print(f"Error opening target: {str(e)}")\n')
-        f.write('        print(f"Target path: {target_path}")\n')
-        f.write('        if not os.path.exists(target_path):\n')
-        f.write('            print("Target does not exist!")\n')
-        f.write('\n')
-        
-        f.write('def show_info(link_data, target_path, original_path, creation_date):\n')
-        f.write('    """Display information about the link"""\n')
-        f.write('    print("DazzleLink Information:")\n')
-        f.write('    print(f"Target: {target_path}")\n')
-        f.write('    print(f"Original Path: {original_path}")\n')
-        f.write('    print(f"Creation Date: {creation_date}")\n')
-        f.write('\n')
-        f.write('    # Display target information if available (new schema)\n')
-        f.write('    if "target" in link_data:\n')
-        f.write('        target_info = link_data["target"]\n')
-        f.write('        print("\\nTarget Details:")\n')
-        f.write('        print(f"  Type: {target_info.get(\'type\', \'Unknown\')}")\n')
-        f.write('        print(f"  Exists: {\'Yes\' if target_info.get(\'exists\', False) else \'No\'}")\n')
-        f.write('        if target_info.get(\'size\') is not None:\n')
-        f.write('            size = target_info[\'size\']\n')
-        f.write('            if size < 1024:\n')
-        f.write('                size_str = f"{size} bytes"\n')
-        f.write('            elif size < 1024 * 1024:\n')
-        f.write('                size_str = f"{size/1024:.1f} KB"\n')
-        f.write('            else:\n')
-        f.write('                size_str = f"{size/(1024*1024):.1f} MB"\n')
-        f.write('            print(f"  Size: {size_str}")\n')
-        f.write('\n')
-        
-        f.write('    # Display config information\n')
-        f.write('    print("\\nConfiguration:")\n')
-        f.write('    if "config" in link_data:\n')
-        f.write('        for key, value in link_data["config"].items():\n')
-        f.write('            print(f"  {key}: {value}")\n')
-        f.write('    else:\n')
-        f.write('        print("  No configuration available")\n')
-        f.write('\n')
-        
-        f.write('    print("\\nUsage:")\n')
-        f.write('    print("  (no args)   Use default mode (currently: " + \n')
-        f.write('          link_data.get("config", {}).get("default_mode", "info") + ")")\n')
-        f.write('    print("  --open      Open the target file/directory")\n')
-        f.write('    print("  --info      Show this information")\n')
-        f.write('    print("  --help      Show help message")\n')
-        f.write('\n')
-        
-        f.write('def show_help(target_path, default_mode):\n')
-        f.write('    """Show detailed help"""\n')
-        f.write('    print("DazzleLink - Symbolic Link Preservation Tool")\n')
-        f.write('    print(f"Target: {target_path}")\n')
-        f.write('    print(f"Default Mode: {default_mode}")\n')
-        f.write('    print("\\nAvailable Commands:")\n')
-        f.write('    print("  --open      Open the target file/directory")\n')
-        f.write('    print("  --auto      Same as --open")\n')
-        f.write('    print("  --info      Show link information")\n')
-        f.write('    print("  --help      Show this help message")\n')
-        f.write('\n')
-        
-        f.write('if __name__ == "__main__":\n')
-        f.write('    main()\n')
-        f.write('\n')
-        f.write('# DAZZLELINK_DATA_BEGIN\n')
-        
-        # Write the original JSON data
-        json.dump(link_data, f, indent=2)
+    _write_fd(os.open(temp_path, _EXECUTABLE_OPEN_FLAGS | os.O_TRUNC, _EXECUTABLE_MODE), payload)
         
     # Replace the original file
     os.replace(temp_path, dazzlelink_path)
-    
-    # Make it executable on Unix
-    if os.name != 'nt':
-        os.chmod(dazzlelink_path, os.stat(dazzlelink_path).st_mode | stat.S_IEXEC)
+    DazzleLinkData.invalidate_cache(dazzlelink_path)
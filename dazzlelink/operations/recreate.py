@@ -6,17 +6,25 @@ This module provides functions for recreating symbolic links from dazzlelink fil
 
 import os
 import sys
+import json
+import stat
 import logging
-import shutil
+import subprocess
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union, Any
 
 from ..exceptions import DazzleLinkException
-from ..data import DazzleLinkData
+from ..data import DazzleLinkData, json_loads, read_bytes
 from . import links, timestamps
 
 # Add debugging support
 VERBOSE = os.environ.get('DAZZLELINK_VERBOSE', '0') == '1'
+
+# Platform check, evaluated once at import
+IS_WINDOWS = os.name == 'nt'
+
 logger = logging.getLogger(__name__)
 
 def debug_print(message):
@@ -36,7 +44,8 @@ def recreate_link(dazzlelink_path, target_location=None, timestamp_strategy='cur
         timestamp_strategy (str): Strategy for setting timestamps ('current', 'symlink', 'target', 'preserve-all')
         update_dazzlelink (bool): Whether to update the dazzlelink metadata during recreation
         use_live_target (bool): Whether to check the live target file for timestamps
-        batch_mode (bool): If True, optimizes for batch processing (less verification)
+        batch_mode (bool): If True, optimizes for batch processing (less verification);
+            updated dazzlelinks are queued until DazzleLinkData.flush_pending_saves()
         
     Returns:
         str: Path to the created symbolic link
@@ -44,89 +53,270 @@ def recreate_link(dazzlelink_path, target_location=None, timestamp_strategy='cur
     try:
         # Load the dazzlelink data
         dl_data = DazzleLinkData.from_file(dazzlelink_path)
-        
-        # Get the target and original paths
-        target_path = dl_data.get_target_path()
-        original_path = dl_data.get_original_path()
-        
-        # Determine if target is a directory
-        is_dir = dl_data.get_target_type() == "directory"
-        
-        # Determine where to create the symlink
-        if target_location:
-            # Use the provided location but keep the original filename
-            original_name = os.path.basename(original_path)
-            link_path = os.path.join(target_location, original_name)
-        else:
-            link_path = original_path
+        link_path = _resolve_link_path(dl_data, target_location)
         
         # Ensure parent directory exists
-        os.makedirs(os.path.dirname(link_path), exist_ok=True)
-        
-        # Remove existing link/file if it exists
-        if os.path.exists(link_path):
-            if os.path.isdir(link_path) and not os.path.islink(link_path):
-                shutil.rmtree(link_path)
-            else:
-                os.unlink(link_path)
+        links.ensure_directory(os.path.dirname(link_path))
         
-        # Create symlink with appropriate method based on OS
-        if os.name == 'nt':
-            links.create_windows_symlink(target_path, link_path, is_dir)
-        else:
-            os.symlink(target_path, link_path)
+        return _recreate_from_data(dazzlelink_path, dl_data, link_path, timestamp_strategy,
+                                   update_dazzlelink, use_live_target, batch_mode)
         
-        # Verify symlink was created
-        if not os.path.exists(link_path):
-            raise DazzleLinkException(f"Failed to create symlink at {link_path}")
+    except Exception as e:
+        raise DazzleLinkException(f"Failed to recreate link from {dazzlelink_path}: {str(e)}")
+
+def _resolve_link_path(dl_data, target_location=None):
+    """
+    Determine where the symlink described by a dazzlelink should be created
+    
+    Args:
+        dl_data (DazzleLinkData): Loaded dazzlelink data
+        target_location (str, optional): Override location for the recreated symlink
         
-        # Very small delay to ensure symlink creation is complete (helps avoid race conditions)
-        # Reduced from 0.1 to 0.01 seconds
-        if not batch_mode:
-            import time
-            time.sleep(0.01)
+    Returns:
+        str: Path of the symlink to create
+    """
+    original_path = dl_data.get_original_path()
+    if target_location:
+        # Use the provided location but keep the original filename
+        return os.path.join(target_location, os.path.basename(original_path))
+    return original_path
+
+def _recreate_from_data(dazzlelink_path, dl_data, link_path, timestamp_strategy='current',
+                        update_dazzlelink=False, use_live_target=False, batch_mode=False):
+    """
+    Create the symlink for already loaded dazzlelink data
+    
+    The parent directory of link_path must already exist.
+    
+    Args:
+        dazzlelink_path (str): Path to the dazzlelink file (rewritten if update_dazzlelink)
+        dl_data (DazzleLinkData): Loaded dazzlelink data
+        link_path (str): Path of the symlink to create
+        timestamp_strategy (str): Strategy for setting timestamps
+        update_dazzlelink (bool): Whether to update the dazzlelink metadata
+        use_live_target (bool): Whether to check the live target file for timestamps
+        batch_mode (bool): If True, optimizes for batch processing (less verification)
         
-        # Apply timestamps based on the selected strategy
-        timestamps.apply_timestamp_strategy(link_path, dl_data, timestamp_strategy, use_live_target, batch_mode=batch_mode)
+    Returns:
+        str: Path to the created symbolic link
+    """
+    _create_link(dl_data, link_path)
+    return _finish_recreate(dazzlelink_path, dl_data, link_path, timestamp_strategy,
+                            update_dazzlelink, use_live_target, batch_mode)
+
+def _create_link(dl_data, link_path):
+    """
+    Create the symlink described by dazzlelink data, replacing any existing entry
+    
+    Inside an active ElevatedSymlinkBatch the link may only be queued; see
+    ElevatedSymlinkBatch.is_deferred.
+    
+    Args:
+        dl_data (DazzleLinkData): Loaded dazzlelink data
+        link_path (str): Path of the symlink to create
+    """
+    # Determine if target is a directory
+    is_dir = dl_data.get_target_type() == "directory"
+    
+    # Create symlink with appropriate method based on OS, replacing any existing entry
+    links.replace_with_symlink(dl_data.get_target_path(), link_path, is_dir)
+
+def _finish_recreate(dazzlelink_path, dl_data, link_path, timestamp_strategy='current',
+                     update_dazzlelink=False, use_live_target=False, batch_mode=False,
+                     target_cache=None):
+    """
+    Verify a just created symlink and apply timestamps, attributes and metadata
+    
+    Args:
+        target_cache (dict, optional): The batch's live target cache
+            (see timestamps.lookup_target_timestamps)
+        (remaining arguments as for _recreate_from_data)
         
-        # Verify timestamps were correctly applied (if not current and not in batch mode)
-        if timestamp_strategy != 'current' and os.name == 'nt' and not batch_mode:
-            timestamps.verify_timestamps(link_path, dl_data, timestamp_strategy, use_live_target)
+    Returns:
+        str: Path to the created symbolic link
+    """
+    target_path = dl_data.get_target_path()
+    
+    # Verify symlink was created; symlink creation is synchronous, so no delay is
+    # needed, and lexists does not depend on the target being reachable
+    if not os.path.lexists(link_path):
+        raise DazzleLinkException(f"Failed to create symlink at {link_path}")
+    
+    # Apply timestamps based on the selected strategy
+    live_target_timestamps = timestamps.apply_timestamp_strategy(
+        link_path, dl_data, timestamp_strategy, use_live_target, batch_mode=batch_mode,
+        target_cache=target_cache)
+    
+    # Verify timestamps were correctly applied (if not current and not in batch mode)
+    if timestamp_strategy != 'current' and IS_WINDOWS and not batch_mode:
+        timestamps.verify_timestamps(link_path, dl_data, timestamp_strategy, use_live_target)
+    
+    # Attempt to restore file attributes if available
+    if IS_WINDOWS and dl_data.has_file_attributes():
+        links.restore_file_attributes(link_path, dl_data, new_link=True)
+    
+    # Update dazzlelink metadata if requested
+    if update_dazzlelink:
+        try:
+            # Update dazzlelink metadata
+            dl_data.update_metadata(reason="symlink_recreation")
+            
+            # If we used live target and it was successful, update target timestamps too
+            if use_live_target and timestamp_strategy in ['target', 'preserve-all']:
+                # Reuse the timestamps the strategy just read from the live target
+                target_timestamps = live_target_timestamps
+                if target_timestamps is None:
+                    target_timestamps = timestamps.lookup_target_timestamps(target_path, target_cache)
+                
+                if target_timestamps is not None:
+                    # Update in the dazzlelink data
+                    dl_data.set_target_timestamps(
+                        created=target_timestamps.get('created'),
+                        modified=target_timestamps.get('modified'),
+                        accessed=target_timestamps.get('accessed')
+                    )
+            
+            # Save the updated dazzlelink; batch runs queue it for a single flush
+            if batch_mode:
+                dl_data.queue_save(dazzlelink_path)
+            else:
+                dl_data.save_to_file(dazzlelink_path)
+            
+            debug_print(f"Updated dazzlelink metadata for {dazzlelink_path}")
+        except Exception as e:
+            debug_print(f"Failed to update dazzlelink metadata: {str(e)}")
+    
+    return link_path
+
+def recreate_links(dazzlelink_paths, target_location=None, timestamp_strategy='current',
+                   update_dazzlelink=False, use_live_target=False, workers=None,
+                   batch_size=None):
+    """
+    Recreate symbolic links from many dazzlelink files using a thread pool
+    
+    Per-link work is metadata I/O (unlink, symlink, timestamp updates) that
+    releases the GIL, so independent links are processed concurrently. All
+    files are read and parsed up front, also on the pool, and each parent
+    directory is created once. Each link path is created once: when several
+    dazzlelinks resolve to the same path, the last one wins, as it would
+    have done one file at a time.
+    On Windows, links that need elevation are created together behind a
+    single UAC prompt and finished once that run has confirmed them.
+    Links are recreated in batch mode; failures are collected, not raised.
+    
+    Args:
+        dazzlelink_paths (list): Paths to the dazzlelink files
+        target_location (str, optional): Override location for the recreated symlinks
+        timestamp_strategy (str): Strategy for setting timestamps ('current', 'symlink', 'target', 'preserve-all')
+        update_dazzlelink (bool): Whether to update the dazzlelink metadata during recreation
+        use_live_target (bool): Whether to check the live target file for timestamps
+        workers (int, optional): Number of worker threads (default: min(32, 4 * CPU count))
+        batch_size (int, optional): Number of links handed to the pool at a time,
+            bounding the work in flight for very large runs (default: all at once)
         
-        # Attempt to restore file attributes if available
-        links.restore_file_attributes(link_path, dl_data.to_dict())
+    Returns:
+        tuple: (list of created symlink paths, list of (dazzlelink_path, error message))
+    """
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+    
+    created = []
+    failures = []
+    
+    def load(dazzlelink_path):
+        try:
+            dl_data = DazzleLinkData.from_file(dazzlelink_path)
+            return dl_data, _resolve_link_path(dl_data, target_location), None
+        except Exception as e:
+            return None, None, str(e)
+    
+    def recreate(dazzlelink_path, dl_data, link_path):
+        _create_link(dl_data, link_path)
+        # A link queued for the elevated run does not exist yet; it is
+        # finished once the run has confirmed it
+        if links.ElevatedSymlinkBatch.is_deferred(link_path):
+            return None
+        return _finish_recreate(dazzlelink_path, dl_data, link_path, timestamp_strategy,
+                                update_dazzlelink, use_live_target, True, target_cache)
+    
+    def finish(dazzlelink_path, dl_data, link_path):
+        return _finish_recreate(dazzlelink_path, dl_data, link_path, timestamp_strategy,
+                                update_dazzlelink, use_live_target, True, target_cache)
+    
+    def run(executor, func, jobs):
+        # Results are collected per batch, in submission order
+        step = batch_size or len(jobs) or 1
+        results = []
+        for start in range(0, len(jobs), step):
+            futures = [(job, executor.submit(func, *job)) for job in jobs[start:start + step]]
+            for job, future in futures:
+                try:
+                    results.append((job, future.result(), None))
+                except Exception as e:
+                    results.append((job, None, str(e)))
+        return results
+    
+    elevated_batch = links.ElevatedSymlinkBatch() if IS_WINDOWS else ExitStack()
+    
+    # Live targets shared by many dazzlelinks are looked up once; the cache
+    # belongs to this run and is handed to its workers
+    target_cache = {}
+    
+    with links.directory_cache(), ThreadPoolExecutor(max_workers=workers) as executor:
+        # Read and parse every file first (reads overlap on the pool) so the
+        # parent directories are known before any link is created
+        jobs_by_link = {}
+        for dazzlelink_path, (dl_data, link_path, error) in zip(
+                dazzlelink_paths, executor.map(load, dazzlelink_paths)):
+            if error is not None:
+                failures.append((dazzlelink_path, error))
+                continue
+            # Two workers must never replace the same path at once
+            key = os.path.normcase(os.path.abspath(link_path))
+            previous = jobs_by_link.pop(key, None)
+            if previous is not None and previous[0] != dazzlelink_path:
+                failures.append((previous[0], f"Link path {link_path} is also recreated "
+                                              f"from {dazzlelink_path}"))
+            jobs_by_link[key] = (dazzlelink_path, dl_data, link_path)
+        jobs = list(jobs_by_link.values())
         
-        # Update dazzlelink metadata if requested
-        if update_dazzlelink:
+        # Create each parent directory once, before any worker needs it
+        for parent in {os.path.dirname(link_path) for _, _, link_path in jobs}:
             try:
-                # Update dazzlelink metadata
-                dl_data.update_metadata(reason="symlink_recreation")
-                
-                # If we used live target and it was successful, update target timestamps too
-                if use_live_target and timestamp_strategy in ['target', 'preserve-all']:
-                    target_path = dl_data.get_target_path()
-                    if os.path.exists(target_path):
-                        # Get current target timestamps
-                        target_timestamps = timestamps.collect_target_timestamp_info(target_path)
-                        
-                        # Update in the dazzlelink data
-                        dl_data.set_target_timestamps(
-                            created=target_timestamps.get('created'),
-                            modified=target_timestamps.get('modified'),
-                            accessed=target_timestamps.get('accessed')
-                        )
-                
-                # Save the updated dazzlelink
-                dl_data.save_to_file(dazzlelink_path)
-                
-                debug_print(f"Updated dazzlelink metadata for {dazzlelink_path}")
-            except Exception as e:
-                debug_print(f"Failed to update dazzlelink metadata: {str(e)}")
+                links.ensure_directory(parent)
+            except OSError as e:
+                debug_print(f"Failed to create directory {parent}: {e}")
         
-        return link_path
+        deferred = []
+        with elevated_batch:
+            for job, link_path, error in run(executor, recreate, jobs):
+                if error is not None:
+                    failures.append((job[0], error))
+                elif link_path is None:
+                    deferred.append(job)
+                else:
+                    created.append(link_path)
         
-    except Exception as e:
-        raise DazzleLinkException(f"Failed to recreate link from {dazzlelink_path}: {str(e)}")
+        # Finish the links the elevated run has confirmed
+        failed = {os.path.normcase(path) for path in getattr(elevated_batch, 'failed', ())}
+        confirmed = []
+        for job in deferred:
+            if os.path.normcase(os.path.abspath(job[2])) in failed:
+                failures.append((job[0], f"Elevated symlink creation failed: {job[2]}"))
+            else:
+                confirmed.append(job)
+        for job, link_path, error in run(executor, finish, confirmed):
+            if error is None:
+                created.append(link_path)
+            else:
+                failures.append((job[0], error))
+    
+    # Write back the dazzlelinks updated during recreation
+    if update_dazzlelink:
+        for dazzlelink_path in DazzleLinkData.flush_pending_saves():
+            failures.append((dazzlelink_path, "Failed to save updated dazzlelink"))
+    
+    return created, failures
 
 def execute_dazzlelink(dazzlelink_path, mode=None, config_override=None):
     """
@@ -140,57 +330,52 @@ def execute_dazzlelink(dazzlelink_path, mode=None, config_override=None):
             If provided, its settings take precedence over the file's embedded configuration
     """
     try:
-        # First try to detect if it's a script or JSON format
-        with open(dazzlelink_path, 'r', encoding='utf-8') as f:
-            # Read the first few lines to detect format
-            first_lines = ''.join([f.readline() for _ in range(3)])
-            
-            # Reset file pointer to beginning
-            f.seek(0)
-            
-            # Check if it's a script format (has shell/batch header)
-            if '#!/bin/sh' in first_lines or '@echo off' in first_lines:
-                # Handle script-embedded dazzlelink
-                if os.name == 'nt':
-                    # On Windows, execute as a batch file
-                    cmd = [dazzlelink_path]
-                    if mode:
-                        cmd.append(f"--{mode}")
-                    import subprocess
-                    subprocess.run(cmd, shell=True)
-                else:
-                    # On Unix, ensure it's executable and run it
-                    if not os.access(dazzlelink_path, os.X_OK):
-                        import stat
-                        os.chmod(dazzlelink_path, os.stat(dazzlelink_path).st_mode | stat.S_IEXEC)
-                    cmd = [dazzlelink_path]
-                    if mode:
-                        cmd.append(f"--{mode}")
-                    import subprocess
-                    subprocess.run(cmd)
-                return
+        # Read the file once; format detection and parsing work on the bytes
+        content = read_bytes(dazzlelink_path)
+        
+        # The first few lines are enough to detect the format
+        end = -1
+        for _ in range(3):
+            end = content.find(b'\n', end + 1)
+            if end == -1:
+                break
+        first_lines = content if end == -1 else content[:end + 1]
+        
+        # Check if it's a script format (has shell/batch header)
+        if b'#!/bin/sh' in first_lines or b'@echo off' in first_lines:
+            # Handle script-embedded dazzlelink
+            if IS_WINDOWS:
+                # On Windows, execute as a batch file
+                cmd = [dazzlelink_path]
+                if mode:
+                    cmd.append(f"--{mode}")
+                subprocess.run(cmd, shell=True)
+            else:
+                # On Unix, ensure it's executable and run it
+                if not os.access(dazzlelink_path, os.X_OK):
+                    os.chmod(dazzlelink_path, os.stat(dazzlelink_path).st_mode | stat.S_IEXEC)
+                cmd = [dazzlelink_path]
+                if mode:
+                    cmd.append(f"--{mode}")
+                subprocess.run(cmd)
+            return
+        
+        # Otherwise, try to parse as JSON
+        try:
+            link_data = json_loads(content)
+        except json.JSONDecodeError:
+            # If it's not a clean JSON but might have embedded JSON
+            # Try to extract JSON section from script format
+            json_start = content.rfind(b'# DAZZLELINK_DATA_BEGIN')
             
-            # Otherwise, try to parse as JSON
-            try:
-                # Reset file pointer again just to be safe
-                f.seek(0)
-                import json
-                link_data = json.load(f)
-            except json.JSONDecodeError:
-                # If it's not a clean JSON but might have embedded JSON
-                # Try to extract JSON section from script format
-                f.seek(0)
-                content = f.read()
-                json_start = content.find('# DAZZLELINK_DATA_BEGIN')
-                
-                if json_start != -1:
-                    json_text = content[json_start + len('# DAZZLELINK_DATA_BEGIN'):].strip()
-                    try:
-                        link_data = json.loads(json_text)
-                    except json.JSONDecodeError:
-                        raise DazzleLinkException(f"Cannot parse embedded JSON in {dazzlelink_path}")
-                else:
-                    raise DazzleLinkException(f"Invalid dazzlelink format in {dazzlelink_path}")
+            if json_start != -1:
+                json_text = content[json_start + len(b'# DAZZLELINK_DATA_BEGIN'):].strip()
+                try:
+                    link_data = json_loads(json_text)
+                except json.JSONDecodeError:
+                    raise DazzleLinkException(f"Cannot parse embedded JSON in {dazzlelink_path}")
+            else:
+                raise DazzleLinkException(f"Invalid dazzlelink format in {dazzlelink_path}")
         
         # Handle both old and new schema formats
         if "target_path" in link_data:
@@ -248,10 +433,9 @@ def execute_dazzlelink(dazzlelink_path, mode=None, config_override=None):
         
         elif execute_mode == "open" or execute_mode == "auto":
             # Try to open the target
-            if os.name == 'nt':
+            if IS_WINDOWS:
                 os.startfile(target_path)
             else:
-                import subprocess
                 subprocess.run(['xdg-open', target_path])
         
         else:
@@ -10,19 +10,110 @@ import sys
 import datetime
 import time
 import logging
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional, Tuple, Union, Any
 
 # Add debugging support
 VERBOSE = os.environ.get('DAZZLELINK_VERBOSE', '0') == '1'
+
+# Platform check, evaluated once at import
+IS_WINDOWS = os.name == 'nt'
+
+# Optional Win32 modules (pywin32), imported once; None when unavailable
+win32file = win32con = pywintypes = None
+if IS_WINDOWS:
+    try:
+        import win32file
+        import win32con
+        import pywintypes
+    except ImportError:
+        win32file = win32con = pywintypes = None
+
+# CreateFile arguments shared by every Win32 timestamp call: full sharing, and
+# flags that open the link itself (not its target) and allow directories
+_SHARE_ALL = _OPEN_FLAGS = 0
+if win32file is not None:
+    _SHARE_ALL = win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE | win32file.FILE_SHARE_DELETE
+    _OPEN_FLAGS = (win32file.FILE_ATTRIBUTE_NORMAL | win32file.FILE_FLAG_BACKUP_SEMANTICS |
+                   win32file.FILE_FLAG_OPEN_REPARSE_POINT)
+
 logger = logging.getLogger(__name__)
 
 def debug_print(message):
-    """Print debug messages if VERBOSE is enabled"""
+    """
+    Print debug messages if VERBOSE is enabled
+    
+    Arguments are formatted before the call, so messages that are costly to
+    build (e.g. datetime conversions) should be guarded with 'if VERBOSE:'.
+    """
     if VERBOSE:
         print(f"DEBUG: {message}")
         logger.debug(message)
 
+# FILETIME counts 100ns ticks since 1601-01-01; Unix time counts seconds since 1970-01-01
+_FILETIME_TICKS_PER_SECOND = 10000000
+_FILETIME_UNIX_EPOCH = 11644473600 * _FILETIME_TICKS_PER_SECOND
+
+@contextmanager
+def _open_link_handle(path, access):
+    """
+    Open a Win32 handle to a file or symlink itself (never its target)
+    
+    Args:
+        path (str): Path to open
+        access (int): Desired access (e.g. win32file.GENERIC_READ)
+        
+    Yields:
+        PyHANDLE: The open handle, closed when the block exits
+    """
+    handle = win32file.CreateFile(
+        path,
+        access,
+        _SHARE_ALL,
+        None,
+        win32file.OPEN_EXISTING,
+        _OPEN_FLAGS,
+        None
+    )
+    try:
+        yield handle
+    finally:
+        handle.Close()
+
+def _unix_to_filetime(timestamp):
+    """
+    Convert a Unix timestamp to a value accepted by win32file.SetFileTime
+    
+    Args:
+        timestamp (float): Unix timestamp, or None to leave the time unchanged
+        
+    Returns:
+        pywintypes.Time or None
+    """
+    return pywintypes.Time(int(timestamp)) if timestamp is not None else None
+
+def _filetime_to_unix(filetime):
+    """
+    Convert a time returned by win32file.GetFileTime to a Unix timestamp
+    
+    Args:
+        filetime: pywintypes time object or raw FILETIME tick count
+        
+    Returns:
+        float: Unix timestamp, or None if the time is empty
+    """
+    if not filetime:
+        return None
+    if hasattr(filetime, 'timestamp'):
+        # Newer pywin32 returns datetime-based objects
+        return filetime.timestamp()
+    # Integer arithmetic up to the final division avoids float rounding drift
+    return (int(filetime) - _FILETIME_UNIX_EPOCH) / _FILETIME_TICKS_PER_SECOND
+
+# Whether os.utime can act on a symlink itself rather than its target
+_LUTIME_SUPPORTED = os.utime in os.supports_follow_symlinks
+
 def set_file_times(file_path, modified_time, accessed_time=None, created_time=None):
     """
     Set modification, access, and creation times for a file or symlink.
@@ -40,61 +131,38 @@ def set_file_times(file_path, modified_time, accessed_time=None, created_time=No
         accessed_time = modified_time
     
     debug_print(f"Setting timestamps for {file_path}")
-    debug_print(f"  Modified: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat() if modified_time else 'None'})")
-    debug_print(f"  Accessed: {accessed_time} ({datetime.datetime.fromtimestamp(accessed_time).isoformat() if accessed_time else 'None'})")
-    debug_print(f"  Created: {created_time} ({datetime.datetime.fromtimestamp(created_time).isoformat() if created_time else 'None'})")
+    if VERBOSE:
+        debug_print(f"  Modified: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat() if modified_time else 'None'})")
+        debug_print(f"  Accessed: {accessed_time} ({datetime.datetime.fromtimestamp(accessed_time).isoformat() if accessed_time else 'None'})")
+        debug_print(f"  Created: {created_time} ({datetime.datetime.fromtimestamp(created_time).isoformat() if created_time else 'None'})")
     
     # On Windows, use Win32 API to set all timestamps including creation time
-    if os.name == 'nt': # and created_time is not None:
+    if IS_WINDOWS: # and created_time is not None:
         try:
-            import win32file
-            import win32con
-            import pywintypes
+            if win32file is None:
+                raise ImportError("pywin32 is not installed")
             
             # Convert Unix timestamps to Windows FILETIME
-            win_created = pywintypes.Time(int(created_time)) if created_time is not None else None
-            win_accessed = pywintypes.Time(int(accessed_time)) if accessed_time is not None else None
-            win_modified = pywintypes.Time(int(modified_time)) if modified_time is not None else None
+            win_created = _unix_to_filetime(created_time)
+            win_accessed = _unix_to_filetime(accessed_time)
+            win_modified = _unix_to_filetime(modified_time)
             
             debug_print("Using Win32 API to set file times")
             
             # Important: Use FILE_FLAG_BACKUP_SEMANTICS | FILE_FLAG_OPEN_REPARSE_POINT
             # to work properly with symlinks on Windows
-            # Open file handle with proper sharing mode to avoid "file in use" errors
-            handle = win32file.CreateFile(
-                file_path,
-                win32file.GENERIC_WRITE,
-                win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE | win32file.FILE_SHARE_DELETE,
-                None,
-                win32file.OPEN_EXISTING,
-                win32file.FILE_ATTRIBUTE_NORMAL | win32file.FILE_FLAG_BACKUP_SEMANTICS | win32file.FILE_FLAG_OPEN_REPARSE_POINT,
-                None
-            )
-            
-            try:
+            # Open file handle with proper sharing mode to avoid "file in use" errors;
+            # read access as well so the result can be verified on the same handle
+            with _open_link_handle(file_path, win32file.GENERIC_READ | win32file.GENERIC_WRITE) as handle:
                 # Set times - pass all three timestamps to SetFileTime
                 win32file.SetFileTime(handle, win_created, win_accessed, win_modified)
                 debug_print("Successfully set all timestamps using Win32 API")
                 
-                # Verify the timestamps were correctly set
-                try:
-                    # Close handle first to ensure changes are flushed
-                    handle.Close()
-                    handle = None
-                    
-                    # Reopen to check
-                    verify_handle = win32file.CreateFile(
-                        file_path,
-                        win32file.GENERIC_READ,
-                        win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE | win32file.FILE_SHARE_DELETE,
-                        None,
-                        win32file.OPEN_EXISTING,
-                        win32file.FILE_ATTRIBUTE_NORMAL | win32file.FILE_FLAG_BACKUP_SEMANTICS | win32file.FILE_FLAG_OPEN_REPARSE_POINT,
-                        None
-                    )
-                    
+                # Read the timestamps back for the debug output; the result
+                # is not acted upon, so skip the call entirely otherwise
+                if VERBOSE:
                     try:
-                        actual_created, actual_accessed, actual_modified = win32file.GetFileTime(verify_handle)
+                        actual_created, actual_accessed, actual_modified = win32file.GetFileTime(handle)
                         
                         debug_print("Timestamp verification:")
                         if win_created:
@@ -103,16 +171,10 @@ def set_file_times(file_path, modified_time, accessed_time=None, created_time=No
                             debug_print(f"  Accessed: Expected={win_accessed}, Actual={actual_accessed}")
                         if win_modified:
                             debug_print(f"  Modified: Expected={win_modified}, Actual={actual_modified}")
-                    finally:
-                        verify_handle.Close()
-                except Exception as ve:
-                    debug_print(f"Timestamp verification failed: {str(ve)}")
+                    except Exception as ve:
+                        debug_print(f"Timestamp verification failed: {str(ve)}")
                 
                 return True
-            finally:
-                # Close handle if still open
-                if handle:
-                    handle.Close()
                 
         except ImportError:
             debug_print("win32file module not available, cannot set creation time on Windows")
@@ -121,8 +183,15 @@ def set_file_times(file_path, modified_time, accessed_time=None, created_time=No
     
     # Fall back to os.utime for modification and access times only
     try:
-        # Use standard os.utime function (note: this won't set creation time)
-        os.utime(file_path, (accessed_time, modified_time))
+        # Use standard os.utime function (note: this won't set creation time);
+        # act on a symlink itself rather than following it to the target
+        if _LUTIME_SUPPORTED:
+            try:
+                os.utime(file_path, (accessed_time, modified_time), follow_symlinks=False)
+            except NotImplementedError:
+                os.utime(file_path, (accessed_time, modified_time))
+        else:
+            os.utime(file_path, (accessed_time, modified_time))
         debug_print(f"Set modification and access times using os.utime")
         
         # Return True if creation time wasn't needed, False if it was needed but not set
@@ -131,28 +200,96 @@ def set_file_times(file_path, modified_time, accessed_time=None, created_time=No
         debug_print(f"Failed to set timestamps using os.utime: {str(e)}")
         return False
 
+# Largest accepted difference when verifying utime results (covers coarse
+# filesystem timestamp granularity such as FAT's 2 seconds)
+_UTIME_TOLERANCE_NS = 2 * 1000000000
+
+def _set_link_times_utime(link_path, modified_time, accessed_time=None, verify=True):
+    """
+    Set access/modification times on a symlink itself with os.utime.
+    
+    Args:
+        link_path (str): Path to the symlink
+        modified_time (float): Modification timestamp
+        accessed_time (float, optional): Access timestamp (defaults to modified_time)
+        verify (bool): Whether to read the times back with lstat
+        
+    Returns:
+        bool: True if the times were set, False otherwise
+    """
+    if accessed_time is None:
+        accessed_time = modified_time
+    mtime_ns = round(modified_time * 1000000000)
+    atime_ns = round(accessed_time * 1000000000)
+    
+    try:
+        os.utime(link_path, ns=(atime_ns, mtime_ns), follow_symlinks=False)
+    except (OSError, NotImplementedError) as e:
+        debug_print(f"Failed to set symlink timestamps using os.utime: {str(e)}")
+        return False
+    
+    if verify:
+        # Integer nanoseconds avoid float rounding in the comparison
+        try:
+            diff = abs(os.lstat(link_path).st_mtime_ns - mtime_ns)
+            if diff > _UTIME_TOLERANCE_NS:
+                debug_print(f"  Modification time mismatch after utime: diff={diff}ns")
+            else:
+                debug_print("Timestamp verification successful")
+        except OSError as e:
+            debug_print(f"Error verifying timestamps: {str(e)}")
+    
+    return True
+
+def _timestamps_mismatch(expected_timestamps, actual_created, actual_modified, tolerance=5.0):
+    """
+    Compare expected creation/modification times with actual ones.
+    
+    Access time is not checked since it changes frequently.
+    
+    Args:
+        expected_timestamps (dict): Expected 'created' and 'modified' Unix timestamps
+        actual_created (float): Actual creation time, or None if unknown
+        actual_modified (float): Actual modification time, or None if unknown
+        tolerance (float): Allowed difference in seconds
+        
+    Returns:
+        bool: True if a known time differs by more than the tolerance
+    """
+    for name, actual in (('created', actual_created), ('modified', actual_modified)):
+        expected = expected_timestamps[name]
+        if expected is not None and actual is not None:
+            diff = abs(expected - actual)
+            if diff > tolerance:
+                debug_print(f"  WARNING: {name} time mismatch: expected={expected}, actual={actual}, diff={diff}")
+                return True
+    return False
+
 def set_link_timestamps(link_path, timestamp_data, max_attempts=2, verify=True, retry_delay=0.05):
     """
     Set timestamps on a symlink with verification and retry logic.
     
-    This is a wrapper around _set_file_times that adds verification and retries
-    specifically for symlinks where timestamp setting can be more complex.
+    Unlike set_file_times, this never follows the link. Access/modification
+    times are set with os.utime(follow_symlinks=False) where supported; when a
+    creation time must be set on Windows, it sets and verifies through a single
+    Win32 handle, retrying on the same handle when verification fails.
     
     Args:
         link_path (str): Path to the symlink
         timestamp_data (dict): Dictionary with 'created', 'modified', and 'accessed' timestamps
-        max_attempts (int): Maximum number of retry attempts
+        max_attempts (int): Maximum number of set-and-verify attempts
         verify (bool): Whether to verify timestamps after setting (can be disabled for batch processing)
         retry_delay (float): Delay in seconds between retry attempts
         
     Returns:
         bool: True if successful, False otherwise
     """
-    if not os.name == 'nt':
-        debug_print("Advanced symlink timestamp setting only available on Windows")
+    if not IS_WINDOWS and not _LUTIME_SUPPORTED:
+        debug_print("Symlink timestamp setting is not supported on this platform")
         return False
         
-    if not os.path.exists(link_path):
+    # lexists: a dangling link still has its own timestamps
+    if not os.path.lexists(link_path):
         debug_print(f"Link does not exist: {link_path}")
         return False
         
@@ -167,96 +304,85 @@ def set_link_timestamps(link_path, timestamp_data, max_attempts=2, verify=True,
         return False
         
     debug_print(f"Setting symlink timestamps: {link_path}")
-    debug_print(f"  Created:  {created_time} ({datetime.datetime.fromtimestamp(created_time).isoformat() if created_time else 'None'})")
-    debug_print(f"  Modified: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat() if modified_time else 'None'})")
-    debug_print(f"  Accessed: {accessed_time} ({datetime.datetime.fromtimestamp(accessed_time).isoformat() if accessed_time else 'None'})")
+    if VERBOSE:
+        debug_print(f"  Created:  {created_time} ({datetime.datetime.fromtimestamp(created_time).isoformat() if created_time else 'None'})")
+        debug_print(f"  Modified: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat() if modified_time else 'None'})")
+        debug_print(f"  Accessed: {accessed_time} ({datetime.datetime.fromtimestamp(accessed_time).isoformat() if accessed_time else 'None'})")
     
-    # First attempt - just set the timestamps without verification if verification is disabled
-    success = set_file_times(link_path, modified_time, accessed_time, created_time)
+    # Access/modification times can be set on the link itself with a single
+    # utime call; only creation time needs the Win32 handle path below
+    if _LUTIME_SUPPORTED and (created_time is None or not IS_WINDOWS):
+        if created_time is not None:
+            debug_print("Creation time cannot be set on this platform, ignoring it")
+        return _set_link_times_utime(link_path, modified_time, accessed_time, verify)
     
-    if not success:
-        debug_print("Initial timestamp setting failed")
-        return False
+    if win32file is None:
+        # Without pywin32 the times can still be set (os.utime), but not verified
+        debug_print("win32file module not available, cannot verify timestamps")
+        return set_file_times(link_path, modified_time, accessed_time, created_time)
+    
+    try:
+        win_created = _unix_to_filetime(created_time)
+        win_accessed = _unix_to_filetime(accessed_time if accessed_time is not None else modified_time)
+        win_modified = _unix_to_filetime(modified_time)
         
-    # If verification is disabled, exit early
-    if not verify:
-        return True
+        # One read/write handle serves every set and verify attempt, instead of
+        # a CreateFile/CloseHandle pair per step
+        handle = win32file.CreateFile(
+            link_path,
+            win32file.GENERIC_READ | win32file.GENERIC_WRITE,
+            _SHARE_ALL,
+            None,
+            win32file.OPEN_EXISTING,
+            _OPEN_FLAGS,
+            None
+        )
+    except Exception as e:
+        debug_print(f"Cannot open {link_path} for timestamp update: {str(e)}")
+        return set_file_times(link_path, modified_time, accessed_time, created_time)
     
-    # Verification needed - start with attempt 1 since we already did initial set
-    for attempt in range(1, max_attempts):
-        # Verify the timestamps were correctly set
-        try:
-            import win32file
+    expected_timestamps = {'created': created_time, 'modified': modified_time}
+    try:
+        for attempt in range(max(1, max_attempts)):
+            try:
+                win32file.SetFileTime(handle, win_created, win_accessed, win_modified)
+            except Exception as e:
+                debug_print(f"Timestamp setting failed: {str(e)}")
+                return False
             
-            # Open a handle to the file
-            handle = win32file.CreateFile(
-                link_path,
-                win32file.GENERIC_READ,
-                win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE | win32file.FILE_SHARE_DELETE,
-                None,
-                win32file.OPEN_EXISTING,
-                win32file.FILE_ATTRIBUTE_NORMAL | win32file.FILE_FLAG_BACKUP_SEMANTICS | win32file.FILE_FLAG_OPEN_REPARSE_POINT,
-                None
-            )
+            # If verification is disabled, exit early
+            if not verify:
+                return True
             
+            # Verify on the same handle
             try:
-                # Get the current timestamps
-                actual_created, actual_accessed, actual_modified = win32file.GetFileTime(handle)
-                
-                # Convert to Unix timestamps for easier comparison
-                actual_created_ts = int(actual_created) / 10000000 - 11644473600 if actual_created else None
-                actual_accessed_ts = int(actual_accessed) / 10000000 - 11644473600 if actual_accessed else None
-                actual_modified_ts = int(actual_modified) / 10000000 - 11644473600 if actual_modified else None
-                
-                # Allow a larger tolerance (5 seconds) for timestamp comparisons
-                tolerance = 5.0
-                verified = True
-                
-                # Only check creation and modification times - access time can change frequently
-                # Check creation time (most important)
-                if created_time is not None and actual_created_ts is not None:
-                    diff = abs(created_time - actual_created_ts)
-                    if diff > tolerance:
-                        debug_print(f"  Creation time mismatch: expected={created_time}, actual={actual_created_ts}, diff={diff}")
-                        verified = False
-                
-                # Check modification time
-                if modified_time is not None and actual_modified_ts is not None:
-                    diff = abs(modified_time - actual_modified_ts)
-                    if diff > tolerance:
-                        debug_print(f"  Modification time mismatch: expected={modified_time}, actual={actual_modified_ts}, diff={diff}")
-                        verified = False
-                
-                if verified:
-                    debug_print("Timestamp verification successful")
-                    return True
-                
-            finally:
-                handle.Close()
-                
-        except ImportError:
-            debug_print("win32file module not available, cannot verify timestamps")
-            # Since we can't verify, assume it worked if _set_file_times reported success
-            return success
-        except Exception as e:
-            debug_print(f"Error verifying timestamps: {str(e)}")
-        
-        # If we reach here, verification failed - set timestamps again
-        debug_print(f"Verification failed, retry attempt {attempt}")
-        success = set_file_times(link_path, modified_time, accessed_time, created_time)
-        if not success:
-            debug_print("Timestamp setting failed on retry")
-            return False
+                actual_created, _, actual_modified = win32file.GetFileTime(handle)
+            except Exception as e:
+                debug_print(f"Error verifying timestamps: {str(e)}")
+                # The times were set even though they could not be read back
+                return True
+            # Only creation and modification times are checked - access time can change frequently
+            if not _timestamps_mismatch(expected_timestamps,
+                                        _filetime_to_unix(actual_created),
+                                        _filetime_to_unix(actual_modified)):
+                debug_print("Timestamp verification successful")
+                return True
             
-        # Short delay before next verification
-        if attempt < max_attempts - 1:
-            time.sleep(retry_delay)
+            debug_print(f"Verification failed, retry attempt {attempt + 1}")
+            # Short delay before next attempt
+            if attempt < max_attempts - 1:
+                time.sleep(retry_delay)
+    finally:
+        handle.Close()
     
     # If we reach here, we've used all our attempts
     debug_print(f"Failed to verify timestamps after {max_attempts} attempts")
     # Return true anyway since we did set the timestamps, even if verification failed
     return True
 
+# Strategies with a single expected timestamp source that verification can check
+_VERIFIED_STRATEGIES = frozenset(('symlink', 'target'))
+
 def verify_timestamps(link_path, dl_data, strategy, use_live_target=False):
     """
     Verify that timestamps were correctly applied to a file.
@@ -267,37 +393,34 @@ def verify_timestamps(link_path, dl_data, strategy, use_live_target=False):
         strategy (str): Timestamp strategy that was used
         use_live_target (bool): Whether to check the live target file for timestamps
     """
-    if os.name != 'nt':
+    if not IS_WINDOWS:
+        return
+    
+    # Only 'symlink' and 'target' have expected values to compare (and reapply);
+    # for other strategies the readback below would just be debug output
+    if strategy not in _VERIFIED_STRATEGIES and not VERBOSE:
         return
         
     try:
-        import win32file
-        import pywintypes
+        if win32file is None:
+            raise ImportError("pywin32 is not installed")
         
-        # Open a handle to the file
-        handle = win32file.CreateFile(
-            link_path,
-            win32file.GENERIC_READ,
-            win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE | win32file.FILE_SHARE_DELETE,
-            None,
-            win32file.OPEN_EXISTING,
-            win32file.FILE_ATTRIBUTE_NORMAL | win32file.FILE_FLAG_BACKUP_SEMANTICS | win32file.FILE_FLAG_OPEN_REPARSE_POINT,
-            None
-        )
-        
-        try:
+        # Open a handle to the file; write access lets a mismatch be
+        # corrected on the same handle
+        with _open_link_handle(link_path, win32file.GENERIC_READ | win32file.GENERIC_WRITE) as handle:
             # Get the current timestamps
             created, accessed, modified = win32file.GetFileTime(handle)
             
             # Convert to Unix timestamps for easier comparison
-            actual_created = int(created) / 10000000 - 11644473600 if created else None
-            actual_accessed = int(accessed) / 10000000 - 11644473600 if accessed else None
-            actual_modified = int(modified) / 10000000 - 11644473600 if modified else None
+            actual_created = _filetime_to_unix(created)
+            actual_accessed = _filetime_to_unix(accessed)
+            actual_modified = _filetime_to_unix(modified)
             
             debug_print("Timestamp verification results:")
-            debug_print(f"  Created:  {actual_created} ({datetime.datetime.fromtimestamp(actual_created).isoformat() if actual_created else 'None'})")
-            debug_print(f"  Modified: {actual_modified} ({datetime.datetime.fromtimestamp(actual_modified).isoformat() if actual_modified else 'None'})")
-            debug_print(f"  Accessed: {actual_accessed} ({datetime.datetime.fromtimestamp(actual_accessed).isoformat() if actual_accessed else 'None'})")
+            if VERBOSE:
+                debug_print(f"  Created:  {actual_created} ({datetime.datetime.fromtimestamp(actual_created).isoformat() if actual_created else 'None'})")
+                debug_print(f"  Modified: {actual_modified} ({datetime.datetime.fromtimestamp(actual_modified).isoformat() if actual_modified else 'None'})")
+                debug_print(f"  Accessed: {actual_accessed} ({datetime.datetime.fromtimestamp(actual_accessed).isoformat() if actual_accessed else 'None'})")
             
             # Determine expected timestamps based on strategy
             expected_timestamps = None
@@ -338,43 +461,35 @@ def verify_timestamps(link_path, dl_data, strategy, use_live_target=False):
             
             # Compare timestamps if we have expected values
             if expected_timestamps:
-                # Allow a small tolerance (5 seconds) for timestamp comparisons
-                tolerance = 5.0
-                
-                # Check creation time
-                if expected_timestamps['created'] is not None and actual_created is not None:
-                    diff = abs(expected_timestamps['created'] - actual_created)
-                    if diff > tolerance:
-                        debug_print(f"  WARNING: Creation time mismatch: expected={expected_timestamps['created']}, actual={actual_created}, diff={diff}")
-                        # If timestamps don't match, try setting them again
-                        debug_print("  Attempting to reapply timestamps...")
-                        set_file_times(
-                            link_path, 
-                            expected_timestamps['modified'], 
-                            expected_timestamps['accessed'], 
-                            expected_timestamps['created']
-                        )
-                        return
+                if not _timestamps_mismatch(expected_timestamps, actual_created, actual_modified):
+                    debug_print("  Timestamp verification: OK")
+                    return
                 
-                # Check modification time
-                if expected_timestamps['modified'] is not None and actual_modified is not None:
-                    diff = abs(expected_timestamps['modified'] - actual_modified)
-                    if diff > tolerance:
-                        debug_print(f"  WARNING: Modification time mismatch: expected={expected_timestamps['modified']}, actual={actual_modified}, diff={diff}")
-                        # If timestamps don't match, try setting them again
-                        debug_print("  Attempting to reapply timestamps...")
-                        set_file_times(
-                            link_path, 
-                            expected_timestamps['modified'], 
-                            expected_timestamps['accessed'], 
-                            expected_timestamps['created']
-                        )
+                # If timestamps don't match, set them again on the open handle
+                # and re-read; only fall back to set_file_times if that fails
+                debug_print("  Attempting to reapply timestamps...")
+                try:
+                    win32file.SetFileTime(
+                        handle,
+                        _unix_to_filetime(expected_timestamps['created']),
+                        _unix_to_filetime(expected_timestamps['accessed']),
+                        _unix_to_filetime(expected_timestamps['modified'])
+                    )
+                    created, _, modified = win32file.GetFileTime(handle)
+                    if not _timestamps_mismatch(expected_timestamps,
+                                                _filetime_to_unix(created),
+                                                _filetime_to_unix(modified)):
+                        debug_print("  Timestamps reapplied")
                         return
-                
-                debug_print("  Timestamp verification: OK")
-            
-        finally:
-            handle.Close()
+                except Exception as e:
+                    debug_print(f"  Reapplying on the open handle failed: {str(e)}")
+                
+                set_file_times(
+                    link_path, 
+                    expected_timestamps['modified'], 
+                    expected_timestamps['accessed'], 
+                    expected_timestamps['created']
+                )
             
     except ImportError:
         debug_print("win32file module not available, cannot verify timestamps")
@@ -401,13 +516,16 @@ def collect_timestamp_info(file_path):
         # Get the available timestamps
         if hasattr(stats, 'st_ctime'):
             creation_time = stats.st_ctime
-            debug_print(f"Collected creation time for {file_path}: {creation_time} ({datetime.datetime.fromtimestamp(creation_time).isoformat()})")
+            if VERBOSE:
+                debug_print(f"Collected creation time for {file_path}: {creation_time} ({datetime.datetime.fromtimestamp(creation_time).isoformat()})")
         if hasattr(stats, 'st_mtime'):
             modified_time = stats.st_mtime
-            debug_print(f"Collected modified time for {file_path}: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat()})")
+            if VERBOSE:
+                debug_print(f"Collected modified time for {file_path}: {modified_time} ({datetime.datetime.fromtimestamp(modified_time).isoformat()})")
         if hasattr(stats, 'st_atime'):
             access_time = stats.st_atime
-            debug_print(f"Collected access time for {file_path}: {access_time} ({datetime.datetime.fromtimestamp(access_time).isoformat()})")
+            if VERBOSE:
+                debug_print(f"Collected access time for {file_path}: {access_time} ({datetime.datetime.fromtimestamp(access_time).isoformat()})")
             
     except Exception as e:
         # Default to current time if stats fail
@@ -441,14 +559,13 @@ def collect_target_timestamp_info(target_path):
         "accessed_iso": None
     }
     
-    # Check if target exists
-    if not os.path.exists(target_path):
-        debug_print(f"Target does not exist, cannot collect timestamps: {target_path}")
-        return timestamps
-        
     try:
-        # Get target stats (without following symlinks if the target itself is a symlink)
-        stats = os.stat(target_path)
+        # Get target stats; a missing target is reported by the stat itself
+        try:
+            stats = os.stat(target_path)
+        except (FileNotFoundError, NotADirectoryError):
+            debug_print(f"Target does not exist, cannot collect timestamps: {target_path}")
+            return timestamps
         
         # Get the available timestamps
         if hasattr(stats, 'st_ctime'):
@@ -471,7 +588,222 @@ def collect_target_timestamp_info(target_path):
         
     return timestamps
 
-def apply_timestamp_strategy(link_path, dl_data, strategy, use_live_target=False, batch_mode=False):
+def lookup_target_timestamps(target_path, cache=None):
+    """
+    Collect a live target's timestamps, using a batch's cache if given.
+    
+    Many dazzlelinks in a batch often share a target, so each existing
+    target is looked up once per batch. Missing targets are not cached: one
+    may be created while the batch runs. Every batch owns its cache (a plain
+    dict, passed down to its workers), so batches running at the same time
+    never share or discard each other's lookups.
+    
+    Args:
+        target_path (str): Path to the target file or directory
+        cache (dict, optional): The batch's cache, target path -> timestamps
+        
+    Returns:
+        dict: Timestamp information, or None if the target does not exist
+    """
+    if cache is not None:
+        info = cache.get(target_path)
+        if info is not None:
+            return info
+    
+    info = collect_target_timestamp_info(target_path)
+    if info['created'] is None and info['modified'] is None and info['accessed'] is None:
+        return None
+    if cache is not None:
+        cache[target_path] = info
+    return info
+
+# Representation type ('original_path', 'unc_path', ...) that last reached a
+# live target, per drive/share root; links in one tree tend to share it
+_live_repr_winners = {}
+
+def _probe_live_target(dl_data, target_path, cache=None):
+    """
+    Find the live target of a dazzlelink and collect its timestamps.
+    
+    The stored path representations are tried in turn, starting with the one
+    that worked for the previous target under the same root.
+    
+    Args:
+        dl_data (DazzleLinkData): The dazzlelink data
+        target_path (str): The stored target path
+        cache (dict, optional): The batch's target cache (see lookup_target_timestamps)
+        
+    Returns:
+        tuple: (timestamps dict, path that reached the target), or (None, None)
+    """
+    # Try different path representations if available
+    target_representations = dl_data.get_target_representations()
+    root = os.path.splitdrive(target_path)[0]
+    
+    order = list(target_representations)
+    winner = _live_repr_winners.get(root)
+    if winner in target_representations and order[0] != winner:
+        order.remove(winner)
+        order.insert(0, winner)
+    
+    # Try each representation until we find one that works; a missing path
+    # yields no timestamps, so no separate existence check is needed
+    for repr_type in order:
+        path = target_representations[repr_type]
+        try:
+            live_timestamps = lookup_target_timestamps(path, cache)
+        except Exception as e:
+            debug_print(f"Failed with representation {repr_type}: {str(e)}")
+            continue
+        if live_timestamps is not None:
+            debug_print(f"Found live target using representation: {repr_type}")
+            _live_repr_winners[root] = repr_type
+            return live_timestamps, path
+    
+    # If no representation worked, try the original path
+    if target_path not in target_representations.values():
+        live_timestamps = lookup_target_timestamps(target_path, cache)
+        if live_timestamps is not None:
+            debug_print(f"Found live target using original path")
+            return live_timestamps, target_path
+    
+    return None, None
+
+def _timestamp_data(timestamps):
+    """Return the created/modified/accessed subset of a timestamp dictionary."""
+    return {
+        'created': timestamps.get('created'),
+        'modified': timestamps.get('modified'),
+        'accessed': timestamps.get('accessed')
+    }
+
+def _probe_live_timestamps(dl_data, cache=None):
+    """
+    Read the live target's timestamps for the target-based strategies.
+    
+    Args:
+        dl_data (DazzleLinkData): The dazzlelink data
+        cache (dict, optional): The batch's target cache (see lookup_target_timestamps)
+        
+    Returns:
+        dict: Live target timestamps, or None if unavailable
+    """
+    target_path = dl_data.get_target_path()
+    try:
+        debug_print(f"Attempting to get live target timestamps from: {target_path}")
+        live_target_timestamps, _ = _probe_live_target(dl_data, target_path, cache)
+        return live_target_timestamps
+    except Exception as e:
+        debug_print(f"Failed to get live target timestamps: {str(e)}")
+        return None
+
+def _strategy_symlink(link_path, dl_data, use_live_target, verify, cache):
+    """Apply the 'symlink' strategy: restore the original symlink timestamps."""
+    link_timestamps = dl_data.get_link_timestamps()
+    
+    # Only set if we have timestamps
+    if link_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(link_timestamps)
+        
+        debug_print(f"Using symlink timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        set_link_timestamps(link_path, timestamp_data, verify=verify)
+    return None
+
+def _strategy_target(link_path, dl_data, use_live_target, verify, cache):
+    """Apply the 'target' strategy: use the live or stored target timestamps."""
+    live_target_timestamps = _probe_live_timestamps(dl_data, cache)
+    
+    # Try live target timestamps first if available and requested
+    if use_live_target and live_target_timestamps and live_target_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(live_target_timestamps)
+        
+        debug_print(f"Using live target timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        set_link_timestamps(link_path, timestamp_data, verify=verify)
+        return live_target_timestamps
+    
+    # Fall back to stored target timestamps
+    target_timestamps = dl_data.get_target_timestamps()
+    if target_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(target_timestamps)
+        
+        debug_print(f"Using stored target timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        set_link_timestamps(link_path, timestamp_data, verify=verify)
+    elif live_target_timestamps and live_target_timestamps.get('modified') is not None:
+        # Fall back to live target even if not explicitly requested
+        timestamp_data = _timestamp_data(live_target_timestamps)
+        
+        debug_print(f"Falling back to live target timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        set_link_timestamps(link_path, timestamp_data, verify=verify)
+    return live_target_timestamps
+
+def _strategy_preserve_all(link_path, dl_data, use_live_target, verify, cache):
+    """Apply the 'preserve-all' strategy: the first timestamp source that works wins."""
+    live_target_timestamps = _probe_live_timestamps(dl_data, cache)
+    
+    # Try target timestamps first, in order of:
+    # 1. Live target (if use_live_target is True)
+    # 2. Stored target timestamps
+    # 3. Symlink timestamps
+    
+    # 1. Try live target first if requested
+    if use_live_target and live_target_timestamps and live_target_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(live_target_timestamps)
+        
+        debug_print(f"Using live target timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        if set_link_timestamps(link_path, timestamp_data, verify=verify):
+            return live_target_timestamps
+    
+    # 2. Try stored target timestamps
+    target_timestamps = dl_data.get_target_timestamps()
+    if target_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(target_timestamps)
+        
+        debug_print(f"Using stored target timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        if set_link_timestamps(link_path, timestamp_data, verify=verify):
+            return live_target_timestamps
+    
+    # 3. Try to fall back to live target even if not explicitly requested
+    if live_target_timestamps and live_target_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(live_target_timestamps)
+        
+        debug_print(f"Falling back to live target timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        if set_link_timestamps(link_path, timestamp_data, verify=verify):
+            return live_target_timestamps
+    
+    # 4. Finally, fall back to symlink timestamps
+    link_timestamps = dl_data.get_link_timestamps()
+    if link_timestamps.get('modified') is not None:
+        timestamp_data = _timestamp_data(link_timestamps)
+        
+        debug_print(f"Falling back to symlink timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
+        
+        # Set the timestamps on the recreated symlink with verification
+        set_link_timestamps(link_path, timestamp_data, verify=verify)
+    return live_target_timestamps
+
+# Strategy name -> handler; 'current' keeps the creation time, so it has none
+_STRATEGY_HANDLERS = {
+    'symlink': _strategy_symlink,
+    'target': _strategy_target,
+    'preserve-all': _strategy_preserve_all,
+}
+
+def apply_timestamp_strategy(link_path, dl_data, strategy, use_live_target=False, batch_mode=False,
+                             target_cache=None):
     """
     Apply the selected timestamp strategy to a recreated symlink.
     
@@ -481,185 +813,26 @@ def apply_timestamp_strategy(link_path, dl_data, strategy, use_live_target=False
         strategy (str): Timestamp strategy ('current', 'symlink', 'target', 'preserve-all')
         use_live_target (bool): Whether to check the live target file for timestamps
         batch_mode (bool): If True, optimizes for batch processing (less verification)
-    """
-    # Skip if not on Windows - timestamp setting is more reliable on Windows
-    if os.name != 'nt':
-        debug_print("Timestamp setting is only reliable on Windows, skipping")
-        return
+        target_cache (dict, optional): The batch's live target cache (see lookup_target_timestamps)
         
-    # For batch processing, we'll skip verification to improve performance
-    verify_timestamps = not batch_mode
+    Returns:
+        dict: Live target timestamps collected along the way (so callers need not
+            probe the target again), or None if the live target was not consulted
+    """
+    handler = _STRATEGY_HANDLERS.get(strategy)
+    if handler is None:
+        # 'current' (or an unknown strategy): keep the time the link was created
+        debug_print("Using current time for timestamps")
+        return None
+    
+    # Skip on platforms that can only set times on the link's target
+    if not IS_WINDOWS and not _LUTIME_SUPPORTED:
+        debug_print("Symlink timestamp setting not supported on this platform, skipping")
+        return None
     
+    # For batch processing, we'll skip verification to improve performance
     try:
-        # Get target path for possible live target check
-        target_path = dl_data.get_target_path()
-        live_target_timestamps = None
-        
-        # Check live target if requested or if we might need it
-        if use_live_target or strategy in ['target', 'preserve-all']:
-            try:
-                debug_print(f"Attempting to get live target timestamps from: {target_path}")
-                
-                # Try different path representations if available
-                target_representations = dl_data.get_target_representations()
-                
-                # Try each representation until we find one that works
-                for repr_type, path in target_representations.items():
-                    try:
-                        # Check if path exists
-                        if os.path.exists(path):
-                            live_target_timestamps = collect_target_timestamp_info(path)
-                            if any(v is not None for v in [
-                                live_target_timestamps.get('created'),
-                                live_target_timestamps.get('modified'),
-                                live_target_timestamps.get('accessed')
-                            ]):
-                                debug_print(f"Found live target using representation: {repr_type}")
-                                break
-                    except Exception as e:
-                        debug_print(f"Failed with representation {repr_type}: {str(e)}")
-                        continue
-                
-                # If no representation worked, try the original path
-                if (not live_target_timestamps or 
-                    not any(v is not None for v in [
-                        live_target_timestamps.get('created'),
-                        live_target_timestamps.get('modified'),
-                        live_target_timestamps.get('accessed')
-                    ])) and os.path.exists(target_path):
-                    live_target_timestamps = collect_target_timestamp_info(target_path)
-                    debug_print(f"Found live target using original path")
-            except Exception as e:
-                debug_print(f"Failed to get live target timestamps: {str(e)}")
-        
-        # Get timestamps based on strategy
-        if strategy == 'current':
-            # Use current time - nothing to do
-            debug_print("Using current time for timestamps")
-            return
-            
-        elif strategy == 'symlink':
-            # Use original symlink timestamps
-            link_timestamps = dl_data.get_link_timestamps()
-            
-            # Only set if we have timestamps
-            if link_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': link_timestamps.get('created'),
-                    'modified': link_timestamps.get('modified'),
-                    'accessed': link_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Using symlink timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps)
-                
-        elif strategy == 'target':
-            # Try live target timestamps first if available and requested
-            if use_live_target and live_target_timestamps and live_target_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': live_target_timestamps.get('created'),
-                    'modified': live_target_timestamps.get('modified'),
-                    'accessed': live_target_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Using live target timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps)
-                return
-            
-            # Fall back to stored target timestamps
-            target_timestamps = dl_data.get_target_timestamps()
-            
-            # Only set if we have timestamps
-            if target_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': target_timestamps.get('created'),
-                    'modified': target_timestamps.get('modified'),
-                    'accessed': target_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Using stored target timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps)
-            elif live_target_timestamps and live_target_timestamps.get('modified') is not None:
-                # Fall back to live target even if not explicitly requested
-                timestamp_data = {
-                    'created': live_target_timestamps.get('created'),
-                    'modified': live_target_timestamps.get('modified'),
-                    'accessed': live_target_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Falling back to live target timestamps: created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps)
-                
-        elif strategy == 'preserve-all':
-            # Try target timestamps first, in order of:
-            # 1. Live target (if use_live_target is True)
-            # 2. Stored target timestamps
-            # 3. Symlink timestamps
-            
-            # 1. Try live target first if requested
-            if use_live_target and live_target_timestamps and live_target_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': live_target_timestamps.get('created'),
-                    'modified': live_target_timestamps.get('modified'),
-                    'accessed': live_target_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Using live target timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                if set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps):
-                    return
-            
-            # 2. Try stored target timestamps
-            target_timestamps = dl_data.get_target_timestamps()
-            if target_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': target_timestamps.get('created'),
-                    'modified': target_timestamps.get('modified'),
-                    'accessed': target_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Using stored target timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                if set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps):
-                    return
-            
-            # 3. Try to fall back to live target even if not explicitly requested
-            if live_target_timestamps and live_target_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': live_target_timestamps.get('created'),
-                    'modified': live_target_timestamps.get('modified'),
-                    'accessed': live_target_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Falling back to live target timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                if set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps):
-                    return
-            
-            # 4. Finally, fall back to symlink timestamps
-            link_timestamps = dl_data.get_link_timestamps()
-            if link_timestamps.get('modified') is not None:
-                timestamp_data = {
-                    'created': link_timestamps.get('created'),
-                    'modified': link_timestamps.get('modified'),
-                    'accessed': link_timestamps.get('accessed')
-                }
-                
-                debug_print(f"Falling back to symlink timestamps (preserve-all): created={timestamp_data['created']}, modified={timestamp_data['modified']}, accessed={timestamp_data['accessed']}")
-                
-                # Set the timestamps on the recreated symlink with verification
-                set_link_timestamps(link_path, timestamp_data, verify=verify_timestamps)
-        
+        return handler(link_path, dl_data, use_live_target, not batch_mode, target_cache)
     except Exception as e:
         debug_print(f"Failed to apply timestamp strategy: {str(e)}")
+        return None
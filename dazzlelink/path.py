@@ -6,23 +6,47 @@ import os
 import re
 import logging
 import subprocess
+import threading
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from .exceptions import DazzleLinkException
 
 # Set up module-level logger
 logger = logging.getLogger(__name__)
 
+# Platform check, evaluated once at import
+IS_WINDOWS = os.name == 'nt'
+
+def _backslashed(path: Union[str, Path]) -> str:
+    """Return path as a string with backslash separators, avoiding copies where possible."""
+    path_str = path if isinstance(path, str) else str(path)
+    if '/' in path_str:
+        path_str = path_str.replace('/', '\\')
+    return path_str
+
 class UNCAdapter:
     """
     A simplified UNC path converter that maps UNC paths to drive letters and vice versa.
     This is particularly useful for handling symlinks on network shares.
     """
     
+    # Mapping size above which prefix lookups use a compiled regex
+    REGEX_THRESHOLD = 8
+    
     def __init__(self):
         """Initialize the adapter with an empty mapping cache."""
         self.mapping: Dict[str, str] = {}
+        # Lookup tables derived from mapping: (unc_prefix, drive) longest prefix first,
+        # and drive -> unc_prefix
+        self._prefix_pairs: List[Tuple[str, str]] = []
+        self._drive_map: Dict[str, str] = {}
+        # Combined prefix pattern, only built for large mappings (see _set_mapping)
+        self._prefix_re: Optional[re.Pattern] = None
+        # Bumped on every mapping change so callers can invalidate derived caches
+        self.generation = 0
+        # Guards refresh_mapping; lookups only read the (atomically swapped) dict
+        self._lock = threading.Lock()
         self.refresh_mapping()
     
     def refresh_mapping(self) -> None:
@@ -30,32 +54,56 @@ class UNCAdapter:
         Refresh the mapping of UNC paths to drive letters by parsing the output of 'net use'.
         This creates a dictionary where keys are UNC paths and values are drive letters.
         """
-        self.mapping = {}
-        
         # Only applicable on Windows
-        if os.name != 'nt':
+        if not IS_WINDOWS:
+            self._set_mapping({})
             return
             
-        try:
-            # Use 'net use' to get network mappings
-            output = subprocess.check_output(["net", "use"], text=True, stderr=subprocess.STDOUT)
-            for line in output.splitlines():
-                # Look for lines containing drive mappings: OK Z: \\server\share
-                m = re.search(r"^(OK|Disconnected)\s+([A-Z]:)\s+(\\\\\S+)", line, re.IGNORECASE)
-                if m:
-                    drive_letter = m.group(2).upper()
-                    # Ensure drive letter has trailing backslash
-                    if not drive_letter.endswith("\\"):
-                        drive_letter += "\\"
-                    # Store the UNC path (lowercase, no trailing backslash) as the key
-                    remote_share = m.group(3).rstrip("\\").lower()
-                    self.mapping[remote_share] = drive_letter
-                    
-            # Debug logging if needed
-            if self.mapping:
-                logger.debug(f"UNC mappings: {self.mapping}")
-        except Exception as e:
-            logger.warning(f"Failed to get network mappings: {e}")
+        with self._lock:
+            mapping = {}
+            try:
+                # Use 'net use' to get network mappings
+                output = subprocess.check_output(["net", "use"], text=True, stderr=subprocess.STDOUT)
+                for line in output.splitlines():
+                    # Look for lines containing drive mappings: OK Z: \\server\share
+                    m = re.search(r"^(OK|Disconnected)\s+([A-Z]:)\s+(\\\\\S+)", line, re.IGNORECASE)
+                    if m:
+                        drive_letter = m.group(2).upper()
+                        # Ensure drive letter has trailing backslash
+                        if not drive_letter.endswith("\\"):
+                            drive_letter += "\\"
+                        # Store the UNC path (lowercase, no trailing backslash) as the key
+                        remote_share = m.group(3).rstrip("\\").lower()
+                        mapping[remote_share] = drive_letter
+                        
+                # Debug logging if needed
+                if mapping:
+                    logger.debug(f"UNC mappings: {mapping}")
+            except Exception as e:
+                logger.warning(f"Failed to get network mappings: {e}")
+            
+            # Swap in the complete mapping so concurrent readers never see a partial one
+            self._set_mapping(mapping)
+    
+    def _set_mapping(self, mapping: Dict[str, str]) -> None:
+        """
+        Install a new UNC -> drive mapping and rebuild the derived lookup tables.
+        
+        Args:
+            mapping (dict): Lowercase UNC prefixes mapped to drive roots (e.g. 'Z:\\')
+        """
+        self._prefix_pairs = sorted(mapping.items(), key=lambda item: len(item[0]), reverse=True)
+        self._drive_map = {drive.upper(): unc for unc, drive in mapping.items()}
+        # For larger tables a single regex alternation (scanned in C) beats a
+        # Python-level startswith loop; longest prefixes come first so the
+        # first alternative that matches is the most specific one
+        if len(mapping) > self.REGEX_THRESHOLD:
+            self._prefix_re = re.compile(
+                '(?:' + '|'.join(re.escape(prefix) for prefix, _ in self._prefix_pairs) + r')(?=\\|$)')
+        else:
+            self._prefix_re = None
+        self.mapping = mapping
+        self.generation += 1
     
     def unc_to_drive(self, path: Path) -> Path:
         """
@@ -68,22 +116,8 @@ class UNCAdapter:
         Returns:
             Path: The converted path using drive letter if possible, otherwise unchanged
         """
-        path_str = str(path).replace('/', '\\')
-        path_lower = path_str.lower()
-        
-        # If path doesn't start with \\, it's not a UNC path
-        if not path_lower.startswith('\\\\'):
-            return path
-            
-        # Try to find a matching UNC mapping, checking most specific (longest) first
-        for unc_prefix in sorted(self.mapping.keys(), key=len, reverse=True):
-            if path_lower.startswith(unc_prefix):
-                # Replace the UNC prefix with the drive letter
-                drive_path = self.mapping[unc_prefix] + path_str[len(unc_prefix):]
-                return Path(drive_path)
-                
-        # No matching mapping found
-        return path
+        drive_path = self._unc_to_drive_str(_backslashed(path))
+        return path if drive_path is None else Path(drive_path)
     
     def drive_to_unc(self, path: Path) -> Path:
         """
@@ -96,24 +130,87 @@ class UNCAdapter:
         Returns:
             Path: The converted UNC path if possible, otherwise unchanged
         """
-        path_str = str(path).replace('/', '\\')
+        unc_path = self._drive_to_unc_str(_backslashed(path))
+        return path if unc_path is None else Path(unc_path)
+    
+    def _unc_to_drive_str(self, path_str: str) -> Optional[str]:
+        """
+        String-level core of unc_to_drive.
         
-        # If the path doesn't start with a drive letter, return unchanged
-        if not re.match(r'^[A-Z]:\\', path_str, re.IGNORECASE):
-            return path
+        Args:
+            path_str (str): Path using backslash separators
             
-        # Extract the drive letter (with backslash)
-        drive = path_str[:3].upper()
+        Returns:
+            str: The drive path, or None if no mapping applies
+        """
+        # If path doesn't start with \\, it's not a UNC path
+        if not path_str.startswith('\\\\'):
+            return None
+        
+        path_lower = path_str.lower()
         
-        # Look for the drive in our mapping values
-        for unc_path, mapped_drive in self.mapping.items():
-            if mapped_drive.upper() == drive:
-                # Replace the drive with the UNC path
-                unc_path_str = unc_path + path_str[2:]  # path_str[2:] to exclude the drive letter and colon
-                return Path(unc_path_str)
+        prefix_re = self._prefix_re
+        if prefix_re is not None:
+            m = prefix_re.match(path_lower)
+            if m is None:
+                return None
+            remainder = path_str[m.end():]
+            drive = self.mapping[m.group(0)]
+            return drive[:2] + remainder if remainder else drive
+            
+        # Try to find a matching UNC mapping, checking most specific (longest) first
+        for unc_prefix, drive in self._prefix_pairs:
+            # Only match whole components (\\srv\share must not match \\srv\shares)
+            if path_lower.startswith(unc_prefix) and path_lower[len(unc_prefix):len(unc_prefix) + 1] in ('', '\\'):
+                # Replace the UNC prefix with the drive letter; the remainder
+                # already starts with a separator, so use the bare drive ('Z:')
+                remainder = path_str[len(unc_prefix):]
+                return drive[:2] + remainder if remainder else drive
                 
         # No matching mapping found
-        return path
+        return None
+    
+    def _drive_to_unc_str(self, path_str: str) -> Optional[str]:
+        """
+        String-level core of drive_to_unc.
+        
+        Args:
+            path_str (str): Path using backslash separators
+            
+        Returns:
+            str: The UNC path, or None if no mapping applies
+        """
+        # If the path doesn't start with a drive letter, return unchanged
+        if len(path_str) < 3 or path_str[1:3] != ':\\' or not path_str[0].isalpha():
+            return None
+            
+        # Look up the drive letter (with backslash) in our mapping values
+        unc_path = self._drive_map.get(path_str[:3].upper())
+        if unc_path is None:
+            return None
+        
+        # Replace the drive with the UNC path
+        return unc_path + path_str[2:]  # path_str[2:] to exclude the drive letter and colon
+    
+    def both_representations(self, path_str: Union[str, Path]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Compute the UNC and drive representations of a path in a single pass.
+        
+        A path is either UNC or drive-based, so at most one side is converted;
+        the other side is the (separator-normalized) input itself.
+        
+        Args:
+            path_str (str or Path): The path to convert
+            
+        Returns:
+            tuple: (unc_path, drive_path), with None for a side that has no mapping
+        """
+        path_str = _backslashed(path_str)
+        if path_str.startswith('\\\\'):
+            drive_path = self._unc_to_drive_str(path_str)
+            return (path_str if drive_path is not None else None), drive_path
+        unc_path = self._drive_to_unc_str(path_str)
+        return unc_path, (path_str if unc_path is not None else None)
     
     def normalize_path(self, path: Path, prefer_unc: bool = False) -> Path:
         """
@@ -134,12 +231,15 @@ class UNCAdapter:
 
 # Helper functions that create and use a global UNCAdapter instance
 _global_adapter = None
+_global_adapter_lock = threading.Lock()
 
 def get_unc_adapter():
     """Get or create the global UNCAdapter instance."""
     global _global_adapter
     if _global_adapter is None:
-        _global_adapter = UNCAdapter()
+        with _global_adapter_lock:
+            if _global_adapter is None:
+                _global_adapter = UNCAdapter()
     return _global_adapter
 
 def convert_to_drive(path: Union[str, Path]) -> Path:
@@ -39,6 +39,9 @@ dependencies = [
 windows = [
     "pywin32>=223",
 ]
+fast = [
+    "orjson>=3.0",
+]
 dev = [
     "pytest>=6.0.0",
     "pytest-cov>=2.10.0",
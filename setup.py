@@ -60,6 +60,9 @@ setup(
         'windows': [
             'pywin32>=223',  # For advanced Windows functionality
         ],
+        'fast': [
+            'orjson>=3.0',  # Faster JSON encoding/decoding
+        ],
         'dev': [
             'pytest>=6.0.0',
             'pytest-cov>=2.10.0',
@@ -0,0 +1,37 @@
+"""
+Tests for dazzlelink.operations.links.find_dazzlelinks
+"""
+
+import os
+import tempfile
+import unittest
+
+from dazzlelink.operations.links import find_dazzlelinks
+
+
+class FindDazzlelinksTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        # "[1]" is a glob character class, so this path only matches literally
+        self.dir = os.path.join(self._tmp.name, 'e[1]')
+        os.mkdir(self.dir)
+        self.file = os.path.join(self.dir, 'l2.dazzlelink')
+        with open(self.file, 'w') as f:
+            f.write('{}')
+
+    def test_bracketed_file_path(self):
+        found = find_dazzlelinks([self.file])
+        self.assertEqual([str(p) for p in found], [self.file])
+
+    def test_bracketed_directory(self):
+        found = find_dazzlelinks([self.dir])
+        self.assertEqual([str(p) for p in found], [self.file])
+
+    def test_glob_pattern_still_expands(self):
+        found = find_dazzlelinks([os.path.join(self._tmp.name, 'e*')])
+        self.assertEqual([str(p) for p in found], [self.file])
+
+
+if __name__ == '__main__':
+    unittest.main()